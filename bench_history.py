@@ -0,0 +1,397 @@
+"""
+Benchmark results history and regression check.
+Every benchmark / load run (replay_trace.py, diagnose_backend.py and the node
+benchmarks through `record`) appends its results to a JSON-lines history keyed
+by git commit and machine fingerprint.
+`compare` checks the latest run against a stored baseline from the same
+machine and run configuration (target, speed, trace, concurrency, ...) and
+flags regressions in throughput, p95 latency and client peak memory.
+
+p95 is judged with a bootstrap confidence interval of the p95 change computed
+from the raw latency samples (at least MIN_P95_SAMPLES a side). Throughput and
+client memory are one number per run, so they need MIN_RUNS runs on each side
+for a Welch t-test. Anything with less data is reported as "insufficient data"
+and never flagged.
+
+client_peak_rss_mb is the benchmark runner's own peak memory - it catches
+client-side regressions (report building, sample buffers), not the backend's.
+
+Run:
+    python bench_history.py list
+    python bench_history.py compare                       # latest commit vs the previous one
+    python bench_history.py compare --baseline a1b2c3d    # vs a specific commit (a1b2c3d-dirty for local edits)
+    python bench_history.py compare --threshold 10 --kind diagnostics
+    python bench_history.py record < results.json         # {"kind", "meta", "results": [{"name", "metrics", "samples"}]}
+
+History file: benchmarks/history.jsonl (override with BENCH_HISTORY).
+compare exits with status 1 when a regression is found.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "history.jsonl")
+
+# Raw latency samples kept per record (random subsample beyond this)
+MAX_STORED_SAMPLES = 2000
+
+# Metric -> True if larger is better
+METRICS = {
+    "rps": True,
+    "p95_ms": False,
+    "client_peak_rss_mb": False,
+    # In-process benchmarks (bench_*.js)
+    "ops_per_s": True,
+    "build_ms": False,
+    "heap_mb": False,
+}
+
+KINDS = ["replay", "diagnostics", "search_index", "officer_positions"]
+
+# Below this much data a change is reported but never flagged
+MIN_P95_SAMPLES = 100
+MIN_RUNS = 3
+
+BOOTSTRAP_ROUNDS = 500
+
+
+def history_path():
+    return os.environ.get("BENCH_HISTORY", DEFAULT_HISTORY)
+
+
+def git_commit():
+    """(short sha, dirty) of the working tree"""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True).stdout.strip()
+        return sha, bool(dirty)
+    except Exception:
+        return "unknown", False
+
+
+def commit_label(entry):
+    """sha, or sha-dirty for runs with uncommitted changes"""
+    if "dirty" not in entry and entry["commit"].endswith("-dirty"):
+        return entry["commit"]  # Written before the dirty flag was split out
+    return entry["commit"] + ("-dirty" if entry.get("dirty") else "")
+
+
+def matches_commit(entry, commit):
+    """Exact match on the dirty flag; the sha may be abbreviated"""
+    label = commit_label(entry)
+    want_dirty = commit.endswith("-dirty")
+    sha = commit[:-len("-dirty")] if want_dirty else commit
+    return label.endswith("-dirty") == want_dirty and label.startswith(sha)
+
+
+def run_config(entry):
+    """Everything that has to be equal for two runs to be comparable"""
+    meta = dict(entry.get("meta") or {})
+    return entry["kind"], json.dumps(meta, sort_keys=True)
+
+
+def machine_fingerprint():
+    """Stable id of the machine/runtime - results are only comparable within one fingerprint"""
+    parts = [platform.system(), platform.machine(), platform.processor(), str(os.cpu_count()),
+             platform.python_implementation(), ".".join(platform.python_version_tuple()[:2])]
+    try:
+        with open("/proc/meminfo") as f:
+            parts.append(f.readline().split()[1])  # MemTotal
+    except OSError:
+        pass
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:12]
+
+
+def client_peak_rss_mb():
+    """Peak resident memory of this (benchmark client) process, None where unsupported"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)  # bytes on macOS, kB on Linux
+    except ImportError:
+        return None
+
+
+def record(kind, name, metrics, samples=None, meta=None):
+    """Append one result to the history"""
+    if samples and len(samples) > MAX_STORED_SAMPLES:
+        samples = random.sample(list(samples), MAX_STORED_SAMPLES)
+    sha, dirty = git_commit()
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": sha,
+        "dirty": dirty,
+        "machine": machine_fingerprint(),
+        "kind": kind,
+        "name": name,
+        "metrics": {k: v for k, v in metrics.items() if v is not None},
+        "samples": [round(s, 3) for s in samples] if samples else [],
+        "meta": meta or {},
+    }
+    path = history_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def load_history():
+    path = history_path()
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return entries
+
+
+def welch_p(a, b):
+    """Two-sided p-value of Welch's t-test (normal approximation)"""
+    mean_a, mean_b = sum(a) / len(a), sum(b) / len(b)
+    var_a = sum((x - mean_a) ** 2 for x in a) / (len(a) - 1)
+    var_b = sum((x - mean_b) ** 2 for x in b) / (len(b) - 1)
+    se = math.sqrt(var_a / len(a) + var_b / len(b))
+    if se == 0:
+        return 0.0 if mean_a != mean_b else 1.0
+    return math.erfc(abs(mean_a - mean_b) / se / math.sqrt(2))
+
+
+def p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def bootstrap_p95_change_ci(base, current, alpha):
+    """Confidence interval (in %) of the relative p95 change, resampling both sides"""
+    rng = random.Random(0)  # Same history -> same verdict
+    changes = []
+    for _ in range(BOOTSTRAP_ROUNDS):
+        before = p95(rng.choices(base, k=len(base)))
+        after = p95(rng.choices(current, k=len(current)))
+        if before > 0:
+            changes.append((after - before) / before * 100)
+    if not changes:
+        return None
+    changes.sort()
+    low = changes[int(alpha / 2 * (len(changes) - 1))]
+    high = changes[int((1 - alpha / 2) * (len(changes) - 1))]
+    return low, high
+
+
+def judge(metric, higher_is_better, base_runs, current_runs, threshold_pct, alpha):
+    """Finding for one metric, or None if either side lacks it"""
+    base_values = [e["metrics"][metric] for e in base_runs if metric in e["metrics"]]
+    current_values = [e["metrics"][metric] for e in current_runs if metric in e["metrics"]]
+    if not base_values or not current_values:
+        return None
+
+    ci = p_value = None
+    if metric == "p95_ms":
+        base_samples = [s for e in base_runs for s in e.get("samples", [])]
+        current_samples = [s for e in current_runs for s in e.get("samples", [])]
+        enough = len(base_samples) >= MIN_P95_SAMPLES and len(current_samples) >= MIN_P95_SAMPLES
+        if base_samples and current_samples:
+            before, after = p95(base_samples), p95(current_samples)
+        else:
+            before, after = sum(base_values) / len(base_values), sum(current_values) / len(current_values)
+        if enough:
+            ci = bootstrap_p95_change_ci(base_samples, current_samples, alpha)
+            enough = ci is not None
+    else:
+        before, after = sum(base_values) / len(base_values), sum(current_values) / len(current_values)
+        enough = len(base_values) >= MIN_RUNS and len(current_values) >= MIN_RUNS
+        if enough:
+            p_value = welch_p(base_values, current_values)
+
+    if before == 0:
+        return None
+    change_pct = (after - before) / before * 100
+    worse = change_pct < -threshold_pct if higher_is_better else change_pct > threshold_pct
+    if not enough:
+        status = "insufficient data"
+    elif ci is not None:
+        # Regression only if the whole interval is on the bad side of zero
+        significant = ci[1] < 0 if higher_is_better else ci[0] > 0
+        status = "regression" if worse and significant else "ok"
+    else:
+        status = "regression" if worse and p_value < alpha else "ok"
+
+    return {
+        "metric": metric,
+        "baseline": round(before, 2), "current": round(after, 2),
+        "change_pct": round(change_pct, 1),
+        "ci_pct": [round(ci[0], 1), round(ci[1], 1)] if ci else None,
+        "p_value": round(p_value, 4) if p_value is not None else None,
+        "status": status,
+    }
+
+
+def compare(entries, baseline_commit=None, current_commit=None, kind=None, threshold_pct=5.0, alpha=0.05):
+    machine = machine_fingerprint()
+    entries = [e for e in entries if e.get("machine") == machine and (kind is None or e.get("kind") == kind)]
+    commits = []
+    for entry in entries:
+        label = commit_label(entry)
+        if label not in commits:
+            commits.append(label)
+    if not commits:
+        return None, None, []
+
+    current_commit = current_commit or commits[-1]
+    if baseline_commit is None:
+        current_labels = [c for c in commits if c == current_commit]
+        earlier = commits[:commits.index(current_labels[0])] if current_labels else []
+        baseline_commit = earlier[-1] if earlier else None
+    if baseline_commit is None:
+        return None, current_commit, []
+
+    def group(commit):
+        grouped = {}
+        for entry in entries:
+            if matches_commit(entry, commit):
+                kind_name, config = run_config(entry)
+                grouped.setdefault((kind_name, config, entry["name"]), []).append(entry)
+        return grouped
+
+    base, current = group(baseline_commit), group(current_commit)
+    findings = []
+    for key in sorted(set(base) & set(current)):
+        for metric, higher_is_better in METRICS.items():
+            finding = judge(metric, higher_is_better, base[key], current[key], threshold_pct, alpha)
+            if finding:
+                finding.update({"kind": key[0], "config": json.loads(key[1]), "name": key[2]})
+                findings.append(finding)
+    return baseline_commit, current_commit, findings
+
+
+def describe_config(config):
+    return " ".join(f"{k}={v}" for k, v in sorted(config.items()))
+
+
+def record_replay_report(report, latencies_ms, meta=None):
+    """History entries for a replay_trace.py report (overall + per endpoint)"""
+    record("replay", "overall", {"rps": report["replay_rps"], "p95_ms": report["overall"]["replay"]["p95_ms"],
+                                 "client_peak_rss_mb": client_peak_rss_mb()}, latencies_ms.get("overall"), meta)
+    for name, entry in report["endpoints"].items():
+        record("replay", name, {"p95_ms": entry["replay"]["p95_ms"]}, latencies_ms.get(name), meta)
+
+
+def record_diagnostics_report(report, latencies_ms, meta=None):
+    """History entries for a diagnose_backend.py report (overall + per endpoint)"""
+    all_latencies = [latency for values in latencies_ms.values() for latency in values]
+    record("diagnostics", "overall", {"rps": report["rps"], "p95_ms": p95(all_latencies) if all_latencies else None,
+                                      "client_peak_rss_mb": client_peak_rss_mb()}, all_latencies, meta)
+    for name, entry in report["endpoints"].items():
+        record("diagnostics", name, {"p95_ms": entry["latency"]["p95_ms"]}, latencies_ms.get(name), meta)
+
+
+def record_results(payload):
+    """History entries from another runner's results (the node benchmarks pipe these in as JSON)"""
+    kind = payload.get("kind")
+    if kind not in KINDS:
+        raise ValueError(f"Unknown benchmark kind {kind!r} (expected one of {', '.join(KINDS)})")
+    unknown = {m for result in payload.get("results", []) for m in result.get("metrics", {})} - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metric(s) {', '.join(sorted(unknown))} - add them to METRICS first")
+    return [record(kind, result["name"], result.get("metrics", {}), result.get("samples"), payload.get("meta"))
+            for result in payload.get("results", [])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark history")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="Show recorded runs")
+    sub.add_parser("record", help="Append results read as JSON from stdin")
+
+    compare_parser = sub.add_parser("compare", help="Compare the latest run with a baseline")
+    compare_parser.add_argument("--baseline", help="Baseline commit (default: the commit before --current)")
+    compare_parser.add_argument("--current", help="Commit to check (default: latest recorded)")
+    compare_parser.add_argument("--kind", choices=KINDS)
+    compare_parser.add_argument("--threshold", type=float, default=5.0, help="Minimum change in %% to flag")
+    compare_parser.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        try:
+            entries = record_results(json.load(sys.stdin))
+        except (ValueError, KeyError) as e:
+            print(f"❌ Could not record results: {e}")
+            sys.exit(1)
+        print(f"📈 {len(entries)} results added to {history_path()}")
+        return
+
+    entries = load_history()
+    if not entries:
+        print(f"❌ No history at {history_path()} - run replay_trace.py or diagnose_backend.py first")
+        sys.exit(1)
+
+    if args.command == "list":
+        runs = {}
+        for entry in entries:
+            key = (commit_label(entry), entry["machine"], entry["kind"], run_config(entry)[1])
+            run = runs.setdefault(key, {"time": entry["time"], "count": 0, "overall": None})
+            run["count"] += 1
+            if entry["name"] == "overall":
+                run["overall"] = entry["metrics"]
+        print(f"\n   {'commit':16} {'machine':13} {'kind':18} {'time':20} {'rps':>9} {'p95 ms':>9} {'client MB':>10}")
+        for (commit, machine, kind, config), run in runs.items():
+            overall = run["overall"] or {}
+            print(f"   {commit:16} {machine:13} {kind:18} {run['time']:20} {overall.get('rps', '-'):>9} "
+                  f"{overall.get('p95_ms', '-'):>9} {overall.get('client_peak_rss_mb', '-'):>10}")
+            print(f"   {'':16} {describe_config(json.loads(config))}")
+        print("")
+        return
+
+    baseline, current, findings = compare(entries, args.baseline, args.current, args.kind, args.threshold, args.alpha)
+    if not baseline:
+        print(f"⚠️  No baseline to compare {current or 'the latest run'} against on this machine ({machine_fingerprint()})")
+        return
+
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK COMPARISON {baseline} -> {current}")
+    print("=" * 60)
+    if not findings:
+        print("   No runs with the same configuration on both sides")
+    regressions = 0
+    config = None
+    for finding in findings:
+        if finding["config"] != config:
+            config = finding["config"]
+            print(f"\n   {finding['kind']}: {describe_config(config)}")
+            print(f"   {'name':28} {'metric':19} {'baseline':>10} {'current':>10} {'change':>8}  evidence")
+        flag = {"regression": "❌", "insufficient data": "⚠️ "}.get(finding["status"], "  ")
+        regressions += finding["status"] == "regression"
+        if finding["ci_pct"]:
+            evidence = f"CI [{finding['ci_pct'][0]:+.1f}%, {finding['ci_pct'][1]:+.1f}%]"
+        elif finding["p_value"] is not None:
+            evidence = f"p={finding['p_value']}"
+        else:
+            evidence = finding["status"]
+        print(f" {flag}{finding['name'][:28]:28} {finding['metric']:19} {finding['baseline']:>10} "
+              f"{finding['current']:>10} {finding['change_pct']:>+7.1f}%  {evidence}")
+
+    if regressions:
+        print(f"\n❌ {regressions} regression(s) beyond {args.threshold}% (alpha {args.alpha})")
+        sys.exit(1)
+    print(f"\n✅ No significant regressions")
+
+
+if __name__ == "__main__":
+    main()
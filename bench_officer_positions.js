@@ -0,0 +1,178 @@
+/**
+ * Benchmark the officer position store (src/utils/officerPositions.ts) at
+ * dispatch scale: heap footprint, initial insert, update throughput, and a
+ * radius query against a brute-force haversine scan over plain objects.
+ * The radius results are checked against the brute-force scan on every run.
+ * Store timings are appended to the benchmark history (see bench_history.py
+ * compare) unless the radius results disagree with the scan.
+ *
+ * Run:
+ *     node --expose-gc bench_officer_positions.js
+ *     node --expose-gc bench_officer_positions.js --officers 100000 --updates 1000000 --json positions_bench.json
+ *     node --expose-gc bench_officer_positions.js --no-history
+ */
+
+const fs = require('fs');
+const tsRequire = require('./ts_require');
+const recordHistory = require('./bench_record');
+
+const { OfficerPositionStore } = tsRequire('src/utils/officerPositions.ts');
+
+const args = process.argv.slice(2);
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`);
+  return index === -1 ? fallback : args[index + 1];
+};
+const OFFICERS = Number(option('officers', 100000));
+const UPDATES = Number(option('updates', 1000000));
+// 100 radius queries so bench_history has enough samples to judge p95
+const RUNS = Number(option('runs', 100));
+const RADIUS_KM = Number(option('radius', 2));
+const JSON_OUT = option('json', null);
+const NO_HISTORY = args.includes('--no-history');
+
+// Deterministic PRNG so every run places officers the same way
+let seed = 42;
+const random = () => {
+  seed = (seed * 1103515245 + 12345) % 2147483648;
+  return seed / 2147483648;
+};
+
+// Officers spread over ~50 km around the default map center (Pune)
+const CENTER = { latitude: 18.647, longitude: 73.784 };
+const STATUSES = ['available', 'busy', 'offline'];
+const officers = Array.from({ length: OFFICERS }, (_, i) => ({
+  officerId: `officer_${i}`,
+  latitude: CENTER.latitude + (random() - 0.5) * 0.45,
+  longitude: CENTER.longitude + (random() - 0.5) * 0.45,
+  timestamp: 1700000000000 + i,
+  status: STATUSES[i % STATUSES.length],
+}));
+
+const time = (fn) => {
+  const started = process.hrtime.bigint();
+  const result = fn();
+  return { ms: Number(process.hrtime.bigint() - started) / 1e6, result };
+};
+const median = (values) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+};
+const p95 = (values) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.round(0.95 * (sorted.length - 1)))];
+};
+const heapUsed = () => {
+  if (global.gc) {
+    global.gc();
+  }
+  return process.memoryUsage().heapUsed;
+};
+
+const haversineKm = (lat1, lng1, lat2, lng2) => {
+  const toRad = Math.PI / 180;
+  const dLat = (lat2 - lat1) * toRad;
+  const dLng = (lng2 - lng1) * toRad;
+  const a = Math.sin(dLat / 2) ** 2 + Math.cos(lat1 * toRad) * Math.cos(lat2 * toRad) * Math.sin(dLng / 2) ** 2;
+  return 2 * 6371 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+};
+
+// What callers did before the store: filter every session object by distance
+const bruteForce = (latitude, longitude, radiusKm) =>
+  officers
+    .map((officer) => ({ officer, distanceKm: haversineKm(latitude, longitude, officer.latitude, officer.longitude) }))
+    .filter((match) => match.distanceKm <= radiusKm)
+    .sort((a, b) => a.distanceKm - b.distanceKm);
+
+const heapBefore = heapUsed();
+const store = new OfficerPositionStore();
+const insert = time(() => {
+  officers.forEach((o) => store.update(o.officerId, o.latitude, o.longitude, o.timestamp, o.status));
+});
+const heapBytes = heapUsed() - heapBefore;
+
+// Each update moves a random officer a few metres forward in time
+const ids = officers.map((o) => o.officerId);
+const updates = time(() => {
+  for (let i = 0; i < UPDATES; i++) {
+    const index = (i * 7919) % OFFICERS;
+    const officer = officers[index];
+    store.update(ids[index], officer.latitude + 1e-5, officer.longitude - 1e-5, officer.timestamp + i + 1);
+  }
+});
+// Put the positions back so the brute-force scan sees the same data
+officers.forEach((o) => {
+  store.remove(o.officerId);
+  store.update(o.officerId, o.latitude, o.longitude, o.timestamp, o.status);
+});
+
+const storeRuns = [];
+const scanRuns = [];
+let hits = 0;
+let mismatches = 0;
+for (let run = 0; run < RUNS; run++) {
+  const latitude = CENTER.latitude + (random() - 0.5) * 0.3;
+  const longitude = CENTER.longitude + (random() - 0.5) * 0.3;
+  const stored = time(() => store.withinRadius(latitude, longitude, RADIUS_KM));
+  const scanned = time(() => bruteForce(latitude, longitude, RADIUS_KM));
+  storeRuns.push(stored.ms);
+  scanRuns.push(scanned.ms);
+  hits = stored.result.length;
+  const expected = new Set(scanned.result.map((match) => match.officer.officerId));
+  if (stored.result.length !== expected.size || stored.result.some((match) => !expected.has(match.officerId))) {
+    mismatches += 1;
+  }
+}
+const limitedRuns = Array.from({ length: RUNS }, () =>
+  time(() => store.withinRadius(CENTER.latitude, CENTER.longitude, RADIUS_KM, { status: 'available', limit: 20 })).ms
+);
+
+const report = {
+  officers: OFFICERS,
+  heap_mb: heapBytes / 1048576,
+  insert_ms: insert.ms,
+  updates: UPDATES,
+  updates_per_s: UPDATES / (updates.ms / 1000),
+  radius_km: RADIUS_KM,
+  radius_hits: hits,
+  radius_store_ms: median(storeRuns),
+  radius_scan_ms: median(scanRuns),
+  radius_available_limit20_ms: median(limitedRuns),
+  mismatches,
+};
+
+console.log('\n' + '='.repeat(60));
+console.log(`OFFICER POSITION STORE BENCHMARK (${OFFICERS} officers)`);
+console.log('='.repeat(60));
+console.log(`   Heap: ${global.gc ? `${report.heap_mb.toFixed(1)} MB` : 'run with --expose-gc to measure'}`);
+console.log(`   Insert all officers: ${report.insert_ms.toFixed(1)} ms`);
+console.log(`   Updates: ${(report.updates_per_s / 1e6).toFixed(2)}M/s (${UPDATES} updates)`);
+console.log(`   ${RADIUS_KM} km radius (${hits} hits): store ${report.radius_store_ms.toFixed(2)} ms, ` +
+  `brute force ${report.radius_scan_ms.toFixed(2)} ms`);
+console.log(`   ${RADIUS_KM} km radius, available, limit 20: ${report.radius_available_limit20_ms.toFixed(2)} ms`);
+if (mismatches) {
+  console.log(`   ❌ ${mismatches}/${RUNS} radius queries differ from the brute-force scan`);
+} else {
+  console.log('   ✅ Radius results match the brute-force scan');
+}
+console.log('');
+
+if (JSON_OUT) {
+  fs.writeFileSync(JSON_OUT, JSON.stringify(report, null, 2));
+  console.log(`✅ Report written to ${JSON_OUT}`);
+}
+
+if (!NO_HISTORY && !mismatches) {
+  recordHistory(
+    'officer_positions',
+    [
+      { name: 'insert', metrics: { build_ms: report.insert_ms } },
+      { name: 'update', metrics: { ops_per_s: report.updates_per_s } },
+      ...(global.gc ? [{ name: 'memory', metrics: { heap_mb: report.heap_mb } }] : []),
+      { name: `radius ${RADIUS_KM} km`, metrics: { p95_ms: p95(storeRuns) }, samples: storeRuns },
+      { name: `radius ${RADIUS_KM} km available limit 20`, metrics: { p95_ms: p95(limitedRuns) }, samples: limitedRuns },
+    ],
+    { officers: OFFICERS, updates: UPDATES, runs: RUNS, radius_km: RADIUS_KM }
+  );
+}
+process.exitCode = mismatches ? 1 : 0;
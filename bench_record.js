@@ -0,0 +1,39 @@
+/**
+ * Append a node benchmark's results to the benchmark history
+ * (bench_history.py record), so `python bench_history.py compare` covers the
+ * in-process benchmarks too. Commit, dirty flag and machine fingerprint are
+ * filled in by bench_history.py, the same as for the Python runners.
+ *
+ * Usage:
+ *     const recordHistory = require('./bench_record');
+ *     recordHistory('search_index', [{ name: 'build', metrics: { build_ms: 12.3 } }], { alerts: 50000 });
+ */
+
+const path = require('path');
+const { spawnSync } = require('child_process');
+
+const BENCH_HISTORY = path.join(__dirname, 'bench_history.py');
+
+/**
+ * @param kind - Benchmark kind (bench_history.KINDS)
+ * @param results - [{ name, metrics, samples? }]; metric names must be in bench_history.METRICS
+ * @param meta - Run configuration; only runs with equal meta are compared
+ * @returns true if the results were recorded
+ */
+const recordHistory = (kind, results, meta = {}) => {
+  // The runtime is part of the configuration - a node upgrade must not look like a regression
+  const payload = { kind, results, meta: { ...meta, node: process.versions.node.split('.')[0] } };
+  const python = process.env.PYTHON || (process.platform === 'win32' ? 'python' : 'python3');
+  const result = spawnSync(python, [BENCH_HISTORY, 'record'], {
+    cwd: __dirname,
+    input: JSON.stringify(payload),
+    stdio: ['pipe', 'inherit', 'inherit'],
+  });
+  if (result.error || result.status !== 0) {
+    console.log(`❌ Could not record results in the benchmark history${result.error ? `: ${result.error.message}` : ''}`);
+    return false;
+  }
+  return true;
+};
+
+module.exports = recordHistory;
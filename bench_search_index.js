@@ -0,0 +1,172 @@
+/**
+ * Benchmark SearchScreen's inverted index (src/utils/searchIndex.ts)
+ * against a naive lowercase-includes scan over the same synthetic alerts,
+ * cases and incidents. Reports the median query time per query shape, the
+ * initial build and an unchanged resync, and appends the index timings to the
+ * benchmark history (see bench_history.py compare). The scan is the reference
+ * only, so it is timed on the first --scan-runs runs.
+ *
+ * Run:
+ *     node bench_search_index.js
+ *     node bench_search_index.js --alerts 50000 --runs 100 --json search_bench.json
+ *     node bench_search_index.js --no-history
+ */
+
+const fs = require('fs');
+const tsRequire = require('./ts_require');
+const recordHistory = require('./bench_record');
+
+const { SearchIndex } = tsRequire('src/utils/searchIndex.ts');
+
+const args = process.argv.slice(2);
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`);
+  return index === -1 ? fallback : args[index + 1];
+};
+const ALERTS = Number(option('alerts', 50000));
+// 100 runs per query so bench_history has enough samples to judge p95
+const RUNS = Number(option('runs', 100));
+const SCAN_RUNS = Math.min(RUNS, Number(option('scan-runs', 10)));
+const JSON_OUT = option('json', null);
+const NO_HISTORY = args.includes('--no-history');
+
+// Deterministic PRNG so every run searches the same data
+let seed = 42;
+const random = () => {
+  seed = (seed * 1103515245 + 12345) % 2147483648;
+  return seed / 2147483648;
+};
+const pick = (items) => items[Math.floor(random() * items.length)];
+
+const WORDS = [
+  'fire', 'medical', 'theft', 'harassment', 'accident', 'suspicious', 'noise', 'gate', 'parking', 'hostel',
+  'library', 'canteen', 'block', 'north', 'south', 'urgent', 'help', 'injury', 'smoke', 'café', 'पुणे', 'निगडी',
+];
+const NAMES = ['asha patil', 'rahul more', 'josé garcía', 'priya shah', 'amit kulkarni', 'sneha joshi', 'zoë martin'];
+const STATUSES = ['pending', 'accepted', 'completed', 'cancelled'];
+const PRIORITIES = ['high', 'medium', 'low'];
+
+const sentence = (length) => Array.from({ length }, () => pick(WORDS)).join(' ');
+const createdAt = () => new Date(Date.UTC(2026, 0, 1) + Math.floor(random() * 300 * 86400000)).toISOString();
+
+const makeAlert = (i) => ({
+  id: String(i),
+  log_id: `log_${i}`,
+  message: sentence(8),
+  user_name: pick(NAMES),
+  location: { latitude: 18.6, longitude: 73.7, address: `${pick(WORDS)} road ${i % 500}` },
+  geofence_id: String(i % 20),
+  status: pick(STATUSES),
+  priority: pick(PRIORITIES),
+  created_at: createdAt(),
+});
+const makeRecord = (i) => ({
+  id: i,
+  title: sentence(3),
+  description: sentence(10),
+  status: pick(['open', 'in_progress', 'resolved']),
+  priority: pick(PRIORITIES),
+  location: { address: `${pick(WORDS)} lane` },
+  created_at: createdAt(),
+});
+
+const alerts = Array.from({ length: ALERTS }, (_, i) => makeAlert(i));
+const cases = Array.from({ length: Math.round(ALERTS / 10) }, (_, i) => makeRecord(i));
+const incidents = Array.from({ length: Math.round(ALERTS / 10) }, (_, i) => makeRecord(i));
+
+// What SearchScreen did before the index: lowercase-includes over every record's text
+const naiveSearch = (query) => {
+  const terms = query.toLowerCase().split(/\s+/).filter(Boolean);
+  const matches = [];
+  const check = (kind, item, text) => {
+    const haystack = text.join(' ').toLowerCase();
+    if (terms.every((term) => haystack.includes(term))) {
+      matches.push({ kind, item });
+    }
+  };
+  alerts.forEach((a) => check('alert', a, [a.message, a.user_name, a.location.address, a.geofence_id]));
+  cases.forEach((c) => check('case', c, [c.title, c.description, c.location.address]));
+  incidents.forEach((c) => check('incident', c, [c.title, c.description, c.location.address]));
+  return matches;
+};
+
+const time = (fn) => {
+  const started = process.hrtime.bigint();
+  const result = fn();
+  return { ms: Number(process.hrtime.bigint() - started) / 1e6, result };
+};
+const median = (values) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+};
+const p95 = (values) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.round(0.95 * (sorted.length - 1)))];
+};
+
+const index = new SearchIndex();
+const build = time(() => {
+  index.sync('alert', alerts);
+  index.sync('case', cases);
+  index.sync('incident', incidents);
+});
+const resync = time(() => index.sync('alert', alerts));
+
+const QUERIES = [
+  ['1 char', 'f'],
+  ['prefix', 'hos'],
+  ['1 term', 'medical'],
+  ['2 terms', 'fire hostel'],
+  ['3 terms', 'urgent help gat'],
+  ['non-ASCII', 'पुणे'],
+  ['name', 'josé'],
+];
+
+const rows = QUERIES.map(([shape, query]) => {
+  const indexed = [];
+  const scanned = [];
+  let hits = 0;
+  for (let run = 0; run < RUNS; run++) {
+    const result = time(() => index.search(query, {}, 100));
+    indexed.push(result.ms);
+    hits = result.result.length;
+    if (run < SCAN_RUNS) {
+      scanned.push(time(() => naiveSearch(query)).ms);
+    }
+  }
+  return { shape, query, hits, index_ms: median(indexed), index_p95_ms: p95(indexed), scan_ms: median(scanned), samples: indexed };
+});
+
+console.log('\n' + '='.repeat(60));
+console.log(`SEARCH INDEX BENCHMARK (${ALERTS} alerts, ${cases.length} cases, ${incidents.length} incidents)`);
+console.log('='.repeat(60));
+console.log(`   Build: ${build.ms.toFixed(1)} ms   Unchanged resync: ${resync.ms.toFixed(1)} ms`);
+console.log(`\n   ${'query'.padEnd(24)} ${'hits'.padStart(6)} ${'index'.padStart(10)} ${'scan'.padStart(10)}`);
+rows.forEach((row) => {
+  console.log(
+    `   ${`${row.shape} "${row.query}"`.padEnd(24)} ${String(row.hits).padStart(6)} ` +
+      `${row.index_ms.toFixed(2).padStart(8)}ms ${row.scan_ms.toFixed(2).padStart(8)}ms`
+  );
+});
+console.log('');
+
+if (JSON_OUT) {
+  const queries = rows.map(({ samples, ...row }) => row);
+  fs.writeFileSync(
+    JSON_OUT,
+    JSON.stringify({ alerts: ALERTS, runs: RUNS, build_ms: build.ms, resync_ms: resync.ms, queries }, null, 2)
+  );
+  console.log(`✅ Report written to ${JSON_OUT}`);
+}
+
+if (!NO_HISTORY) {
+  recordHistory(
+    'search_index',
+    [
+      { name: 'build', metrics: { build_ms: build.ms } },
+      { name: 'resync', metrics: { build_ms: resync.ms } },
+      ...rows.map((row) => ({ name: `query ${row.shape}`, metrics: { p95_ms: row.index_p95_ms }, samples: row.samples })),
+    ],
+    { alerts: ALERTS, runs: RUNS }
+  );
+}
@@ -0,0 +1,188 @@
+"""
+Snapshot and restore a seeded database.
+Seeding a production-sized dataset (test officer, users, SecurityOfficer,
+geofences, alerts, live location sessions) by hand is slow. Seed once, then
+save a snapshot and restore it before every benchmark / load-test run.
+
+- SQLite:     online backup API into a single .sqlite3 file (page copy, no SQL)
+- PostgreSQL: pg_dump custom format (-Fc, compressed) / parallel pg_restore
+- Others:     dumpdata to gzipped JSON (slow fallback)
+
+A metadata file next to the snapshot records the applied migrations; restore
+refuses a snapshot taken against a different schema.
+
+Run (action and path come from environment variables, stdin is the script):
+    SNAPSHOT_ACTION=save    python manage.py shell < db_snapshot.py
+    SNAPSHOT_ACTION=restore python manage.py shell < db_snapshot.py
+    SNAPSHOT_PATH=snapshots/load_test python manage.py shell < db_snapshot.py
+
+The benchmarks restore it for you before a run:
+    python replay_trace.py trace.jsonl --restore-snapshot snapshots/seeded --manage-py ../backend/manage.py
+    python diagnose_backend.py --restore-snapshot snapshots/seeded --manage-py ../backend/manage.py
+
+A failed save or restore exits non-zero so those runs stop instead of
+benchmarking whatever data is left in the database.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.migrations.recorder import MigrationRecorder
+
+DEFAULT_SNAPSHOT_PATH = "snapshots/seeded"
+
+# Tables worth reporting after save/restore (missing models are skipped)
+REPORTED_MODELS = ["User", "SecurityOfficer", "Geofence", "SOSAlert", "LiveLocationSession"]
+
+
+def schema_fingerprint():
+    """Hash of the applied migrations - a snapshot only restores onto the same schema"""
+    applied = sorted(f"{app}.{name}" for app, name in MigrationRecorder(connection).applied_migrations())
+    return hashlib.sha256("\n".join(applied).encode()).hexdigest()[:16]
+
+
+def row_counts():
+    counts = {}
+    for model in apps.get_models():
+        if model.__name__ in REPORTED_MODELS:
+            try:
+                counts[f"{model._meta.app_label}.{model.__name__}"] = model.objects.count()
+            except Exception:
+                pass
+    return counts
+
+
+def _paths(base):
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        data_path = base + ".sqlite3"
+    elif vendor == "postgresql":
+        data_path = base + ".pgdump"
+    else:
+        data_path = base + ".json.gz"
+    return data_path, base + ".meta.json"
+
+
+def _pg_env_and_args():
+    settings = connection.settings_dict
+    env = dict(os.environ)
+    if settings.get("PASSWORD"):
+        env["PGPASSWORD"] = settings["PASSWORD"]
+    args = []
+    if settings.get("HOST"):
+        args += ["-h", settings["HOST"]]
+    if settings.get("PORT"):
+        args += ["-p", str(settings["PORT"])]
+    if settings.get("USER"):
+        args += ["-U", settings["USER"]]
+    return env, args, settings["NAME"]
+
+
+def save_snapshot(base=DEFAULT_SNAPSHOT_PATH):
+    data_path, meta_path = _paths(base)
+    os.makedirs(os.path.dirname(data_path) or ".", exist_ok=True)
+    started = time.time()
+
+    if connection.vendor == "sqlite":
+        connection.ensure_connection()
+        tmp_path = data_path + ".tmp"
+        target = sqlite3.connect(tmp_path)
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+        os.replace(tmp_path, data_path)
+    elif connection.vendor == "postgresql":
+        env, args, name = _pg_env_and_args()
+        subprocess.run(["pg_dump", "-Fc", "-Z", "6", "-f", data_path] + args + [name], env=env, check=True)
+    else:
+        with gzip.open(data_path, "wt", encoding="utf-8") as out:
+            call_command("dumpdata", "--natural-foreign", "--exclude=contenttypes",
+                         "--exclude=auth.permission", "--exclude=sessions", stdout=out)
+
+    meta = {
+        "vendor": connection.vendor,
+        "schema": schema_fingerprint(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "counts": row_counts(),
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    size_mb = os.path.getsize(data_path) / (1024 * 1024)
+    print(f"✅ Snapshot saved: {data_path} ({size_mb:.1f} MB) in {time.time() - started:.1f}s")
+    for label, count in meta["counts"].items():
+        print(f"   {label}: {count}")
+    return data_path
+
+
+def restore_snapshot(base=DEFAULT_SNAPSHOT_PATH, jobs=4):
+    data_path, meta_path = _paths(base)
+    if not os.path.exists(data_path) or not os.path.exists(meta_path):
+        raise FileNotFoundError(f"No snapshot at {data_path} - run with SNAPSHOT_ACTION=save first")
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get("vendor") != connection.vendor:
+        raise RuntimeError(f"Snapshot is for {meta.get('vendor')}, database is {connection.vendor}")
+    if meta.get("schema") != schema_fingerprint():
+        raise RuntimeError("Snapshot was taken with different migrations - re-seed and save a new one")
+
+    started = time.time()
+    if connection.vendor == "sqlite":
+        connection.ensure_connection()
+        source = sqlite3.connect(data_path)
+        try:
+            source.backup(connection.connection)
+        finally:
+            source.close()
+    elif connection.vendor == "postgresql":
+        connections.close_all()
+        env, args, name = _pg_env_and_args()
+        subprocess.run(["pg_restore", "--clean", "--if-exists", "--no-owner", "-j", str(jobs), "-d", name]
+                       + args + [data_path], env=env, check=True)
+    else:
+        call_command("flush", "--no-input")
+        with gzip.open(data_path, "rb") as src, open(data_path + ".json", "wb") as tmp:
+            shutil.copyfileobj(src, tmp)
+        try:
+            call_command("loaddata", data_path + ".json")
+        finally:
+            os.remove(data_path + ".json")
+
+    print(f"✅ Snapshot restored: {data_path} in {time.time() - started:.1f}s")
+    return meta
+
+
+if __name__ != "db_snapshot":
+    action = os.environ.get("SNAPSHOT_ACTION", "save").lower()
+    path = os.environ.get("SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+
+    print("\n" + "=" * 60)
+    print(f"DATABASE SNAPSHOT - {action.upper()} ({connection.vendor})")
+    print("=" * 60)
+
+    try:
+        if action == "save":
+            save_snapshot(path)
+        elif action == "restore":
+            restore_snapshot(path)
+            for label, count in row_counts().items():
+                print(f"   {label}: {count}")
+        else:
+            print(f"❌ Unknown SNAPSHOT_ACTION '{action}' (use save or restore)")
+            sys.exit(1)
+    except Exception as e:
+        print(f"❌ Snapshot {action} failed: {e}")
+        sys.exit(1)
+    print("\n")
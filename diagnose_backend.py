@@ -0,0 +1,287 @@
+"""
+Concurrent backend diagnostics.
+Authenticates once, then probes every GET endpoint listed in
+src/api/endpoints.ts concurrently over a pool of keep-alive connections,
+repeating each probe --samples times. Reports per-endpoint status codes,
+latency percentiles and histograms, payload sizes, and the DNS / connect /
+TLS / time-to-first-byte breakdown of each new connection.
+
+Endpoints with path parameters ({id}, {session_id}) and writes are skipped.
+
+Run:
+    python diagnose_backend.py
+    python diagnose_backend.py --base-url http://127.0.0.1:8000/api/security --samples 20
+    python diagnose_backend.py --stub            # offline: probe a local stand-in server
+    python diagnose_backend.py --json diag.json  # machine-readable report
+    python diagnose_backend.py --restore-snapshot snapshots/seeded --manage-py ../backend/manage.py
+
+If the backend can't be reached at all, the run falls back to the stand-in
+server (as with --stub) unless --no-stub-fallback is given. Stand-in runs
+measure the client only and are never added to the benchmark history.
+
+Credentials default to the test officer created by create_and_fix_test_officer.py.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import bench_history
+from http_pool import ConnectionPool, authenticate
+from replay_trace import add_snapshot_arguments, restore_snapshot, summarize
+
+DEFAULT_BASE_URL = "https://safetnet.onrender.com/api/security"
+ENDPOINTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "api", "endpoints.ts")
+
+# Never probed: they change server state or need a refresh token
+AUTH_PATHS = {"/login/", "/logout/", "/token/refresh/", "/password-reset/"}
+
+# Histogram bucket upper bounds in ms (the last bucket is open-ended)
+HISTOGRAM_BOUNDS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500]
+
+ENDPOINT_LINE = re.compile(r"^\s*(\w+):\s*'(/[^']*)',?\s*(?://\s*(.*))?$")
+METHOD_COMMENT = re.compile(r"^(GET|POST|PATCH|PUT|DELETE)\b")
+
+
+def load_get_endpoints(path=ENDPOINTS_FILE):
+    """GET endpoints without path parameters from API_ENDPOINTS, deduplicated by path"""
+    endpoints = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = ENDPOINT_LINE.match(line)
+            if not match:
+                continue
+            name, endpoint, comment = match.groups()
+            method = METHOD_COMMENT.match(comment or "")
+            if method and method.group(1) != "GET":
+                continue
+            if "{" in endpoint or endpoint in AUTH_PATHS or endpoint in endpoints.values():
+                continue
+            endpoints[name] = endpoint
+    return endpoints
+
+
+def backend_reachable(base_url, timeout):
+    """Can a TCP connection to the backend be opened at all"""
+    parsed = urllib.parse.urlparse(base_url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        socket.create_connection((parsed.hostname, port), timeout=min(timeout, 5.0)).close()
+        return True
+    except OSError:
+        return False
+
+
+def histogram(latencies_ms):
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for latency in latencies_ms:
+        index = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if latency < bound), len(HISTOGRAM_BOUNDS_MS))
+        counts[index] += 1
+    labels = [f"<{bound}" for bound in HISTOGRAM_BOUNDS_MS] + [f">={HISTOGRAM_BOUNDS_MS[-1]}"]
+    return dict(zip(labels, counts))
+
+
+def mean(values):
+    return round(sum(values) / len(values), 2) if values else None
+
+
+async def run_diagnostics(args, endpoints):
+    pool = ConnectionPool(args.base_url, args.concurrency, args.timeout)
+    headers = {}
+
+    print(f"🔐 Authenticating as {args.username}...")
+    try:
+        token, login = await authenticate(pool, args.username, args.password)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+            print(f"   ✅ Logged in ({login['status']}, {login['total_ms']:.0f} ms)")
+        else:
+            print(f"   ⚠️  Login returned {login['status']} without a token - probing unauthenticated")
+    except Exception as e:
+        print(f"   ❌ Login failed: {e} - probing unauthenticated")
+
+    samples = {name: [] for name in endpoints}
+
+    async def probe(name, path):
+        try:
+            result = await pool.request("GET", path, headers)
+        except Exception as e:
+            result = {"status": 0, "error": str(e) or type(e).__name__}
+        result.pop("data", None)
+        samples[name].append(result)
+
+    jobs = [probe(name, path) for name, path in endpoints.items() for _ in range(args.samples)]
+    random.shuffle(jobs)  # Interleave endpoints so one slow endpoint doesn't skew a single batch
+    started = time.perf_counter()
+    await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - started
+    pool.close()
+
+    report = {"base_url": args.base_url, "samples": args.samples, "concurrency": args.concurrency,
+              "connections_opened": pool.opened, "elapsed_s": round(elapsed, 2),
+              "requests": len(jobs), "rps": round(len(jobs) / elapsed, 2) if elapsed else 0.0, "endpoints": {}}
+    for name, results in samples.items():
+        ok = [r for r in results if r["status"]]
+        latencies = [r["total_ms"] for r in ok]
+        fresh = [r for r in ok if r.get("new_connection")]
+        statuses = {}
+        for r in results:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+        report["endpoints"][name] = {
+            "path": endpoints[name],
+            "statuses": statuses,
+            "errors": sorted({r["error"] for r in results if "error" in r}),
+            "latency": summarize(latencies),
+            "histogram": histogram(latencies),
+            "ttfb_ms": mean([r["ttfb_ms"] for r in ok]),
+            "new_connection": {
+                "count": len(fresh),
+                "dns_ms": mean([r["dns_ms"] for r in fresh]),
+                "connect_ms": mean([r["connect_ms"] for r in fresh]),
+                "tls_ms": mean([r["tls_ms"] for r in fresh]),
+            },
+            "payload_bytes": mean([r["bytes"] for r in ok]),
+        }
+    latencies = {name: [r["total_ms"] for r in results if r["status"]] for name, results in samples.items()}
+    return report, latencies
+
+
+def print_report(report):
+    print("\n" + "=" * 60)
+    print("BACKEND DIAGNOSTICS")
+    print("=" * 60)
+    print(f"   {report['requests']} requests in {report['elapsed_s']}s ({report['rps']} req/s), "
+          f"{report['connections_opened']} connections opened")
+
+    print(f"\n   {'endpoint':28} {'status':14} {'p50':>7} {'p95':>7} {'p99':>7} {'ttfb':>7} {'bytes':>8}")
+    for name, entry in report["endpoints"].items():
+        statuses = ",".join(f"{code}x{count}" for code, count in sorted(entry["statuses"].items()))
+        latency = entry["latency"]
+        print(f"   {name[:28]:28} {statuses[:14]:14} {latency['p50_ms']:>7} {latency['p95_ms']:>7} "
+              f"{latency['p99_ms']:>7} {entry['ttfb_ms'] or '-':>7} {entry['payload_bytes'] or '-':>8}")
+
+    print("\n   Latency histograms (ms)")
+    for name, entry in report["endpoints"].items():
+        total = sum(entry["histogram"].values()) or 1
+        bars = "  ".join(f"{label}:{count} {'#' * max(1, round(count / total * 10))}"
+                         for label, count in entry["histogram"].items() if count)
+        print(f"   {name[:28]:28} {bars}")
+
+    print("\n   New connection setup (avg ms)")
+    for name, entry in report["endpoints"].items():
+        setup = entry["new_connection"]
+        if setup["count"]:
+            print(f"   {name[:28]:28} n={setup['count']:<3} dns={setup['dns_ms']:<7} "
+                  f"connect={setup['connect_ms']:<7} tls={setup['tls_ms']}")
+        if entry["errors"]:
+            print(f"   ❌ {name}: {', '.join(entry['errors'])}")
+    print("")
+
+
+def start_stub_server():
+    """Local stand-in backend: canned JSON for every endpoint, small random delay"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            # Headers and body go out in separate writes - don't let Nagle hold the body back
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            super().setup()
+
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(random.uniform(0.002, 0.03))
+            self._reply(200, {"result": "success", "path": self.path, "data": []})
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path.endswith("/login/"):
+                self._reply(200, {"access": "stub-token", "refresh": "stub-refresh", "user": {"id": 1}})
+            else:
+                self._reply(200, {"result": "success"})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/security"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent backend diagnostics")
+    parser.add_argument("--base-url", default=os.environ.get("SAFETNET_API_URL", DEFAULT_BASE_URL))
+    parser.add_argument("--username", default=os.environ.get("SAFETNET_USERNAME", "test_officer"))
+    parser.add_argument("--password", default=os.environ.get("SAFETNET_PASSWORD", "TestOfficer123!"))
+    parser.add_argument("--samples", type=int, default=10, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Keep-alive connections in the pool")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--stub", action="store_true", help="Probe a local stand-in server instead")
+    parser.add_argument("--no-stub-fallback", action="store_true",
+                        help="Fail instead of probing the stand-in server when the backend is unreachable")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--no-history", action="store_true", help="Don't append results to the benchmark history")
+    add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
+    endpoints = load_get_endpoints()
+    if not endpoints:
+        print(f"❌ No GET endpoints found in {ENDPOINTS_FILE}")
+        sys.exit(1)
+
+    server = None
+    if not args.stub and not backend_reachable(args.base_url, args.timeout):
+        if args.no_stub_fallback:
+            print(f"❌ Backend unreachable at {args.base_url}")
+            sys.exit(1)
+        print(f"⚠️  Backend unreachable at {args.base_url} - probing the local stand-in server instead")
+        args.stub = True
+    if args.stub:
+        server, args.base_url = start_stub_server()
+    elif args.restore_snapshot:
+        try:
+            restore_snapshot(args.restore_snapshot, args.manage_py)
+        except (ValueError, OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Snapshot restore failed: {e}")
+            sys.exit(1)
+    print(f"🩺 Probing {len(endpoints)} endpoints x {args.samples} samples at {args.base_url}")
+
+    report, latencies = asyncio.run(run_diagnostics(args, endpoints))
+    print_report(report)
+    if server:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.json}")
+
+    # Stub runs measure the client only (and get a random port) - keep them out of the history
+    if not args.no_history and not args.stub:
+        meta = {"target": args.base_url, "samples": args.samples, "concurrency": args.concurrency}
+        if args.restore_snapshot:
+            meta["snapshot"] = args.restore_snapshot
+        bench_history.record_diagnostics_report(report, latencies, meta)
+        print(f"📈 Results added to {bench_history.history_path()}")
+
+
+if __name__ == "__main__":
+    main()
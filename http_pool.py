@@ -0,0 +1,185 @@
+"""
+Keep-alive HTTP/1.1 client shared by the benchmark scripts.
+A fixed-size pool of asyncio connections (TCP_NODELAY, reused across requests)
+that records how each new connection was established - DNS, connect and TLS
+time - and time to first byte for every response. Used by diagnose_backend.py
+and replay_trace.py so both measure the server through the same client.
+"""
+
+import asyncio
+import json
+import socket
+import ssl
+import time
+import urllib.parse
+
+# Responses that never carry a body, whatever their headers say
+BODILESS_STATUSES = {204, 304}
+
+
+class StaleConnectionError(ConnectionError):
+    """The server closed an idle keep-alive connection before answering - safe to resend"""
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection with timing of how it was established"""
+
+    def __init__(self, reader, writer, dns_ms, connect_ms, tls_ms):
+        self.reader = reader
+        self.writer = writer
+        self.setup = {"dns_ms": dns_ms, "connect_ms": connect_ms, "tls_ms": tls_ms}
+        self.reused = False
+
+    @classmethod
+    async def open(cls, host, port, use_tls, timeout):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        family, socktype, proto, _, address = infos[0]
+        sock = socket.socket(family, socktype, proto)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        await asyncio.wait_for(loop.sock_connect(sock, address), timeout)
+        connected = time.perf_counter()
+        if use_tls:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(sock=sock, ssl=ssl.create_default_context(), server_hostname=host), timeout
+            )
+        else:
+            reader, writer = await asyncio.open_connection(sock=sock)
+        ready = time.perf_counter()
+        return cls(
+            reader, writer,
+            dns_ms=(resolved - started) * 1000,
+            connect_ms=(connected - resolved) * 1000,
+            tls_ms=(ready - connected) * 1000 if use_tls else 0.0,
+        )
+
+    async def request(self, method, host, path, headers, body=None):
+        """Send one request, return (status, body bytes, ttfb_ms, total_ms, keep_alive)"""
+        payload = json.dumps(body).encode() if body is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", "Connection: keep-alive",
+                 "Accept: application/json", f"Content-Length: {len(payload)}"]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        started = time.perf_counter()
+        try:
+            self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+            await self.writer.drain()
+            status_line = await self.reader.readline()
+        except (ConnectionResetError, BrokenPipeError) as e:
+            raise StaleConnectionError(str(e) or "connection reset by server") from e
+        first_byte = time.perf_counter()
+        if not status_line:
+            raise StaleConnectionError("connection closed by server")
+
+        while True:
+            parts = status_line.split()
+            version, status = parts[0], int(parts[1])
+            response_headers = {}
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                response_headers[key.strip().lower()] = value.strip()
+            if status >= 200 or status == 101:
+                break
+            # 1xx interim response (100 Continue, 103 Early Hints) - the real one follows
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise ConnectionError("connection closed by server")
+
+        connection_header = response_headers.get("connection", "").lower()
+        if method == "HEAD" or status in BODILESS_STATUSES or status < 200:
+            data = b""
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            data = bytearray()
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                data += await self.reader.readexactly(size)
+                await self.reader.readline()
+            data = bytes(data)
+        elif "content-length" in response_headers:
+            data = await self.reader.readexactly(int(response_headers["content-length"]))
+        elif connection_header == "close" or (version == b"HTTP/1.0" and connection_header != "keep-alive"):
+            data = await self.reader.read()  # Body delimited by connection close
+            connection_header = "close"
+        else:
+            data = b""  # Persistent connection without a length - nothing to read
+
+        keep_alive = connection_header != "close" and status != 101
+        return status, data, (first_byte - started) * 1000, (time.perf_counter() - started) * 1000, keep_alive
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    def __init__(self, base_url, size, timeout):
+        parsed = urllib.parse.urlparse(base_url)
+        self.use_tls = parsed.scheme == "https"
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if self.use_tls else 80)
+        self.prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def request(self, method, path, headers, body=None):
+        async with self.slots:
+            connection = self.idle.pop() if self.idle else None
+            while True:
+                if connection is None:
+                    connection = await Connection.open(self.host, self.port, self.use_tls, self.timeout)
+                    self.opened += 1
+                try:
+                    status, data, ttfb, total, keep_alive = await asyncio.wait_for(
+                        connection.request(method, self.host, self.prefix + path, headers, body), self.timeout
+                    )
+                    break
+                except StaleConnectionError:
+                    connection.close()
+                    if not connection.reused:
+                        raise
+                    # The server timed out an idle connection - retry once on a fresh one
+                    connection = None
+                except Exception:
+                    connection.close()
+                    raise
+            result = {
+                "status": status,
+                "bytes": len(data),
+                "data": data,
+                "ttfb_ms": ttfb,
+                "total_ms": total,
+                "new_connection": not connection.reused,
+                **(connection.setup if not connection.reused else {}),
+            }
+            if keep_alive:
+                connection.reused = True
+                self.idle.append(connection)
+            else:
+                connection.close()
+            return result
+
+    def close(self):
+        for connection in self.idle:
+            connection.close()
+        self.idle = []
+
+
+async def authenticate(pool, username, password):
+    result = await pool.request("POST", "/login/", {}, {"username": username, "password": password})
+    try:
+        data = json.loads(result["data"] or b"{}")
+    except ValueError:
+        data = {}
+    token = data.get("access") or data.get("token") or (data.get("tokens") or {}).get("access")
+    return token, result
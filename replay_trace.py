@@ -0,0 +1,425 @@
+"""
+Replay a captured request trace against a server and compare latencies.
+Traces come from the app's request sampler (src/api/requestTrace.ts, JSON
+lines: a header with the sample rate, then one record per request). Requests
+are re-driven on the original timeline, compressed by --speed, through the
+same keep-alive asyncio client as diagnose_backend.py (http_pool.py), and the
+report compares replay latency and throughput with what was recorded on the
+device.
+
+Load matches the device, not the sample: each record is replayed
+1 / sample_rate times (jittered around its original offset) unless
+--no-amplify is given.
+
+Reads and live-location writes are replayed. Location bodies are recorded
+without coordinates, so positions are synthesized around --center, and every
+recorded session (per replica) gets its own session started on the target.
+Other writes are counted and skipped. "<officer>" placeholders become
+--officer-id; redacted values are dropped.
+
+Run:
+    python replay_trace.py trace.jsonl
+    python replay_trace.py trace.jsonl --speed 5 --base-url http://127.0.0.1:8000/api/security
+    python replay_trace.py trace.jsonl --speed 10 --token <jwt> --officer-id 12 --json results.json
+    python replay_trace.py trace.jsonl --restore-snapshot snapshots/seeded --manage-py ../backend/manage.py
+
+--restore-snapshot restores a seeded snapshot (db_snapshot.py, through the
+backend's manage.py shell) before the run, so every run starts from the same data.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import urllib.parse
+
+import bench_history
+from http_pool import ConnectionPool, authenticate
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000/api/security"
+
+# Map center of the seeded geofence (src/data/geofenceData.ts)
+DEFAULT_CENTER = "18.647,73.784"
+
+# Numeric ids in paths are grouped per endpoint: /sos/42/ -> /sos/{id}/
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Writes that are safe to repeat against a snapshot: live-location start / update / stop
+LIVE_LOCATION_COLLECTION = "/live_location/"
+LIVE_LOCATION_SESSION = re.compile(r"^/live_location/([^/]+)/$")
+
+# Degrees of random walk around --center for synthesized positions (~1 km)
+POSITION_SPREAD_DEG = 0.01
+
+DB_SNAPSHOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "db_snapshot.py")
+
+
+def restore_snapshot(snapshot_path, manage_py):
+    """Restore a db_snapshot.py snapshot into the backend's database before a run"""
+    if not manage_py:
+        raise ValueError("--restore-snapshot needs --manage-py (the backend's manage.py)")
+    env = dict(os.environ, SNAPSHOT_ACTION="restore", SNAPSHOT_PATH=os.path.abspath(snapshot_path))
+    print(f"🗄️  Restoring snapshot {snapshot_path}...")
+    with open(DB_SNAPSHOT_SCRIPT, encoding="utf-8") as script:
+        subprocess.run([sys.executable, os.path.abspath(manage_py), "shell"], stdin=script, env=env,
+                       cwd=os.path.dirname(os.path.abspath(manage_py)), check=True)
+
+
+def add_snapshot_arguments(parser):
+    parser.add_argument("--restore-snapshot", metavar="PATH",
+                        help="Restore this db_snapshot.py snapshot before the run (e.g. snapshots/seeded)")
+    parser.add_argument("--manage-py", default=os.environ.get("SAFETNET_MANAGE_PY"),
+                        help="The backend's manage.py, used to restore the snapshot")
+
+
+def endpoint_of(record):
+    return f"{record['method']} {ID_SEGMENT.sub('/{id}', record['path'])}"
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(latencies_ms):
+    values = sorted(latencies_ms)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+        "max_ms": round(values[-1], 2) if values else 0.0,
+    }
+
+
+def load_trace(path):
+    """(header, records) - traces captured before the header existed replay at rate 1"""
+    header = {}
+    records = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️  Skipping malformed line {line_number}")
+                continue
+            if entry.get("type") == "header":
+                header = entry
+            else:
+                records.append(entry)
+    records.sort(key=lambda r: r.get("t", 0))
+    return header, records
+
+
+def is_replayable(record):
+    method = record.get("method", "GET").upper()
+    if method == "GET":
+        return True
+    if method == "POST":
+        return record.get("path") == LIVE_LOCATION_COLLECTION
+    return method in ("PATCH", "DELETE") and bool(LIVE_LOCATION_SESSION.match(record.get("path", "")))
+
+
+def amplify(records, factor, rng):
+    """Repeat each sampled record ~factor times, spread around its offset"""
+    if factor <= 1 or not records:
+        return [dict(record, replica=0) for record in records]
+    span = records[-1].get("t", 0) - records[0].get("t", 0)
+    jitter_ms = span / len(records) / 2
+    amplified = []
+    for record in records:
+        copies = int(factor) + (1 if rng.random() < factor - int(factor) else 0)
+        for replica in range(max(1, copies)):
+            t = record.get("t", 0) + (rng.uniform(-jitter_ms, jitter_ms) if replica else 0)
+            amplified.append(dict(record, t=max(0, t), replica=replica))
+    amplified.sort(key=lambda r: r["t"])
+    return amplified
+
+
+class Synthesizer:
+    """Fills "<synthesized>" fields: a small random walk per session around the center"""
+
+    def __init__(self, center, rng):
+        self.center = center
+        self.rng = rng
+        self.positions = {}
+
+    def value(self, key, stream):
+        key = key.lower()
+        if key in ("latitude", "lat", "location_lat", "longitude", "lng", "location_long"):
+            lat, lng = self.positions.get(stream) or (
+                self.center[0] + self.rng.uniform(-POSITION_SPREAD_DEG, POSITION_SPREAD_DEG),
+                self.center[1] + self.rng.uniform(-POSITION_SPREAD_DEG, POSITION_SPREAD_DEG),
+            )
+            if key in ("latitude", "lat", "location_lat"):
+                lat += self.rng.uniform(-0.0002, 0.0002)
+                value = lat
+            else:
+                lng += self.rng.uniform(-0.0002, 0.0002)
+                value = lng
+            self.positions[stream] = (lat, lng)
+            return f"{value:.6f}"
+        if key == "accuracy":
+            return f"{self.rng.uniform(5, 30):.1f}"
+        if key == "timestamp":
+            return str(int(time.time() * 1000))
+        return "replay"
+
+
+def substitute(values, officer_id, synthesizer, stream, is_body):
+    """Placeholders -> replayable values; redacted params are dropped, redacted body fields stubbed"""
+    result = {}
+    for key, value in (values or {}).items():
+        if value == "<officer>":
+            if officer_id is not None:
+                result[key] = officer_id
+        elif value == "<synthesized>":
+            result[key] = synthesizer.value(key, stream)
+        elif value == "<redacted>":
+            if is_body:
+                result[key] = "replay"
+        else:
+            result[key] = value
+    return result
+
+
+def session_id_of(data):
+    try:
+        body = json.loads(data or b"{}")
+    except ValueError:
+        return None
+    session = body.get("session") or body.get("data") or {}
+    if not isinstance(session, dict):
+        session = {}
+    return session.get("id") or session.get("session_id") or body.get("session_id") or body.get("id")
+
+
+async def replay(records, base_url, speed, concurrency, token, timeout, officer_id=None, center=None,
+                 geofence_id=None, seed=0):
+    loop = asyncio.get_running_loop()
+    pool = ConnectionPool(base_url, concurrency, timeout)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    synthesizer = Synthesizer(center or tuple(float(v) for v in DEFAULT_CENTER.split(",")), random.Random(seed))
+    sessions = {}  # (recorded session id, replica) -> future of the target's session id
+    stats = {"sessions_started": 0, "session_failures": 0}
+    results = []
+    max_lag_ms = 0.0
+    first_t = records[0].get("t", 0) if records else 0
+    started = loop.time()
+
+    async def send(method, path, params=None, body=None):
+        if params:
+            path += "?" + urllib.parse.urlencode(params, doseq=True)
+        request_started = time.perf_counter()
+        try:
+            result = await pool.request(method, path, headers, body)
+            return result["status"], result["total_ms"], result["data"]
+        except Exception:
+            return 0, (time.perf_counter() - request_started) * 1000, b""
+
+    async def start_session():
+        body = {"duration_minutes": 60}
+        if officer_id is not None:
+            body["security_id"] = officer_id
+        if geofence_id is not None:
+            body["geofence_id"] = geofence_id
+        status, _, data = await send("POST", LIVE_LOCATION_COLLECTION, body=body)
+        session_id = session_id_of(data) if 200 <= status < 300 else None
+        stats["sessions_started" if session_id else "session_failures"] += 1
+        return session_id
+
+    async def target_path(record):
+        match = LIVE_LOCATION_SESSION.match(record["path"])
+        if not match or record.get("method", "GET").upper() == "GET":
+            return record["path"]
+        key = (match.group(1), record.get("replica", 0))
+        if key not in sessions:
+            sessions[key] = asyncio.ensure_future(start_session())
+        session_id = await sessions[key]
+        return f"/live_location/{session_id}/" if session_id else record["path"]
+
+    async def run(record):
+        method = record.get("method", "GET").upper()
+        stream = (record.get("path"), record.get("replica", 0))
+        params = substitute(record.get("params"), officer_id, synthesizer, stream, is_body=False)
+        body = substitute(record.get("body"), officer_id, synthesizer, stream, is_body=True) if method != "GET" else None
+        if method != "GET" and body is None:
+            body = {}
+        path = await target_path(record)
+        status, latency, _ = await send(method, path, params, body)
+        results.append((record, status, latency))
+
+    tasks = []
+    for record in records:
+        due = started + (record.get("t", 0) - first_t) / 1000 / speed
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            max_lag_ms = max(max_lag_ms, -delay * 1000)
+        tasks.append(asyncio.create_task(run(record)))
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - started
+    pool.close()
+    stats["connections_opened"] = pool.opened
+    return results, elapsed, max_lag_ms, stats
+
+
+def build_report(records, results, elapsed_s, max_lag_ms, speed, skipped, amplification=1.0, stats=None):
+    recorded_span_s = max((records[-1].get("t", 0) - records[0].get("t", 0)) / 1000, 0.001) if records else 0.001
+    per_endpoint = {}
+    for record, status, latency in results:
+        entry = per_endpoint.setdefault(endpoint_of(record), {"recorded": [], "replay": [], "errors": 0})
+        if record.get("duration_ms") is not None and record.get("status", 0) > 0:
+            entry["recorded"].append(record["duration_ms"])
+        entry["replay"].append(latency)
+        if status == 0 or status >= 500:
+            entry["errors"] += 1
+
+    endpoints = {}
+    for name, entry in sorted(per_endpoint.items(), key=lambda item: -len(item[1]["replay"])):
+        recorded = summarize(entry["recorded"])
+        replayed = summarize(entry["replay"])
+        endpoints[name] = {
+            "recorded": recorded,
+            "replay": replayed,
+            "errors": entry["errors"],
+            "p95_delta_pct": round((replayed["p95_ms"] - recorded["p95_ms"]) / recorded["p95_ms"] * 100, 1)
+            if recorded["count"] and recorded["p95_ms"] else None,
+        }
+
+    return {
+        "speed": speed,
+        "amplification": round(amplification, 2),
+        "requests": len(results),
+        "skipped_writes": skipped,
+        **(stats or {}),
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "elapsed_s": round(elapsed_s, 2),
+        "recorded_rps": round(len(results) / recorded_span_s, 2),
+        "replay_rps": round(len(results) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        "max_schedule_lag_ms": round(max_lag_ms, 1),
+        "overall": {
+            "recorded": summarize([r.get("duration_ms", 0) for r, _, _ in results if r.get("status", 0) > 0]),
+            "replay": summarize([latency for _, _, latency in results]),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report):
+    print("\n" + "=" * 60)
+    print(f"REPLAY RESULTS ({report['speed']}x, each record x{report['amplification']})")
+    print("=" * 60)
+    print(f"   Requests: {report['requests']}  (skipped writes: {report['skipped_writes']}, errors: {report['errors']})")
+    if report.get("sessions_started") or report.get("session_failures"):
+        print(f"   Live-location sessions started: {report['sessions_started']} (failed: {report['session_failures']})")
+    print(f"   Elapsed: {report['elapsed_s']}s   Throughput: {report['replay_rps']} req/s (recorded {report['recorded_rps']} req/s)")
+    if report["max_schedule_lag_ms"] > 100:
+        print(f"   ⚠️  Client fell behind schedule by up to {report['max_schedule_lag_ms']} ms - raise --concurrency")
+
+    overall = report["overall"]
+    print(f"\n   {'':34} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print(f"   {'recorded (device)':34} {overall['recorded']['p50_ms']:>8} {overall['recorded']['p95_ms']:>8} {overall['recorded']['p99_ms']:>8}")
+    print(f"   {'replay':34} {overall['replay']['p50_ms']:>8} {overall['replay']['p95_ms']:>8} {overall['replay']['p99_ms']:>8}")
+
+    print(f"\n   {'endpoint':34} {'n':>6} {'p95 rec':>9} {'p95 now':>9} {'delta':>8}")
+    for name, entry in report["endpoints"].items():
+        delta = f"{entry['p95_delta_pct']:+.1f}%" if entry["p95_delta_pct"] is not None else "-"
+        print(f"   {name[:34]:34} {entry['replay']['count']:>6} {entry['recorded']['p95_ms']:>9} {entry['replay']['p95_ms']:>9} {delta:>8}")
+    print("")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a captured request trace")
+    parser.add_argument("trace", help="Trace file (JSON lines from requestTrace.exportJsonLines)")
+    parser.add_argument("--base-url", default=os.environ.get("SAFETNET_API_URL", DEFAULT_BASE_URL))
+    parser.add_argument("--speed", type=float, default=1.0, help="Timeline compression (1, 5, 10, ...)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Keep-alive connections (max requests in flight)")
+    parser.add_argument("--token", default=os.environ.get("SAFETNET_TOKEN"), help="JWT for the Authorization header")
+    parser.add_argument("--username", default=os.environ.get("SAFETNET_USERNAME"), help="Log in for a token instead")
+    parser.add_argument("--password", default=os.environ.get("SAFETNET_PASSWORD"))
+    parser.add_argument("--officer-id", default=os.environ.get("SAFETNET_OFFICER_ID"),
+                        help='Replaces "<officer>" placeholders (dropped when unset)')
+    parser.add_argument("--geofence-id", help="geofence_id for the live-location sessions the replay starts")
+    parser.add_argument("--center", default=DEFAULT_CENTER, help="lat,lng that synthesized positions wander around")
+    parser.add_argument("--no-amplify", action="store_true", help="Replay the sample as-is instead of 1 / sample_rate")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for amplification jitter and positions")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--no-history", action="store_true", help="Don't append results to the benchmark history")
+    add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
+    header, records = load_trace(args.trace)
+    replayable = [r for r in records if is_replayable(r)]
+    skipped = len(records) - len(replayable)
+    if not replayable:
+        print("❌ No replayable requests in trace")
+        sys.exit(1)
+
+    sample_rate = header.get("sample_rate") or 1.0
+    if not header:
+        print("⚠️  Trace has no header (captured before sample rates were recorded) - replaying as-is")
+    amplification = 1.0 if args.no_amplify else 1.0 / sample_rate
+    rng = random.Random(args.seed)
+    scheduled = amplify(replayable, amplification, rng)
+    center = tuple(float(v) for v in args.center.split(","))
+
+    if args.restore_snapshot:
+        try:
+            restore_snapshot(args.restore_snapshot, args.manage_py)
+        except (ValueError, OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Snapshot restore failed: {e}")
+            sys.exit(1)
+
+    token = args.token
+    if not token and args.username:
+        async def login():
+            pool = ConnectionPool(args.base_url, 1, args.timeout)
+            try:
+                return (await authenticate(pool, args.username, args.password or ""))[0]
+            finally:
+                pool.close()
+        token = asyncio.run(login())
+        print(f"🔐 Logged in as {args.username}" if token else f"⚠️  Login as {args.username} failed - replaying unauthenticated")
+
+    print(f"🔁 Replaying {len(scheduled)} requests ({len(replayable)} sampled at rate {sample_rate:g}, x{amplification:g}) "
+          f"from {args.trace} against {args.base_url} at {args.speed}x")
+    results, elapsed_s, max_lag_ms, stats = asyncio.run(
+        replay(scheduled, args.base_url, args.speed, args.concurrency, token, args.timeout,
+               officer_id=args.officer_id, center=center, geofence_id=args.geofence_id, seed=args.seed)
+    )
+    report = build_report(scheduled, results, elapsed_s, max_lag_ms, args.speed, skipped, amplification, stats)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.json}")
+
+    if not args.no_history:
+        latencies = {"overall": [latency for _, _, latency in results]}
+        for record, _, latency in results:
+            latencies.setdefault(endpoint_of(record), []).append(latency)
+        meta = {"target": args.base_url, "speed": args.speed, "trace": os.path.basename(args.trace),
+                "concurrency": args.concurrency, "amplification": round(amplification, 2)}
+        if args.restore_snapshot:
+            meta["snapshot"] = args.restore_snapshot
+        bench_history.record_replay_report(report, latencies, meta)
+        print(f"📈 Results added to {bench_history.history_path()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@ import axios from 'axios';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 
 import apiConfig from './config';
+import { installReadCoalescing, clearReadCache } from './readCoalescing';
+import { requestTrace } from './requestTrace';
+import { storage } from '../utils/storage';
 
 // Hardened Axios config for mobile + Render + TLS handshake
 const axiosInstance = axios.create({
@@ -27,6 +30,12 @@ axiosInstance.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// Share identical polled GETs between screens; writes invalidate them
+installReadCoalescing(axiosInstance);
+
+// Sampled request traces for replay benchmarking (idle until requestTrace.start)
+requestTrace.install(axiosInstance);
+
 // Track logged 404 endpoints to avoid console spam
 const logged404Endpoints = new Set<string>();
 // Track logged network errors to avoid console spam
@@ -102,7 +111,8 @@ axiosInstance.interceptors.response.use(
     }
     
     if (error.response && error.response.status === 401) {
-      await AsyncStorage.clear();
+      clearReadCache();
+      await storage.clear();
       // Navigate to login - will be handled by navigation
     }
     return Promise.reject(error);
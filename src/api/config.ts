@@ -4,6 +4,9 @@
  */
 export const ENABLE_API_CALLS = true; // Set to false to disable API calls and use mock data
 
+// Fraction of API requests recorded for replay benchmarking after login (0 = off, see requestTrace.ts)
+export const REQUEST_TRACE_SAMPLE_RATE = 0;
+
 // Replace with your real Render URL, include the protocol
 // Deployed backend URL: https://safetnet.onrender.com
 const BACKEND_BASE_URL = 'https://safetnet.onrender.com';
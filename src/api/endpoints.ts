@@ -46,7 +46,8 @@ export const API_ENDPOINTS = {
 
   // ==================== NOTIFICATIONS ====================
   LIST_NOTIFICATIONS: '/notifications/',
-  ACKNOWLEDGE_NOTIFICATIONS: '/notifications/acknowledge/', // POST
+  ACKNOWLEDGE_NOTIFICATIONS: '/notifications/acknowledge/', // POST { up_to_id } - bulk acknowledge
+  NOTIFICATION_COUNTS: '/notifications/counts/', // GET - unread count only (badge polling)
   
   // Legacy notifications endpoint
   NOTIFICATIONS: '/notifications/',
@@ -63,27 +64,41 @@ export const API_ENDPOINTS = {
   UPDATE_LIVE_LOCATION: '/live_location/{session_id}/', // PATCH
   STOP_LIVE_LOCATION: '/live_location/{session_id}/', // DELETE
 
+  // ==================== OFFLINE REPLAY ====================
+  // Ordered array of queued mutations applied in one transaction (per-item results keyed by idempotency_key)
+  BATCH_MUTATIONS: '/batch/', // POST
+
   // ==================== LEGACY/ADDITIONAL (not in documented API) ====================
   // These are kept for backward compatibility or may be used by frontend
   // NOTE: These endpoints may not exist - use live_location endpoints instead
   UPDATE_LOCATION: '/live_location/', // Maps to live_location
   GET_USER_LOCATION: '/live_location/', // User location might be in SOS alert data
   GET_GEOFENCE_DETAILS: '/geofence/',
-  GET_USERS_IN_AREA: '/geofence/users/',
-  SEND_BROADCAST: '/broadcast/',
+  GET_GEOFENCE_ROADS: '/geofence/{geofence_id}/roads/', // GET - road network GeoJSON for travel-time ETAs
+  GET_USERS_IN_AREA: '/geofence/users/', // POST { geofence_id } - read-only query
+  SEND_BROADCAST: '/broadcast/', // POST
   GET_LOGS: '/logs/', // May map to incidents or cases
 };
 
-
-
-
-
-
-
-
-
-
-
-
-
-
+/**
+ * Field projections for high-volume list endpoints (sent as ?fields=)
+ * Backends that support projection only serialize these fields; others ignore the param
+ */
+export const FIELD_PROJECTIONS = {
+  // Everything read from SOS list items: alertService's Alert transform (getAlerts and
+  // getAlertLogs) plus alertRollups' accept/resolve timings - add fields here when a reader needs more
+  SOS_LIST: [
+    'id', 'log_id', 'user_id', 'security_id', 'created_by',
+    'user_name', 'officer_name', 'name', 'first_name', 'last_name', 'username', 'user',
+    'user_email', 'user_phone', 'user_image',
+    'alert_type', 'alertType', 'type', 'alert_type_id', 'original_alert_type', 'priority', 'message', 'status',
+    'location', 'location_lat', 'location_long', 'location_address', 'address', 'distance',
+    'geofence_id', 'timestamp', 'created_at', 'updated_at',
+    'accepted_at', 'accepted_by', 'resolved_at',
+  ].join(','),
+  // locationService only needs the owner, their role / duty status and coordinates of each session
+  LIVE_LOCATION_SESSIONS: [
+    'id', 'session_id', 'user_id', 'security_id', 'security_officer_id', 'role', 'user_role',
+    'duty_status', 'status', 'latitude', 'longitude', 'updated_at', 'last_seen',
+  ].join(','),
+};
@@ -0,0 +1,176 @@
+import axios, { AxiosInstance, AxiosResponse, InternalAxiosRequestConfig } from 'axios';
+import { API_ENDPOINTS } from './endpoints';
+
+/**
+ * Coalescing for the read-heavy polled endpoints
+ * Screens poll these endpoints independently, often several at once. Identical
+ * GETs share one in-flight request and a short-lived response. Each caller gets its
+ * own copy of the payload, so a service transforming one in place can't corrupt the
+ * others. The officer's own write (accept, resolve, profile PATCH) drops only the
+ * cached reads of the resource it changed, and for a short window those reads are
+ * sent with a read-your-writes hint. A backend that routes reads to replicas can
+ * use that hint to serve them from the primary.
+ */
+
+// Endpoints hammered by polling - everything else goes straight to the network
+const POLLED_READ_ENDPOINTS = new Set<string>([
+  API_ENDPOINTS.GET_ACTIVE_SOS,
+  API_ENDPOINTS.DASHBOARD,
+  API_ENDPOINTS.LIST_NOTIFICATIONS,
+  API_ENDPOINTS.NOTIFICATION_COUNTS,
+  API_ENDPOINTS.GET_USERS_IN_AREA,
+]);
+
+// Reads sent as POST (query in the body) - not writes, so they don't invalidate anything
+const QUERY_POST_ENDPOINTS = new Set<string>([
+  API_ENDPOINTS.GET_USERS_IN_AREA,
+]);
+
+// Polled reads a write can change, keyed by the resource it writes to (first path segment).
+// Writes to a resource missing here (e.g. /batch/ replaying mixed mutations) drop every cached read.
+const WRITE_INVALIDATES: Record<string, string[]> = {
+  sos: [API_ENDPOINTS.GET_ACTIVE_SOS, API_ENDPOINTS.DASHBOARD],
+  alerts: [API_ENDPOINTS.GET_ACTIVE_SOS, API_ENDPOINTS.DASHBOARD],
+  case: [API_ENDPOINTS.DASHBOARD],
+  incidents: [API_ENDPOINTS.DASHBOARD],
+  profile: [API_ENDPOINTS.DASHBOARD],
+  notifications: [API_ENDPOINTS.LIST_NOTIFICATIONS, API_ENDPOINTS.NOTIFICATION_COUNTS],
+  // Location pings every few seconds, broadcasts and auth calls change none of the polled reads
+  // (cached reads are keyed by Authorization, so a new token never sees the old one's responses)
+  live_location: [],
+  broadcast: [],
+  login: [],
+  logout: [],
+  token: [],
+  'password-reset': [],
+};
+
+// Writes that invalidate without a read-your-writes window
+// (acknowledging is a background call and must not slow down the notification polls)
+const BACKGROUND_WRITE_RESOURCES = new Set(['notifications']);
+
+// How long a polled response may be reused by other callers
+const READ_CACHE_TTL_MS = 3000;
+
+// After a write, reads bypass the cache and ask for primary reads this long
+const READ_YOUR_WRITES_MS = 10000;
+
+export const READ_CONSISTENCY_HEADER = 'X-Read-Consistency';
+
+const MUTATING_METHODS = new Set(['post', 'put', 'patch', 'delete']);
+
+const cache: Map<string, { path: string; expiresAt: number; response: AxiosResponse }> = new Map();
+const inFlight: Map<string, Promise<AxiosResponse>> = new Map();
+
+// Bumped on every invalidating write so a read that started before the write isn't cached
+let generation = 0;
+
+// Polled read path -> end of its read-your-writes window
+const stickyUntil: Map<string, number> = new Map();
+
+const pathOf = (url: string | undefined): string => (url || '').split('?')[0];
+
+const resourceOf = (path: string): string => path.split('/').filter(Boolean)[0] || '';
+
+// axios replaces response.data with the parsed payload on the object it is handed, and
+// services transform it in place - so the cached response itself never leaves this module
+const copyResponse = (response: AxiosResponse, config: InternalAxiosRequestConfig): AxiosResponse => ({
+  ...response,
+  config,
+  data: response.data !== null && typeof response.data === 'object' ? JSON.parse(JSON.stringify(response.data)) : response.data,
+});
+
+const cacheKey = (config: InternalAxiosRequestConfig): string =>
+  [
+    config.method,
+    config.url,
+    JSON.stringify(config.params || {}),
+    typeof config.data === 'string' ? config.data : JSON.stringify(config.data || {}),
+    String(config.headers?.Authorization || ''),
+  ].join('|');
+
+/**
+ * Drop every cached read (e.g. on logout)
+ */
+export const clearReadCache = () => {
+  generation += 1;
+  cache.clear();
+};
+
+const invalidateReads = (paths: string[]) => {
+  if (paths.length === 0) {
+    return;
+  }
+  const affected = new Set(paths);
+  generation += 1;
+  cache.forEach((entry, key) => {
+    if (affected.has(entry.path)) {
+      cache.delete(key);
+    }
+  });
+};
+
+export const installReadCoalescing = (instance: AxiosInstance) => {
+  const networkAdapter = axios.getAdapter(instance.defaults.adapter);
+
+  const coalescingAdapter = (config: InternalAxiosRequestConfig): Promise<AxiosResponse> => {
+    const key = cacheKey(config);
+    const cached = cache.get(key);
+    if (cached && cached.expiresAt > Date.now()) {
+      return Promise.resolve(copyResponse(cached.response, config));
+    }
+
+    const pending = inFlight.get(key);
+    if (pending) {
+      return pending.then((response) => copyResponse(response, config));
+    }
+
+    const startedGeneration = generation;
+    const request = networkAdapter(config)
+      .then((response) => {
+        if (startedGeneration === generation && response.status >= 200 && response.status < 300) {
+          cache.set(key, { path: pathOf(config.url), expiresAt: Date.now() + READ_CACHE_TTL_MS, response });
+        }
+        return response;
+      })
+      .finally(() => {
+        inFlight.delete(key);
+      });
+    inFlight.set(key, request);
+    return request.then((response) => copyResponse(response, config));
+  };
+
+  instance.interceptors.request.use((config) => {
+    const method = (config.method || 'get').toLowerCase();
+    const path = pathOf(config.url);
+    const isQueryPost = method === 'post' && QUERY_POST_ENDPOINTS.has(path);
+
+    if (MUTATING_METHODS.has(method) && !isQueryPost) {
+      const resource = resourceOf(path);
+      const affected = WRITE_INVALIDATES[resource] || Array.from(POLLED_READ_ENDPOINTS);
+      if (WRITE_INVALIDATES[resource]) {
+        invalidateReads(affected);
+      } else {
+        clearReadCache();
+      }
+      if (!BACKGROUND_WRITE_RESOURCES.has(resource)) {
+        const until = Date.now() + READ_YOUR_WRITES_MS;
+        affected.forEach((readPath) => stickyUntil.set(readPath, until));
+      }
+      return config;
+    }
+
+    if ((method !== 'get' && !isQueryPost) || !POLLED_READ_ENDPOINTS.has(path)) {
+      return config;
+    }
+
+    if (Date.now() < (stickyUntil.get(path) || 0)) {
+      // Recent write by this officer - read it back from the primary, uncached
+      config.headers.set(READ_CONSISTENCY_HEADER, 'primary');
+      return config;
+    }
+
+    config.adapter = coalescingAdapter;
+    return config;
+  });
+};
@@ -0,0 +1,253 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { AppState, NativeEventSubscription } from 'react-native';
+import { AxiosInstance, AxiosResponse, InternalAxiosRequestConfig } from 'axios';
+import { hmacSha256Hex, randomHex } from '../utils/hmac';
+import { constants } from '../utils/constants';
+
+/**
+ * Sampled, anonymized request traces for offline replay (see replay_trace.py)
+ * The export starts with a header line carrying the sample rate, so a replay can
+ * scale the recorded traffic back up. Each sampled request then records its offset
+ * from the start of the capture, method, path, query params and (for writes) body
+ * fields, status, duration and a pseudonym of the officer.
+ *
+ * Params and body fields are allowlisted: ids, filters and paging are kept verbatim,
+ * the officer's own id becomes "<officer>", coordinates and device readings become
+ * "<synthesized>" (replay generates them), everything else "<redacted>". The officer
+ * pseudonym is an HMAC-SHA256 keyed with a random per-capture salt that never leaves
+ * memory, so it cannot be reversed by hashing known ids.
+ *
+ * The trace is persisted when the capture stops and whenever the app goes to the
+ * background, under a key logout does not clear. Pull it from a debug build with:
+ *   adb shell "run-as com.safetnetsecurity sqlite3 databases/RKStorage \
+ *     \"SELECT value FROM catalystLocalStorage WHERE key = 'request_trace'\"" > trace.jsonl
+ */
+
+export const TRACE_FORMAT_VERSION = 2;
+
+export interface TraceHeader {
+  type: 'header';
+  version: number;
+  sample_rate: number; // Fraction of requests recorded - replay multiplies by 1 / sample_rate
+  started_at: number; // Epoch ms
+}
+
+export interface TraceRecord {
+  t: number; // ms since the capture started
+  method: string;
+  path: string; // Relative to /api/security, query string moved into params
+  params?: Record<string, any>;
+  body?: Record<string, any>; // Writes only, anonymized like params
+  status: number; // 0 = no response (network error)
+  duration_ms: number;
+  officer?: string; // Salted HMAC of the officer id
+  body_bytes?: number; // Size of the request body, for writes
+}
+
+// Fraction of requests recorded while capturing
+const DEFAULT_SAMPLE_RATE = 0.1;
+
+// Ring buffer size - the oldest records are dropped past this
+const MAX_TRACE_RECORDS = 5000;
+
+const TRACE_STORAGE_KEY = constants.STORAGE_KEYS.REQUEST_TRACE;
+
+// Kept verbatim: filters, paging and non-personal ids the server needs to do the same work
+const SAFE_FIELDS = [
+  'fields', 'page', 'page_size', 'limit', 'offset', 'ordering', 'status', 'type', 'alert_type', 'priority',
+  'geofence_id', 'last_seen_after', 'since', 'up_to_id', 'duration_minutes', 'is_active',
+];
+
+// Officer / user ids - "<officer>" when it is the capturing officer, redacted otherwise
+const IDENTITY_FIELDS = ['security_id', 'officer_id', 'security_officer_id', 'user_id'];
+
+// Position and device readings - replay generates plausible values
+const SYNTHESIZED_FIELDS = ['latitude', 'longitude', 'lat', 'lng', 'location_lat', 'location_long', 'accuracy', 'timestamp'];
+
+let sampleRate = 0;
+let captureRate = 0; // Rate of the current/last capture - survives stop() for the export header
+let captureStartedAt = 0;
+let captureSalt = '';
+let captureOfficerId: string | undefined;
+let officerHash: string | undefined;
+let records: TraceRecord[] = [];
+let appStateSubscription: NativeEventSubscription | null = null;
+
+const startTimes: WeakMap<InternalAxiosRequestConfig, number> = new WeakMap();
+
+const anonymizeFields = (fields: any): Record<string, any> | undefined => {
+  if (!fields || typeof fields !== 'object' || Array.isArray(fields)) {
+    return undefined;
+  }
+  const result: Record<string, any> = {};
+  Object.keys(fields).forEach((key) => {
+    const value = fields[key];
+    if (value === undefined) {
+      return;
+    }
+    const lowered = key.toLowerCase();
+    if (SAFE_FIELDS.includes(lowered) && (value === null || typeof value !== 'object')) {
+      result[key] = value;
+    } else if (IDENTITY_FIELDS.includes(lowered)) {
+      result[key] = captureOfficerId !== undefined && String(value) === captureOfficerId ? '<officer>' : '<redacted>';
+    } else if (SYNTHESIZED_FIELDS.includes(lowered)) {
+      result[key] = '<synthesized>';
+    } else {
+      result[key] = '<redacted>';
+    }
+  });
+  return Object.keys(result).length ? result : undefined;
+};
+
+// Services build some query strings into the url itself (`/sos/?security_id=...`)
+const queryParamsOf = (url: string): Record<string, string> => {
+  const params: Record<string, string> = {};
+  const query = url.split('?')[1];
+  if (!query) {
+    return params;
+  }
+  query.split('&').forEach((pair) => {
+    if (!pair) {
+      return;
+    }
+    const [key, value = ''] = pair.split('=');
+    try {
+      params[decodeURIComponent(key)] = decodeURIComponent(value.replace(/\+/g, ' '));
+    } catch (error) {
+      params[key] = value;
+    }
+  });
+  return params;
+};
+
+const parseBody = (data: any): any => {
+  if (typeof data !== 'string') {
+    return data;
+  }
+  try {
+    return JSON.parse(data);
+  } catch (error) {
+    return undefined;
+  }
+};
+
+const bodySize = (data: any): number | undefined => {
+  if (data === undefined || data === null) {
+    return undefined;
+  }
+  return (typeof data === 'string' ? data : JSON.stringify(data)).length;
+};
+
+const record = (config: InternalAxiosRequestConfig | undefined, status: number) => {
+  if (!config) {
+    return;
+  }
+  const startedAt = startTimes.get(config);
+  if (startedAt === undefined) {
+    return; // Not sampled
+  }
+  startTimes.delete(config);
+  const method = (config.method || 'get').toUpperCase();
+  const url = config.url || '';
+  records.push({
+    t: startedAt - captureStartedAt,
+    method,
+    path: url.split('?')[0],
+    params: anonymizeFields({ ...queryParamsOf(url), ...(config.params || {}) }),
+    body: method === 'GET' ? undefined : anonymizeFields(parseBody(config.data)),
+    status,
+    duration_ms: Date.now() - startedAt,
+    officer: officerHash,
+    body_bytes: method === 'GET' ? undefined : bodySize(config.data),
+  });
+  if (records.length > MAX_TRACE_RECORDS) {
+    records = records.slice(records.length - MAX_TRACE_RECORDS);
+  }
+};
+
+export const requestTrace = {
+  /**
+   * Start sampling requests
+   * @param officerId - Exported only as a salted HMAC / "<officer>" placeholder
+   * @param rate - Fraction of requests to record (0-1)
+   */
+  start: (officerId?: string | number, rate: number = DEFAULT_SAMPLE_RATE) => {
+    sampleRate = Math.max(0, Math.min(1, rate));
+    captureRate = sampleRate;
+    captureStartedAt = Date.now();
+    captureSalt = randomHex(32);
+    captureOfficerId = officerId !== undefined && officerId !== null ? String(officerId) : undefined;
+    officerHash = captureOfficerId ? hmacSha256Hex(captureSalt, captureOfficerId).slice(0, 16) : undefined;
+    records = [];
+    if (!appStateSubscription) {
+      // The app may never be closed cleanly - persist whatever was captured each time it leaves the foreground
+      appStateSubscription = AppState.addEventListener('change', (state) => {
+        if (state === 'background' && records.length > 0) {
+          requestTrace.save();
+        }
+      });
+    }
+    console.log('[RequestTrace] Capturing', Math.round(sampleRate * 100) + '% of requests');
+  },
+
+  /**
+   * Stop sampling and persist the trace
+   */
+  stop: async () => {
+    sampleRate = 0;
+    appStateSubscription?.remove();
+    appStateSubscription = null;
+    await requestTrace.save();
+  },
+
+  get isCapturing(): boolean {
+    return sampleRate > 0;
+  },
+
+  get size(): number {
+    return records.length;
+  },
+
+  /**
+   * Captured trace as JSON lines (the format replay_trace.py reads) - header line first
+   */
+  exportJsonLines: (): string => {
+    const header: TraceHeader = {
+      type: 'header',
+      version: TRACE_FORMAT_VERSION,
+      sample_rate: captureRate,
+      started_at: captureStartedAt,
+    };
+    return [header, ...records].map((entry) => JSON.stringify(entry)).join('\n');
+  },
+
+  /**
+   * Persist the trace so it survives a restart and logout (retrieval: see the top of this file)
+   */
+  save: async () => {
+    try {
+      await AsyncStorage.setItem(TRACE_STORAGE_KEY, requestTrace.exportJsonLines());
+    } catch (error) {
+      console.warn('[RequestTrace] Could not persist trace:', error);
+    }
+  },
+
+  install: (instance: AxiosInstance) => {
+    instance.interceptors.request.use((config) => {
+      if (sampleRate > 0 && Math.random() < sampleRate) {
+        startTimes.set(config, Date.now());
+      }
+      return config;
+    });
+    instance.interceptors.response.use(
+      (response: AxiosResponse) => {
+        record(response.config, response.status);
+        return response;
+      },
+      (error) => {
+        record(error?.config, error?.response?.status || 0);
+        return Promise.reject(error);
+      }
+    );
+  },
+};
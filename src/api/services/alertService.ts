@@ -1,9 +1,44 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
 import axiosInstance from '../axios.config';
-import { API_ENDPOINTS } from '../endpoints';
+import { API_ENDPOINTS, FIELD_PROJECTIONS } from '../endpoints';
+import { offlineQueueService } from './offlineQueueService';
 import { Alert, AlertResponse, AcceptAlertPayload } from '../../types/alert.types';
 import { getSampleAlerts } from '../../utils/sampleData';
 import { ENABLE_API_CALLS } from '../config';
 
+// Ask the backend to serialize only the fields the Alert transform reads
+const SOS_LIST_CONFIG = { params: { fields: FIELD_PROJECTIONS.SOS_LIST } };
+
+// Key prefix broadcastService uses to remember the type the user picked for an alert
+const ALERT_TYPE_MAP_PREFIX = 'alert_type_map_';
+const ORIGINAL_ALERT_TYPES = ['general', 'warning', 'emergency'];
+
+/**
+ * Locally stored original_alert_type for every record that lacks one, in a single
+ * AsyncStorage read for the whole list (instead of one getItem per alert)
+ * @returns Map of alert id -> 'general' | 'warning' | 'emergency'
+ */
+const loadStoredAlertTypes = async (records: any[]): Promise<Map<string, string>> => {
+  const types: Map<string, string> = new Map();
+  const keys = records
+    .filter((record) => record && !record.original_alert_type && (record.id || record.log_id))
+    .map((record) => `${ALERT_TYPE_MAP_PREFIX}${record.id || record.log_id}`);
+  if (keys.length === 0) {
+    return types;
+  }
+  try {
+    const entries = await AsyncStorage.multiGet(keys);
+    for (const [key, value] of entries) {
+      if (value && ORIGINAL_ALERT_TYPES.includes(value)) {
+        types.set(key.slice(ALERT_TYPE_MAP_PREFIX.length), value);
+      }
+    }
+  } catch (storageError) {
+    // Silently fail - local storage is optional
+  }
+  return types;
+};
+
 export const alertService = {
   getAlerts: async (securityId: string, geofenceId: string, officerName?: string): Promise<Alert[]> => {
     // Skip API call if disabled
@@ -28,7 +63,7 @@ export const alertService = {
     // Strategy 1: Fetch ALL alerts without any query params (backend filters by JWT token)
     try {
       console.log('[AlertService] Strategy 1: Fetching ALL alerts (no filters)...');
-      response = await axiosInstance.get<AlertResponse>(endpoint);
+      response = await axiosInstance.get<AlertResponse>(endpoint, SOS_LIST_CONFIG);
       const alertsCount = Array.isArray(response.data) ? response.data.length : 
                          (response.data?.data?.length || response.data?.results?.length || 0);
       console.log('[AlertService] ✅ Strategy 1 success - Found', alertsCount, 'alerts');
@@ -49,7 +84,7 @@ export const alertService = {
           const queryString = '?' + Object.entries(params).map(([k, v]) => `${k}=${encodeURIComponent(String(v))}`).join('&');
           const fullEndpoint = endpoint + queryString;
           console.log('[AlertService] Strategy 2: Fetching with security_id:', fullEndpoint);
-          response = await axiosInstance.get<AlertResponse>(fullEndpoint);
+          response = await axiosInstance.get<AlertResponse>(fullEndpoint, SOS_LIST_CONFIG);
           const alertsCount = Array.isArray(response.data) ? response.data.length : 
                              (response.data?.data?.length || response.data?.results?.length || 0);
           console.log('[AlertService] ✅ Strategy 2 success - Found', alertsCount, 'alerts');
@@ -71,7 +106,7 @@ export const alertService = {
           const queryString = '?' + Object.entries(params).map(([k, v]) => `${k}=${encodeURIComponent(String(v))}`).join('&');
           const fullEndpoint = endpoint + queryString;
           console.log('[AlertService] Strategy 3: Fetching with geofence_id:', fullEndpoint);
-          response = await axiosInstance.get<AlertResponse>(fullEndpoint);
+          response = await axiosInstance.get<AlertResponse>(fullEndpoint, SOS_LIST_CONFIG);
           const alertsCount = Array.isArray(response.data) ? response.data.length : 
                              (response.data?.data?.length || response.data?.results?.length || 0);
           console.log('[AlertService] ✅ Strategy 3 success - Found', alertsCount, 'alerts');
@@ -97,7 +132,7 @@ export const alertService = {
           const queryString = '?' + Object.entries(params).map(([k, v]) => `${k}=${encodeURIComponent(String(v))}`).join('&');
           const fullEndpoint = endpoint + queryString;
           console.log('[AlertService] Strategy 4: Fetching with security_id + geofence_id:', fullEndpoint);
-          response = await axiosInstance.get<AlertResponse>(fullEndpoint);
+          response = await axiosInstance.get<AlertResponse>(fullEndpoint, SOS_LIST_CONFIG);
           const alertsCount = Array.isArray(response.data) ? response.data.length : 
                              (response.data?.data?.length || response.data?.results?.length || 0);
           console.log('[AlertService] ✅ Strategy 4 success - Found', alertsCount, 'alerts');
@@ -105,11 +140,11 @@ export const alertService = {
           lastError = error4;
           console.log('[AlertService] Strategy 4 failed, using Strategy 1 response (even if empty)');
           // Fallback to Strategy 1 response (even if empty)
-          response = await axiosInstance.get<AlertResponse>(endpoint);
+          response = await axiosInstance.get<AlertResponse>(endpoint, SOS_LIST_CONFIG);
         }
       } else {
         // If we don't have both params, fallback to Strategy 1
-        response = await axiosInstance.get<AlertResponse>(endpoint);
+        response = await axiosInstance.get<AlertResponse>(endpoint, SOS_LIST_CONFIG);
       }
     }
     
@@ -119,7 +154,7 @@ export const alertService = {
     if (alertsCount === 0) {
       console.log('[AlertService] No alerts found, trying /active/ endpoint...');
       try {
-        const activeResponse = await axiosInstance.get<AlertResponse>(API_ENDPOINTS.GET_ACTIVE_SOS);
+        const activeResponse = await axiosInstance.get<AlertResponse>(API_ENDPOINTS.GET_ACTIVE_SOS, SOS_LIST_CONFIG);
         const activeCount = Array.isArray(activeResponse.data) ? activeResponse.data.length : 
                            (activeResponse.data?.data?.length || activeResponse.data?.results?.length || 0);
         if (activeCount > 0) {
@@ -141,12 +176,12 @@ export const alertService = {
                   (response.data?.data?.length || response.data?.results?.length || 0),
     });
     
-    // Log full response for debugging (truncated to avoid console spam)
-    const fullResponseStr = JSON.stringify(response.data, null, 2);
-    console.log('[AlertService] Full API response (first 1000 chars):', fullResponseStr.substring(0, 1000));
-    if (fullResponseStr.length > 1000) {
-      console.log('[AlertService] ... (response truncated, total length:', fullResponseStr.length, 'chars)');
-    }
+    // Log a sample of the response for debugging
+    // Only the first two items are serialized - stringifying the whole list costs more than the fetch on large lists
+    const responseSample = Array.isArray(response.data)
+      ? response.data.slice(0, 2)
+      : { ...response.data, data: response.data?.data?.slice?.(0, 2), results: response.data?.results?.slice?.(0, 2) };
+    console.log('[AlertService] API response sample:', JSON.stringify(responseSample).substring(0, 1000));
 
     // Handle response format - could be array or { data: [] }
     let alerts: any[] = [];
@@ -162,8 +197,8 @@ export const alertService = {
 
     // Transform API response to match Alert interface structure
     // Backend might return location_lat/location_long instead of location object
-    // Note: We'll handle async operations (like AsyncStorage) after the initial transformation
-    const transformedAlerts = await Promise.all(alerts.map(async (alert: any) => {
+    const storedAlertTypes = await loadStoredAlertTypes(alerts);
+    const transformedAlerts = alerts.map((alert: any) => {
       // Ensure ID fields exist - SOS API might use 'id' instead of 'log_id'
       if (!alert.log_id && alert.id) {
         alert.log_id = alert.id;
@@ -258,19 +293,9 @@ export const alertService = {
       // If backend doesn't return original_alert_type, try to get it from local storage
       // This ensures we always show the exact type the user selected when creating the alert
       if (!originalAlertType) {
-        try {
-          const alertId = alert.id || alert.log_id;
-          if (alertId) {
-            const AsyncStorage = require('@react-native-async-storage/async-storage').default;
-            const alertTypeMapKey = `alert_type_map_${alertId}`;
-            const storedType = await AsyncStorage.getItem(alertTypeMapKey);
-            if (storedType && ['general', 'warning', 'emergency'].includes(storedType)) {
-              originalAlertType = storedType as 'general' | 'warning' | 'emergency';
-              console.log('[AlertService] Retrieved original_alert_type from local storage:', { alertId, originalAlertType });
-            }
-          }
-        } catch (storageError) {
-          // Silently fail - local storage is optional
+        const storedType = storedAlertTypes.get(String(alert.id || alert.log_id));
+        if (storedType) {
+          originalAlertType = storedType as 'general' | 'warning' | 'emergency';
         }
       }
       
@@ -341,7 +366,7 @@ export const alertService = {
         user_phone: alert.user_phone || alert.user?.phone || '',
         user_image: alert.user_image || alert.user?.image || '',
       };
-    }));
+    });
     
     // Debug: Log summary of alert types
     const emergencyCount = transformedAlerts.filter(a => a.alert_type === 'emergency').length;
@@ -350,11 +375,6 @@ export const alertService = {
       total: transformedAlerts.length,
       emergency: emergencyCount,
       normal: normalCount,
-      alerts: transformedAlerts.map(a => ({
-        id: a.id,
-        alert_type: a.alert_type,
-        status: a.status
-      }))
     });
     
     return transformedAlerts;
@@ -393,14 +413,19 @@ export const alertService = {
 
     // Use documented SOS endpoint
     // PATCH /api/security/sos/{id}/resolve/ - Resolve SOS alert
-    const response = await axiosInstance.patch(
+    // Queued for replay when offline - the local status update in useAlerts stands meanwhile
+    const result = await offlineQueueService.sendOrQueue(
+      'PATCH',
       API_ENDPOINTS.RESOLVE_SOS.replace('{id}', logId),
       {
-      security_id: securityId,
+        security_id: securityId,
         status: status || 'resolved',
       }
     );
-    return response.data;
+    if (result.queued) {
+      return { result: 'queued', msg: 'Offline - alert close queued' };
+    }
+    return result.data;
   },
 
   deleteAlert: async (alertId: string | number) => {
@@ -439,7 +464,7 @@ export const alertService = {
       endpoint = API_ENDPOINTS.LIST_SOS;
     }
 
-    const response = await axiosInstance.get(endpoint);
+    const response = await axiosInstance.get(endpoint, SOS_LIST_CONFIG);
     
     // Handle response format - ensure we always return { data: [...] }
     let logs: any[] = [];
@@ -453,7 +478,8 @@ export const alertService = {
     
     // Transform API response to match Alert interface structure
     // Backend might return location_lat/location_long instead of location object
-    const transformedLogs = await Promise.all(logs.map(async (log: any) => {
+    const storedAlertTypes = await loadStoredAlertTypes(logs);
+    const transformedLogs = logs.map((log: any) => {
       // Ensure location structure exists
       let locationData = log.location;
       if (!locationData && (log.location_lat || log.location_long)) {
@@ -511,18 +537,9 @@ export const alertService = {
       
       // If backend doesn't return original_alert_type, try to get it from local storage
       if (!originalAlertType) {
-        try {
-          const alertId = log.id || log.log_id;
-          if (alertId) {
-            const AsyncStorage = require('@react-native-async-storage/async-storage').default;
-            const alertTypeMapKey = `alert_type_map_${alertId}`;
-            const storedType = await AsyncStorage.getItem(alertTypeMapKey);
-            if (storedType && ['general', 'warning', 'emergency'].includes(storedType)) {
-              originalAlertType = storedType as 'general' | 'warning' | 'emergency';
-            }
-          }
-        } catch (storageError) {
-          // Silently fail - local storage is optional
+        const storedType = storedAlertTypes.get(String(log.id || log.log_id));
+        if (storedType) {
+          originalAlertType = storedType as 'general' | 'warning' | 'emergency';
         }
       }
       
@@ -565,7 +582,7 @@ export const alertService = {
         user_phone: log.user_phone || log.user?.phone || '',
         user_image: log.user_image || log.user?.image || '',
       };
-    }));
+    });
     
     return { data: transformedLogs };
   },
@@ -7,6 +7,9 @@ import { mockLogin } from '../../utils/mockData';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 
 import { ENABLE_API_CALLS } from '../config';
+import { profileService } from './profileService';
+import { offlineQueueService } from './offlineQueueService';
+import { locationService } from './locationService';
 
 // Use global API enable flag
 const USE_MOCK_DATA = !ENABLE_API_CALLS;
@@ -100,12 +103,23 @@ export const authService = {
   logout: async (userId: string, role: string) => {
     if (USE_MOCK_DATA) {
       // Mock logout - just clear storage
+      profileService.invalidateProfile();
+      await offlineQueueService.clear();
+      await locationService.resetSessions();
       await storage.clear();
       await AsyncStorage.removeItem('token');
       await AsyncStorage.removeItem('refresh_token');
       return { result: 'success', msg: 'Logged out successfully' };
     }
 
+    // The officer's pending writes and open sessions belong to this token - settle what can
+    // still be sent, then drop the rest so nothing replays under the next officer's sign-in
+    await offlineQueueService.flush().catch((error) => {
+      console.warn('[Auth] Could not replay queued mutations before logout:', error);
+    });
+    await offlineQueueService.clear();
+    await locationService.resetSessions();
+
     try {
       // Django REST API logout (endpoint may not exist - that's OK)
       await axiosInstance.post(API_ENDPOINTS.LOGOUT, {
@@ -122,6 +136,7 @@ export const authService = {
     }
 
     // Clear all storage regardless of API response
+    profileService.invalidateProfile();
     await storage.clear();
     await AsyncStorage.removeItem('token');
     await AsyncStorage.removeItem('refresh_token');
@@ -0,0 +1,79 @@
+import axiosInstance from '../axios.config';
+import { API_ENDPOINTS } from '../endpoints';
+import { ENABLE_API_CALLS } from '../config';
+import { offlineQueueService } from './offlineQueueService';
+
+// List payloads come bare, paginated ({ results }) or wrapped ({ data })
+const listOf = async (url: string, label: string): Promise<any[]> => {
+  if (!ENABLE_API_CALLS) {
+    return [];
+  }
+  try {
+    const response = await axiosInstance.get(url);
+    const data = response.data;
+    const items = Array.isArray(data) ? data : data?.results || data?.data || [];
+    return Array.isArray(items) ? items : [];
+  } catch (error: any) {
+    if (error?.response?.status !== 404) {
+      console.warn(`[Cases] Could not list ${label}:`, error?.message || error);
+    }
+    return [];
+  }
+};
+
+/**
+ * Officer reads and writes on cases and incidents
+ * Filed from the field, often without coverage - every call is queued for
+ * replay (batched, with idempotency keys) when the device is offline.
+ */
+export const caseService = {
+  /**
+   * Cases visible to the officer
+   * GET /api/security/case/
+   * @returns [] if the endpoint is missing or fails
+   */
+  listCases: async (): Promise<any[]> => listOf(API_ENDPOINTS.LIST_CASES, 'cases'),
+
+  /**
+   * Incidents visible to the officer
+   * GET /api/security/incidents/
+   * @returns [] if the endpoint is missing or fails
+   */
+  listIncidents: async (): Promise<any[]> => listOf(API_ENDPOINTS.LIST_INCIDENTS, 'incidents'),
+
+  /**
+   * Report an incident
+   * POST /api/security/incidents/
+   */
+  createIncident: async (incident: Record<string, any>) => {
+    if (!ENABLE_API_CALLS) {
+      return { result: 'success', msg: 'Incident created (mock mode)' };
+    }
+
+    const result = await offlineQueueService.sendOrQueue('POST', API_ENDPOINTS.CREATE_INCIDENT, incident);
+    if (result.queued) {
+      return { result: 'queued', msg: 'Offline - incident queued' };
+    }
+    return { result: 'success', data: result.data };
+  },
+
+  /**
+   * Change a case's status
+   * PATCH /api/security/case/{id}/update_status/ { status }
+   */
+  updateCaseStatus: async (caseId: string | number, status: string) => {
+    if (!ENABLE_API_CALLS) {
+      return { result: 'success', msg: 'Case status updated (mock mode)' };
+    }
+
+    const result = await offlineQueueService.sendOrQueue(
+      'PATCH',
+      API_ENDPOINTS.UPDATE_CASE_STATUS.replace('{id}', String(caseId)),
+      { status }
+    );
+    if (result.queued) {
+      return { result: 'queued', msg: 'Offline - case status change queued' };
+    }
+    return { result: 'success', data: result.data };
+  },
+};
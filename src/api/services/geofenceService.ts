@@ -1,9 +1,23 @@
+import { AxiosResponse } from 'axios';
 import axiosInstance from '../axios.config';
 import { API_ENDPOINTS } from '../endpoints';
 import { GeofenceArea } from '../../types/location.types';
 import { ENABLE_API_CALLS } from '../config';
+import { hashString } from '../../utils/helpers';
 // Removed mock data and local data fallback imports - using only actual backend data
 
+interface CachedGeofence {
+  etag?: string;
+  version: string; // Content hash of the raw polygon_json
+  polygonKey: string;
+  geofence: GeofenceArea;
+}
+
+// Last fetched geofence per requested ID - revalidated with If-None-Match instead of re-downloaded
+const geofenceCache: Map<string, CachedGeofence> = new Map();
+
+const acceptNotModified = (status: number) => (status >= 200 && status < 300) || status === 304;
+
 export const geofenceService = {
   getGeofenceDetails: async (geofenceId: string | number): Promise<GeofenceArea> => {
     // Always use actual backend data - no mock data fallback
@@ -25,8 +39,13 @@ export const geofenceService = {
       // GET /api/security/geofence/{id}/ might work if backend has it
       console.log('[Geofence] Attempting to fetch geofence with ID:', geofenceId);
       
-      let response;
+      // Either an axios response or { data } synthesized from the profile fallbacks (no headers)
+      let response: { data: any; status?: number; headers?: AxiosResponse['headers'] } | undefined;
       const geofenceIdStr = String(geofenceId);
+      const cached = geofenceCache.get(geofenceIdStr);
+      const conditionalConfig = cached?.etag
+        ? { headers: { 'If-None-Match': cached.etag }, validateStatus: acceptNotModified }
+        : undefined;
       
       // Try only the most likely endpoint patterns first
       // Reduced from 14 to 3 most common patterns to reduce warning spam
@@ -58,7 +77,13 @@ export const geofenceService = {
           if (endpoint.method === 'POST' && endpoint.data) {
             response = await axiosInstance.post(endpoint.url, endpoint.data);
           } else {
-            response = await axiosInstance.get(endpoint.url);
+            response = await axiosInstance.get(endpoint.url, conditionalConfig);
+          }
+          
+          // Unchanged since last fetch - reuse the already parsed geofence
+          if (response.status === 304 && cached) {
+            console.log(`[Geofence] ✅ Not modified (version ${cached.version}), using cached geofence`);
+            return cached.geofence;
           }
           
           successfulEndpoint = `${endpoint.method} ${endpoint.url}`;
@@ -191,7 +216,16 @@ export const geofenceService = {
       
       // Parse polygon_json if it exists (could be string, GeoJSON object, or array)
       let coordinates: Array<{ latitude: number; longitude: number }> = [];
-      if (assignedGeofence?.polygon_json) {
+      const polygonKey = assignedGeofence?.polygon_json
+        ? (typeof assignedGeofence.polygon_json === 'string'
+            ? assignedGeofence.polygon_json
+            : JSON.stringify(assignedGeofence.polygon_json))
+        : '';
+      if (cached && polygonKey && cached.polygonKey === polygonKey) {
+        // Same polygon as last time - skip re-parsing and keep the same array
+        // (so simplified zoom variants cached against it stay valid)
+        coordinates = cached.geofence.coordinates;
+      } else if (assignedGeofence?.polygon_json) {
         try {
           // If polygon_json is a string, parse it
           const polygonData = typeof assignedGeofence.polygon_json === 'string'
@@ -344,6 +378,13 @@ export const geofenceService = {
         console.warn('[Geofence] assigned_geofence data:', JSON.stringify(assignedGeofence, null, 2));
       }
       
+      geofenceCache.set(geofenceIdStr, {
+        etag: response.headers?.etag,
+        version: hashString(polygonKey),
+        polygonKey,
+        geofence,
+      });
+      
       return geofence;
     } catch (error: any) {
       console.error('[Geofence] Error fetching geofence:', error);
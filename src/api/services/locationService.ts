@@ -1,7 +1,10 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
 import axiosInstance from '../axios.config';
-import { API_ENDPOINTS } from '../endpoints';
+import { API_ENDPOINTS, FIELD_PROJECTIONS } from '../endpoints';
 import { Location } from '../../types/location.types';
 import { ENABLE_API_CALLS } from '../config';
+import { offlineQueueService } from './offlineQueueService';
+import { officerPositions, OfficerStatus } from '../../utils/officerPositions';
 
 // Store active live location session ID per security officer
 const activeSessions: Map<string, string> = new Map();
@@ -9,6 +12,117 @@ const activeSessions: Map<string, string> = new Map();
 // Track ongoing session start requests to prevent race conditions
 const pendingSessionStarts: Map<string, Promise<string | null>> = new Map();
 
+// Sessions opened from this device, persisted so a crash/kill doesn't leave them open forever
+const SESSION_STORAGE_KEY = 'live_location_sessions';
+
+// A session with no location update for this long is considered abandoned
+const SESSION_TTL_MS = 10 * 60 * 1000;
+
+// last_seen is only re-persisted this often (updates arrive every 5 seconds)
+const LAST_SEEN_PERSIST_MS = 60 * 1000;
+
+// Stale sessions are closed in small chunks so a backlog doesn't flood the API
+const SWEEP_BATCH_SIZE = 5;
+
+// Backend role of security officers (citizens share the live_location endpoint)
+const OFFICER_ROLES = ['security_officer', 'security'];
+
+// Backend duty_status values -> position store status
+const DUTY_STATUSES: Record<string, OfficerStatus> = {
+  available: 'available',
+  on_duty: 'available',
+  busy: 'busy',
+  responding: 'busy',
+  off_duty: 'offline',
+  offline: 'offline',
+};
+
+/**
+ * Officer a live-location session belongs to, or null for a citizen's session
+ * user_id only counts when the session says its user is an officer.
+ */
+const sessionOfficerId = (session: any): string | null => {
+  const officerId =
+    session.security_id ||
+    session.security_officer_id ||
+    (OFFICER_ROLES.includes(session.role || session.user_role) ? session.user_id : null);
+  return officerId ? String(officerId) : null;
+};
+
+// An officer sending positions is on duty - available unless an accepted alert marked them busy
+const onDutyStatus = (officerId: string): OfficerStatus =>
+  officerPositions.statusOf(officerId) === 'busy' ? 'busy' : 'available';
+
+/**
+ * Status for an officer's live session: the backend's duty status when it sends one
+ */
+const sessionOfficerStatus = (session: any, officerId: string): OfficerStatus =>
+  DUTY_STATUSES[String(session.duty_status || session.status || '').toLowerCase()] || onDutyStatus(officerId);
+
+interface OwnedSession {
+  security_id: string;
+  last_seen: number; // ms since epoch
+}
+
+let ownedSessions: Record<string, OwnedSession> | null = null;
+
+const loadOwnedSessions = async (): Promise<Record<string, OwnedSession>> => {
+  if (ownedSessions) {
+    return ownedSessions;
+  }
+  try {
+    const stored = await AsyncStorage.getItem(SESSION_STORAGE_KEY);
+    ownedSessions = stored ? JSON.parse(stored) : {};
+  } catch (error) {
+    console.warn('[Location] Could not read stored sessions:', error);
+    ownedSessions = {};
+  }
+  return ownedSessions as Record<string, OwnedSession>;
+};
+
+const saveOwnedSessions = async (): Promise<void> => {
+  try {
+    await AsyncStorage.setItem(SESSION_STORAGE_KEY, JSON.stringify(ownedSessions || {}));
+  } catch (error) {
+    console.warn('[Location] Could not persist sessions:', error);
+  }
+};
+
+/**
+ * Record that a session is alive (start and throttled on updates)
+ */
+const touchSession = async (sessionId: string, securityId: string, force: boolean = false) => {
+  if (sessionId.startsWith('temp_')) {
+    return; // Never reached the server - nothing to close later
+  }
+  const sessions = await loadOwnedSessions();
+  const now = Date.now();
+  const existing = sessions[sessionId];
+  if (!force && existing && now - existing.last_seen < LAST_SEEN_PERSIST_MS) {
+    return;
+  }
+  sessions[sessionId] = { security_id: securityId, last_seen: now };
+  await saveOwnedSessions();
+};
+
+const forgetSession = async (sessionId: string) => {
+  const sessions = await loadOwnedSessions();
+  if (sessions[sessionId]) {
+    delete sessions[sessionId];
+    await saveOwnedSessions();
+  }
+};
+
+// Last activity of a session as reported by the backend (null if unknown)
+const sessionLastSeen = (session: any): number | null => {
+  const value = session?.last_seen || session?.updated_at;
+  if (!value) {
+    return null;
+  }
+  const time = new Date(value).getTime();
+  return Number.isFinite(time) ? time : null;
+};
+
 export const locationService = {
   /**
    * Start a live location sharing session
@@ -75,6 +189,7 @@ export const locationService = {
           }
           activeSessions.set(securityId, sessionIdStr);
           console.log('[Location] Stored session ID:', sessionIdStr, 'for security officer:', securityId);
+          await touchSession(sessionIdStr, securityId, true);
           pendingSessionStarts.delete(securityId);
           return sessionIdStr;
         }
@@ -125,10 +240,41 @@ export const locationService = {
     }
 
     try {
-      const response = await axiosInstance.get(API_ENDPOINTS.GET_LIVE_LOCATION_SESSIONS);
+      const activeSince = new Date(Date.now() - SESSION_TTL_MS);
+      const response = await axiosInstance.get(API_ENDPOINTS.GET_LIVE_LOCATION_SESSIONS, {
+        params: {
+          fields: FIELD_PROJECTIONS.LIVE_LOCATION_SESSIONS,
+          last_seen_after: activeSince.toISOString(),
+        },
+      });
       
       // Handle different response formats
       const sessions = response.data?.data || response.data?.results || response.data || [];
+
+      // Drop abandoned sessions in case the backend ignores last_seen_after
+      if (Array.isArray(sessions)) {
+        const cutoff = activeSince.getTime();
+        const live = sessions.filter((session: any) => {
+          const lastSeen = sessionLastSeen(session);
+          return lastSeen === null || lastSeen >= cutoff;
+        });
+
+        // Keep the shared position store current for dispatch / area queries
+        for (const session of live) {
+          const officerId = sessionOfficerId(session);
+          if (officerId && session.latitude !== undefined && session.longitude !== undefined) {
+            officerPositions.update(
+              officerId,
+              parseFloat(session.latitude),
+              parseFloat(session.longitude),
+              sessionLastSeen(session) ?? Date.now(),
+              sessionOfficerStatus(session, officerId)
+            );
+          }
+        }
+        officerPositions.pruneOlderThan(SESSION_TTL_MS);
+        return { result: 'success', data: live };
+      }
       return { result: 'success', data: sessions };
     } catch (error: any) {
       // Only log non-404 errors
@@ -187,6 +333,14 @@ export const locationService = {
             accuracy: location.accuracy?.toString(),
             timestamp: location.timestamp?.toString(),
           });
+          await touchSession(sessionId, securityId);
+          officerPositions.update(
+            securityId,
+            location.latitude,
+            location.longitude,
+            location.timestamp || Date.now(),
+            onDutyStatus(securityId)
+          );
           return { result: 'success', data: response.data };
         } catch (updateError: any) {
           // If session has ended (400), clear it and start a new one
@@ -221,6 +375,22 @@ export const locationService = {
 
       return { result: 'error', msg: 'No active session' };
     } catch (error: any) {
+      // No response at all - device is offline, queue the ping for replay on reconnect
+      const sessionId = activeSessions.get(securityId);
+      if (!error?.response && sessionId) {
+        await offlineQueueService.enqueue(
+          'PATCH',
+          API_ENDPOINTS.UPDATE_LIVE_LOCATION.replace('{session_id}', sessionId),
+          {
+            latitude: location.latitude.toString(),
+            longitude: location.longitude.toString(),
+            accuracy: location.accuracy?.toString(),
+            timestamp: location.timestamp?.toString(),
+          }
+        );
+        return { result: 'queued', msg: 'Offline - location update queued' };
+      }
+
       // If 404, clear session and try to restart on next update
       if (error?.response?.status === 404) {
         activeSessions.delete(securityId);
@@ -255,6 +425,7 @@ export const locationService = {
       
       // Remove session from map
       activeSessions.delete(securityId);
+      await forgetSession(sessionId);
       
       return { result: 'success', msg: 'Live location stopped' };
     } catch (error: any) {
@@ -262,13 +433,103 @@ export const locationService = {
       activeSessions.delete(securityId);
       
       // Only log non-404 errors
-      if (error?.response?.status !== 404) {
+      if (error?.response?.status === 404) {
+        await forgetSession(sessionId); // Already gone on the server
+      } else {
         console.warn('[Location] Error stopping live location:', error?.message || error);
       }
       return { result: 'error', msg: 'Error stopping live location' };
     }
   },
 
+  /**
+   * Close live location sessions this device left open (app crashed or was killed)
+   * A stored session is stale if it isn't the current session of a tracked officer,
+   * or it hasn't been updated within the TTL. Closed in bounded batches.
+   * @returns Number of sessions closed
+   */
+  sweepStaleSessions: async (): Promise<number> => {
+    const sessions = await loadOwnedSessions();
+    const current = new Set(activeSessions.values());
+    const cutoff = Date.now() - SESSION_TTL_MS;
+    const stale = Object.keys(sessions).filter(
+      (sessionId) => !current.has(sessionId) || sessions[sessionId].last_seen < cutoff
+    );
+    if (stale.length === 0) {
+      return 0;
+    }
+
+    if (!ENABLE_API_CALLS) {
+      stale.forEach((sessionId) => delete sessions[sessionId]);
+      await saveOwnedSessions();
+      return stale.length;
+    }
+
+    console.log('[Location] Closing', stale.length, 'stale live location session(s)');
+    let closed = 0;
+    for (let i = 0; i < stale.length; i += SWEEP_BATCH_SIZE) {
+      const chunk = stale.slice(i, i + SWEEP_BATCH_SIZE);
+      const results = await Promise.all(
+        chunk.map(async (sessionId) => {
+          try {
+            await axiosInstance.delete(API_ENDPOINTS.STOP_LIVE_LOCATION.replace('{session_id}', sessionId));
+            return true;
+          } catch (error: any) {
+            // 400/404: already ended or deleted on the server - nothing left to close
+            const status = error?.response?.status;
+            if (status === 400 || status === 404) {
+              return true;
+            }
+            console.warn('[Location] Could not close stale session:', sessionId, error?.message || error);
+            return false;
+          }
+        })
+      );
+      chunk.forEach((sessionId, index) => {
+        if (results[index]) {
+          const securityId = sessions[sessionId]?.security_id;
+          if (securityId && activeSessions.get(securityId) === sessionId) {
+            activeSessions.delete(securityId);
+          }
+          delete sessions[sessionId];
+          closed += 1;
+        }
+      });
+      await saveOwnedSessions();
+      if (results.some((ok) => !ok)) {
+        break; // Probably offline - retry on the next sweep
+      }
+    }
+    return closed;
+  },
+
+  /**
+   * Close this device's sessions and forget them (sign-out)
+   * Runs before the token is revoked; sessions that can't be closed are left to the server's TTL,
+   * since the next officer signing in here must not inherit them.
+   */
+  resetSessions: async (): Promise<void> => {
+    const sessions = await loadOwnedSessions();
+    const sessionIds = Array.from(new Set([...Object.keys(sessions), ...activeSessions.values()])).filter(
+      (sessionId) => !sessionId.startsWith('temp_')
+    );
+    if (ENABLE_API_CALLS && sessionIds.length > 0) {
+      await Promise.all(
+        sessionIds.map((sessionId) =>
+          axiosInstance.delete(API_ENDPOINTS.STOP_LIVE_LOCATION.replace('{session_id}', sessionId)).catch((error) => {
+            if (error?.response?.status !== 404) {
+              console.warn('[Location] Could not close session on sign-out:', sessionId, error?.message || error);
+            }
+          })
+        )
+      );
+    }
+    activeSessions.clear();
+    pendingSessionStarts.clear();
+    ownedSessions = {};
+    await saveOwnedSessions();
+  },
+
   /**
    * Get user location from active sessions
    * GET /api/security/live_location/ - then find user's session
@@ -0,0 +1,125 @@
+import axiosInstance from '../axios.config';
+import { API_ENDPOINTS } from '../endpoints';
+import { ENABLE_API_CALLS } from '../config';
+import { offlineQueueService } from './offlineQueueService';
+
+export interface NotificationCounts {
+  unread: number;
+  latest_id: string | null; // Cursor for acknowledge-up-to
+}
+
+// Set once the backend has answered 404 for the counts-only endpoint
+let countsEndpointMissing = false;
+
+// Newest notification id seen by the last count - acknowledgeAll acknowledges up to here
+let latestSeenId: string | null = null;
+
+// Upper bound on pages walked by the list fallback (one badge refresh)
+const MAX_COUNT_PAGES = 20;
+
+const isUnread = (notification: any): boolean =>
+  !(notification?.is_read || notification?.read || notification?.acknowledged || notification?.is_acknowledged);
+
+const newestId = (notifications: any[]): string | null => {
+  let newest: any = null;
+  for (const notification of notifications) {
+    const id = notification?.id;
+    if (id === undefined || id === null) continue;
+    if (newest === null || Number(id) > Number(newest)) {
+      newest = id;
+    }
+  }
+  return newest === null ? null : String(newest);
+};
+
+export const notificationService = {
+  /**
+   * Unread badge count
+   * GET /api/security/notifications/counts/ - counts only, one indexed lookup on the backend
+   * Falls back to counting a minimal projection of GET /notifications/ if the endpoint is missing (404)
+   */
+  getUnreadCount: async (): Promise<NotificationCounts> => {
+    if (!ENABLE_API_CALLS) {
+      return { unread: 0, latest_id: null };
+    }
+
+    if (!countsEndpointMissing) {
+      try {
+        const response = await axiosInstance.get(API_ENDPOINTS.NOTIFICATION_COUNTS);
+        const data = response.data?.data || response.data || {};
+        const counts: NotificationCounts = {
+          unread: Number(data.unread ?? data.unread_count ?? 0) || 0,
+          latest_id: data.latest_id !== undefined && data.latest_id !== null ? String(data.latest_id) : null,
+        };
+        latestSeenId = counts.latest_id;
+        return counts;
+      } catch (error: any) {
+        if (error?.response?.status !== 404) {
+          throw error;
+        }
+        countsEndpointMissing = true;
+        console.log('[Notifications] Counts endpoint not available, counting the list instead');
+      }
+    }
+
+    // Paginated list - follow `next` so notifications past the first page are counted too
+    let unread = 0;
+    let newest: string | null = null;
+    let nextUrl: string | null = API_ENDPOINTS.LIST_NOTIFICATIONS;
+    let params: any = { fields: 'id,is_read,read,acknowledged,is_acknowledged' };
+    for (let page = 0; nextUrl && page < MAX_COUNT_PAGES; page++) {
+      const response = await axiosInstance.get(nextUrl, { params });
+      const notifications = response.data?.data || response.data?.results || response.data || [];
+      const list = Array.isArray(notifications) ? notifications : [];
+      for (const notification of list) {
+        if (isUnread(notification)) {
+          unread += 1;
+        }
+      }
+      const pageNewest = newestId(list);
+      if (pageNewest !== null && (newest === null || Number(pageNewest) > Number(newest))) {
+        newest = pageNewest;
+      }
+      nextUrl = typeof response.data?.next === 'string' ? response.data.next : null;
+      params = undefined; // `next` already carries the query
+    }
+    latestSeenId = newest;
+    return { unread, latest_id: latestSeenId };
+  },
+
+  /**
+   * Newest notification id seen by the last getUnreadCount (null until counted)
+   */
+  getLatestSeenId: (): string | null => latestSeenId,
+
+  /**
+   * Acknowledge every notification up to a cursor in one request
+   * POST /api/security/notifications/acknowledge/ { up_to_id } - one UPDATE on the backend
+   * instead of one call per notification. Queued for replay when offline.
+   * Without a cursor nothing is sent - notifications newer than the last count stay unread.
+   * @param upToId - Newest notification to acknowledge (default: newest seen by getUnreadCount)
+   */
+  acknowledgeUpTo: async (upToId: string | null = latestSeenId) => {
+    if (!upToId) {
+      return { result: 'skipped', msg: 'No notifications counted yet' };
+    }
+    if (!ENABLE_API_CALLS) {
+      return { result: 'success', msg: 'Notifications acknowledged (mock mode)' };
+    }
+
+    const payload = { up_to_id: upToId };
+    try {
+      const response = await axiosInstance.post(API_ENDPOINTS.ACKNOWLEDGE_NOTIFICATIONS, payload);
+      return { result: 'success', data: response.data };
+    } catch (error: any) {
+      if (!error?.response) {
+        await offlineQueueService.enqueue('POST', API_ENDPOINTS.ACKNOWLEDGE_NOTIFICATIONS, payload);
+        return { result: 'queued', msg: 'Offline - acknowledgement queued' };
+      }
+      if (error.response.status !== 404) {
+        console.warn('[Notifications] Error acknowledging notifications:', error?.message || error);
+      }
+      return { result: 'error', msg: 'Could not acknowledge notifications' };
+    }
+  },
+};
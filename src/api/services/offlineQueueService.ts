@@ -0,0 +1,268 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import NetInfo from '@react-native-community/netinfo';
+import axiosInstance from '../axios.config';
+import { API_ENDPOINTS } from '../endpoints';
+import { ENABLE_API_CALLS } from '../config';
+
+// AsyncStorage key for mutations recorded while the device was offline
+const QUEUE_STORAGE_KEY = 'offline_mutation_queue';
+
+// Upper bound on a single batch request - larger queues are replayed in chunks
+const MAX_BATCH_SIZE = 100;
+
+export type QueuedMutationMethod = 'POST' | 'PATCH' | 'PUT' | 'DELETE';
+
+export interface QueuedMutation {
+  idempotency_key: string;
+  method: QueuedMutationMethod;
+  url: string; // Relative to /api/security/, same as API_ENDPOINTS
+  data?: any;
+  queued_at: string;
+}
+
+export interface MutationResult {
+  idempotency_key: string;
+  status: number;
+  data?: any;
+}
+
+// In-memory copy of the persisted queue (loaded lazily from AsyncStorage)
+let queue: QueuedMutation[] | null = null;
+
+// Only one replay may run at a time (reconnect events can fire repeatedly)
+let pendingFlush: Promise<MutationResult[]> | null = null;
+
+// Set once the backend has answered 404 for the batch endpoint
+let batchEndpointMissing = false;
+
+// Rejections a retry won't fix - the mutation is dropped. Anything else that isn't 2xx
+// (401 expired token, 408, 429, 5xx) stops the replay and keeps the queue for later.
+const PERMANENT_FAILURE_STATUSES = new Set([400, 403, 404, 409, 422]);
+
+const isSettled = (status: number | undefined): boolean =>
+  status !== undefined && ((status >= 200 && status < 300) || PERMANENT_FAILURE_STATUSES.has(status));
+
+const createIdempotencyKey = (): string =>
+  `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+
+const loadQueue = async (): Promise<QueuedMutation[]> => {
+  if (queue) {
+    return queue;
+  }
+  try {
+    const stored = await AsyncStorage.getItem(QUEUE_STORAGE_KEY);
+    queue = stored ? JSON.parse(stored) : [];
+  } catch (error) {
+    console.warn('[OfflineQueue] Could not read stored queue, starting empty:', error);
+    queue = [];
+  }
+  return queue as QueuedMutation[];
+};
+
+const saveQueue = async (): Promise<void> => {
+  try {
+    await AsyncStorage.setItem(QUEUE_STORAGE_KEY, JSON.stringify(queue || []));
+  } catch (error) {
+    console.warn('[OfflineQueue] Could not persist queue:', error);
+  }
+};
+
+/**
+ * Replay mutations one request at a time.
+ * Used when the backend does not expose the batch endpoint yet.
+ */
+const replaySequentially = async (mutations: QueuedMutation[]): Promise<MutationResult[]> => {
+  const results: MutationResult[] = [];
+  for (const mutation of mutations) {
+    try {
+      const response = await axiosInstance.request({
+        method: mutation.method,
+        url: mutation.url,
+        data: mutation.data,
+        headers: { 'Idempotency-Key': mutation.idempotency_key },
+      });
+      results.push({ idempotency_key: mutation.idempotency_key, status: response.status, data: response.data });
+    } catch (error: any) {
+      if (!error?.response) {
+        // Still offline - stop here and keep the rest queued in order
+        break;
+      }
+      results.push({
+        idempotency_key: mutation.idempotency_key,
+        status: error.response.status,
+        data: error.response.data,
+      });
+      if (!isSettled(error.response.status)) {
+        // Expired token, throttled or server trouble - the rest would fail the same way
+        break;
+      }
+    }
+  }
+  return results;
+};
+
+export const offlineQueueService = {
+  /**
+   * Record a mutation to be replayed once connectivity returns
+   * @param method - HTTP method of the mutation
+   * @param url - Endpoint relative to the API base URL (e.g. API_ENDPOINTS.ACKNOWLEDGE_NOTIFICATIONS)
+   * @param data - Request body
+   */
+  enqueue: async (method: QueuedMutationMethod, url: string, data?: any): Promise<QueuedMutation> => {
+    const mutation: QueuedMutation = {
+      idempotency_key: createIdempotencyKey(),
+      method,
+      url,
+      data,
+      queued_at: new Date().toISOString(),
+    };
+    const current = await loadQueue();
+    current.push(mutation);
+    await saveQueue();
+    console.log('[OfflineQueue] Queued', method, url, '- pending:', current.length);
+    return mutation;
+  },
+
+  getPendingCount: async (): Promise<number> => {
+    const current = await loadQueue();
+    return current.length;
+  },
+
+  /**
+   * Replay all queued mutations in order
+   * POST /api/security/batch/ - one round trip per MAX_BATCH_SIZE mutations
+   * Falls back to sequential replay if the batch endpoint is not available (404)
+   */
+  flush: async (): Promise<MutationResult[]> => {
+    if (pendingFlush) {
+      return pendingFlush;
+    }
+
+    pendingFlush = (async (): Promise<MutationResult[]> => {
+      const current = await loadQueue();
+      if (current.length === 0 || !ENABLE_API_CALLS) {
+        return [];
+      }
+
+      console.log('[OfflineQueue] Replaying', current.length, 'queued mutations');
+      const allResults: MutationResult[] = [];
+
+      while (current.length > 0) {
+        const chunk = current.slice(0, MAX_BATCH_SIZE);
+        let results: MutationResult[];
+
+        if (batchEndpointMissing) {
+          results = await replaySequentially(chunk);
+        } else {
+          try {
+            const response = await axiosInstance.post(API_ENDPOINTS.BATCH_MUTATIONS, {
+              mutations: chunk.map((m) => ({
+                idempotency_key: m.idempotency_key,
+                method: m.method,
+                url: m.url,
+                data: m.data,
+              })),
+            });
+            results = response.data?.results || response.data?.data || [];
+          } catch (error: any) {
+            if (error?.response?.status === 404) {
+              console.log('[OfflineQueue] Batch endpoint not available, replaying sequentially');
+              batchEndpointMissing = true;
+              results = await replaySequentially(chunk);
+            } else if (!error?.response) {
+              // Still offline - keep everything queued for the next reconnect
+              break;
+            } else {
+              console.warn('[OfflineQueue] Batch replay failed:', error.response.status);
+              break;
+            }
+          }
+        }
+
+        // Drop the settled prefix (applied or permanently rejected) and keep the rest in order,
+        // from the first mutation that needs a retry
+        const statuses = new Map(results.map((r) => [r.idempotency_key, r.status]));
+        let settled = 0;
+        while (settled < chunk.length && isSettled(statuses.get(chunk[settled].idempotency_key))) {
+          settled += 1;
+        }
+        current.splice(0, settled);
+        allResults.push(...results);
+
+        if (settled < chunk.length) {
+          const status = statuses.get(chunk[settled].idempotency_key);
+          if (status !== undefined) {
+            console.warn('[OfflineQueue] Replay paused on', status, '- keeping', current.length, 'mutations');
+          }
+          break;
+        }
+      }
+
+      await saveQueue();
+      console.log('[OfflineQueue] Replay done - answered:', allResults.length, 'still pending:', current.length);
+      return allResults;
+    })();
+
+    try {
+      return await pendingFlush;
+    } finally {
+      pendingFlush = null;
+    }
+  },
+
+  /**
+   * Send a mutation now, or queue it for replay if the device is offline
+   * Server errors (4xx/5xx) are thrown as usual - only network failures are queued.
+   * @returns queued: true when the mutation was stored for later
+   */
+  sendOrQueue: async (
+    method: QueuedMutationMethod,
+    url: string,
+    data?: any
+  ): Promise<{ queued: boolean; data?: any }> => {
+    try {
+      const response = await axiosInstance.request({ method, url, data });
+      return { queued: false, data: response.data };
+    } catch (error: any) {
+      if (error?.response) {
+        throw error;
+      }
+      await offlineQueueService.enqueue(method, url, data);
+      return { queued: true };
+    }
+  },
+
+  /**
+   * Replay the queue now (e.g. mutations persisted by a previous run) and on every reconnect
+   * Mount once at app level while signed in.
+   * @returns Unsubscribe function
+   */
+  startAutoFlush: (): (() => void) => {
+    const flushQuietly = () => {
+      offlineQueueService.flush().catch((error) => {
+        console.warn('[OfflineQueue] Replay failed:', error);
+      });
+    };
+
+    let wasOffline = false;
+    const unsubscribe = NetInfo.addEventListener((state) => {
+      const offline = state.isConnected === false || state.isInternetReachable === false;
+      if (wasOffline && !offline) {
+        // Back online - replay everything queued while offline in one round trip
+        flushQuietly();
+      }
+      wasOffline = offline;
+    });
+
+    flushQuietly();
+    return unsubscribe;
+  },
+
+  /**
+   * Drop every queued mutation (sign-out - they must not replay under the next officer's token)
+   */
+  clear: async (): Promise<void> => {
+    queue = [];
+    await saveQueue();
+  },
+};
@@ -3,6 +3,28 @@ import { API_ENDPOINTS } from '../endpoints';
 import { SecurityOfficer } from '../../types/user.types';
 import { ENABLE_API_CALLS } from '../config';
 
+interface CachedProfile {
+  etag?: string;
+  fetchedAt: number;
+  data: SecurityOfficer;
+}
+
+// Most screens fetch the profile on mount - reuse it for a short while, then revalidate with If-None-Match
+const PROFILE_FRESH_MS = 30 * 1000;
+const profileCache: Map<string, CachedProfile> = new Map();
+
+// Screens mounting together share one request
+const pendingProfileFetches: Map<string, Promise<SecurityOfficer>> = new Map();
+
+// Bumped on invalidation so a fetch that started before an update isn't cached
+let profileCacheGeneration = 0;
+
+const acceptNotModified = (status: number) => (status >= 200 && status < 300) || status === 304;
+
+// Every caller gets its own copy - screens edit the profile they are handed (same rule as readCoalescing)
+const copyProfile = (profile: SecurityOfficer): SecurityOfficer =>
+  profile !== null && typeof profile === 'object' ? JSON.parse(JSON.stringify(profile)) : profile;
+
 export const profileService = {
   getProfile: async (securityId: string): Promise<SecurityOfficer> => {
     // Skip API call if disabled - return mock profile
@@ -19,14 +41,53 @@ export const profileService = {
       } as SecurityOfficer;
     }
 
+    const cacheKey = String(securityId);
+    const cached = profileCache.get(cacheKey);
+    if (cached && Date.now() - cached.fetchedAt < PROFILE_FRESH_MS) {
+      return copyProfile(cached.data);
+    }
+    const pending = pendingProfileFetches.get(cacheKey);
+    if (pending) {
+      return copyProfile(await pending);
+    }
+
+    const fetchPromise = profileService.fetchProfile(cacheKey, cached);
+    pendingProfileFetches.set(cacheKey, fetchPromise);
+    try {
+      return copyProfile(await fetchPromise);
+    } finally {
+      pendingProfileFetches.delete(cacheKey);
+    }
+  },
+
+  /**
+   * GET /profile/, revalidating the cached copy with its ETag
+   */
+  fetchProfile: async (cacheKey: string, cached?: CachedProfile): Promise<SecurityOfficer> => {
     try {
-      console.log('[ProfileService] Fetching profile for security_id:', securityId);
+      console.log('[ProfileService] Fetching profile for security_id:', cacheKey);
+      const generation = profileCacheGeneration;
       
       // Fetch profile from security officer endpoint
-      const profileResponse = await axiosInstance.get(API_ENDPOINTS.GET_PROFILE);
-      console.log('[ProfileService] Profile API Response:', JSON.stringify(profileResponse.data, null, 2));
+      const conditionalConfig = cached?.etag
+        ? { headers: { 'If-None-Match': cached.etag }, validateStatus: acceptNotModified }
+        : undefined;
+      const profileResponse = await axiosInstance.get(API_ENDPOINTS.GET_PROFILE, conditionalConfig);
+      if (profileResponse.status === 304 && cached) {
+        if (generation === profileCacheGeneration) {
+          cached.fetchedAt = Date.now();
+        }
+        return cached.data;
+      }
       
       let profileData = profileResponse.data;
+      if (generation === profileCacheGeneration) {
+        profileCache.set(cacheKey, {
+          etag: profileResponse.headers?.etag,
+          fetchedAt: Date.now(),
+          data: profileData,
+        });
+      }
       
       // If profile doesn't have mobile/phone, try to fetch user profile data
       // The phone number might be in the User table, not the SecurityOfficer table
@@ -87,6 +148,9 @@ export const profileService = {
         console.log('[ProfileService] Phone number update - sending to both root and user object:', phoneValue);
       }
       
+      // Any cached copy is stale from here on, even if the update fails halfway
+      profileService.invalidateProfile(securityId);
+
       // Try PATCH first (standard REST), fallback to POST if needed
       let response;
       try {
@@ -103,6 +167,7 @@ export const profileService = {
       }
       
       console.log('[ProfileService] Profile update response:', JSON.stringify(response.data, null, 2));
+      profileService.invalidateProfile(securityId);
       
       // Log phone number in response for debugging
       const responseData = response.data;
@@ -124,6 +189,18 @@ export const profileService = {
       throw error;
     }
   },
+
+  /**
+   * Drop the cached profile (after an update, or all of them on logout)
+   */
+  invalidateProfile: (securityId?: string) => {
+    profileCacheGeneration += 1;
+    if (securityId === undefined) {
+      profileCache.clear();
+    } else {
+      profileCache.delete(String(securityId));
+    }
+  },
 };
 
 
@@ -0,0 +1,133 @@
+import axios from 'axios';
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import axiosInstance from '../axios.config';
+import { API_ENDPOINTS } from '../endpoints';
+import { ENABLE_API_CALLS } from '../config';
+import { GeofenceArea } from '../../types/location.types';
+
+// Public OpenStreetMap data (same source as the map tiles) when the backend has no extract
+const OVERPASS_URL = 'https://overpass-api.de/api/interpreter';
+const DRIVABLE_HIGHWAYS =
+  'motorway|trunk|primary|secondary|tertiary|unclassified|residential|service|living_street|motorway_link|trunk_link|primary_link|secondary_link|tertiary_link';
+
+// Roads around a geofence change rarely - keep the extract for a week
+const ROAD_NETWORK_CACHE_PREFIX = 'road_network_';
+const ROAD_NETWORK_MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+
+// Margin around the geofence so officers just outside it still snap to a road
+const BBOX_MARGIN_DEG = 0.02;
+
+const boundsOf = (geofence: GeofenceArea) => {
+  const points = geofence.coordinates?.length ? geofence.coordinates : [geofence.center];
+  let south = Infinity;
+  let west = Infinity;
+  let north = -Infinity;
+  let east = -Infinity;
+  for (const point of points) {
+    if (!point) continue;
+    south = Math.min(south, point.latitude);
+    north = Math.max(north, point.latitude);
+    west = Math.min(west, point.longitude);
+    east = Math.max(east, point.longitude);
+  }
+  if (!Number.isFinite(south)) {
+    return null;
+  }
+  return {
+    south: south - BBOX_MARGIN_DEG,
+    west: west - BBOX_MARGIN_DEG,
+    north: north + BBOX_MARGIN_DEG,
+    east: east + BBOX_MARGIN_DEG,
+  };
+};
+
+// Overpass `out geom` ways -> GeoJSON FeatureCollection of LineStrings (what RoadGraph.fromGeoJSON reads)
+const overpassToGeoJSON = (data: any) => ({
+  type: 'FeatureCollection',
+  features: (data?.elements || [])
+    .filter((element: any) => element.type === 'way' && Array.isArray(element.geometry))
+    .map((element: any) => ({
+      type: 'Feature',
+      properties: {
+        highway: element.tags?.highway,
+        maxspeed: element.tags?.maxspeed,
+        oneway: element.tags?.oneway,
+      },
+      geometry: {
+        type: 'LineString',
+        coordinates: element.geometry.map((point: any) => [point.lon, point.lat]),
+      },
+    })),
+});
+
+export const roadNetworkService = {
+  /**
+   * Road network (GeoJSON) covering a geofence, for travel-time ETAs
+   * GET /api/security/geofence/{id}/roads/ first; falls back to an OpenStreetMap
+   * Overpass extract of the geofence bounding box. Cached in AsyncStorage for a week.
+   * @returns null if no network could be fetched
+   */
+  getRoadNetwork: async (geofence: GeofenceArea): Promise<any | null> => {
+    if (!ENABLE_API_CALLS) {
+      return null;
+    }
+
+    const cacheKey = `${ROAD_NETWORK_CACHE_PREFIX}${geofence.geofence_id}`;
+    try {
+      const stored = await AsyncStorage.getItem(cacheKey);
+      if (stored) {
+        const cached = JSON.parse(stored);
+        if (Date.now() - cached.fetchedAt < ROAD_NETWORK_MAX_AGE_MS && cached.geojson) {
+          return cached.geojson;
+        }
+      }
+    } catch (error) {
+      console.warn('[Roads] Could not read cached road network:', error);
+    }
+
+    let geojson: any = null;
+    try {
+      const url = API_ENDPOINTS.GET_GEOFENCE_ROADS.replace('{geofence_id}', String(geofence.geofence_id));
+      const response = await axiosInstance.get(url);
+      const data = response.data?.data || response.data;
+      if (data?.type === 'FeatureCollection') {
+        geojson = data;
+      }
+    } catch (error: any) {
+      if (error?.response?.status !== 404) {
+        console.warn('[Roads] Backend road network failed:', error?.message || error);
+      }
+    }
+
+    if (!geojson) {
+      const bounds = boundsOf(geofence);
+      if (!bounds) {
+        return null;
+      }
+      const bbox = `${bounds.south},${bounds.west},${bounds.north},${bounds.east}`;
+      const query = `[out:json][timeout:25];way["highway"~"^(${DRIVABLE_HIGHWAYS})$"](${bbox});out geom;`;
+      try {
+        const response = await axios.post(OVERPASS_URL, `data=${encodeURIComponent(query)}`, {
+          headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+          timeout: 30000,
+        });
+        geojson = overpassToGeoJSON(response.data);
+        console.log('[Roads] Fetched', geojson.features.length, 'ways from OpenStreetMap for geofence', geofence.geofence_id);
+      } catch (error: any) {
+        console.warn('[Roads] OpenStreetMap road network failed:', error?.message || error);
+        return null;
+      }
+    }
+
+    if (!geojson.features?.length) {
+      return null;
+    }
+    try {
+      await AsyncStorage.setItem(cacheKey, JSON.stringify({ fetchedAt: Date.now(), geojson }));
+    } catch (error) {
+      // Large extracts can exceed the storage quota - the graph is still usable this session
+      console.warn('[Roads] Could not cache road network:', error);
+    }
+    return geojson;
+  },
+};
@@ -7,12 +7,16 @@ interface AlertStatsProps {
   active: number;
   pending: number;
   resolved: number;
+  avgAcceptMinutes?: number | null; // From alertRollups - hidden when unknown
+  peakHour?: number | null; // Hour of day (0-23) with the most alerts
 }
 
 export const AlertStats: React.FC<AlertStatsProps> = ({
   active,
   pending,
   resolved,
+  avgAcceptMinutes,
+  peakHour,
 }) => {
   const { colors: themeColors } = useTheme();
 
@@ -66,6 +70,18 @@ export const AlertStats: React.FC<AlertStatsProps> = ({
         <Text style={[dynamicStyles.statValue, dynamicStyles.resolvedValue]}>{resolved}</Text>
         <Text style={dynamicStyles.statLabel}>Resolved</Text>
       </View>
+      {avgAcceptMinutes !== undefined && avgAcceptMinutes !== null && (
+        <View style={styles.statItem}>
+          <Text style={dynamicStyles.statValue}>{avgAcceptMinutes < 1 ? '<1' : Math.round(avgAcceptMinutes)}m</Text>
+          <Text style={dynamicStyles.statLabel}>Avg Accept</Text>
+        </View>
+      )}
+      {peakHour !== undefined && peakHour !== null && (
+        <View style={styles.statItem}>
+          <Text style={dynamicStyles.statValue}>{String(peakHour).padStart(2, '0')}:00</Text>
+          <Text style={dynamicStyles.statLabel}>Peak Hour</Text>
+        </View>
+      )}
     </View>
   );
 };
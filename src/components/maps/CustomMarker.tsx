@@ -11,6 +11,7 @@ interface CustomMarkerProps {
   title?: string;
   type?: 'officer' | 'user' | 'emergency';
   label?: string;
+  count?: number; // Number of points when this marker represents a cluster
 }
 
 export const CustomMarker: React.FC<CustomMarkerProps> = ({
@@ -18,6 +19,7 @@ export const CustomMarker: React.FC<CustomMarkerProps> = ({
   title,
   type = 'user',
   label,
+  count,
 }) => {
   const getMarkerColor = () => {
     switch (type) {
@@ -34,9 +36,13 @@ export const CustomMarker: React.FC<CustomMarkerProps> = ({
     <Marker coordinate={coordinate} title={title}>
       <View style={[styles.markerContainer, { backgroundColor: getMarkerColor() }]}>
         <View style={styles.markerIcon}>
-          <Text style={styles.iconText}>
-            {type === 'officer' ? '🛡️' : type === 'emergency' ? '🚨' : '👤'}
-          </Text>
+          {count && count > 1 ? (
+            <Text style={styles.countText}>{count > 999 ? '999+' : count}</Text>
+          ) : (
+            <Text style={styles.iconText}>
+              {type === 'officer' ? '🛡️' : type === 'emergency' ? '🚨' : '👤'}
+            </Text>
+          )}
         </View>
         {label && (
           <View style={styles.labelContainer}>
@@ -70,6 +76,11 @@ const styles = StyleSheet.create({
   iconText: {
     fontSize: 20,
   },
+  countText: {
+    ...typography.caption,
+    color: colors.white,
+    fontWeight: '700',
+  },
   labelContainer: {
     position: 'absolute',
     bottom: -20,
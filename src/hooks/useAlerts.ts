@@ -9,6 +9,23 @@ import {
   updateAlert,
 } from '../redux/slices/alertSlice';
 import { Alert } from '../types/alert.types';
+import { alertRollups } from '../utils/alertRollups';
+import { escalationService } from '../services/EscalationService';
+import { etaService } from '../services/EtaService';
+import { officerPositions } from '../utils/officerPositions';
+
+// Officers holding an accepted, unresolved alert - dispatch skips them as busy
+const busyOfficerIds = (alerts: Alert[]): Set<string> => {
+  const ids = new Set<string>();
+  alerts.forEach((alert) => {
+    const raw = alert as any;
+    const officerId = raw.accepted_by || raw.security_id;
+    if (alert.status === 'accepted' && officerId) {
+      ids.add(String(officerId));
+    }
+  });
+  return ids;
+};
 
 export const useAlerts = () => {
   const dispatch = useAppDispatch();
@@ -126,6 +143,10 @@ export const useAlerts = () => {
       });
       
       dispatch(setAlerts(mergedData));
+      // Only alerts that changed since the last fetch move between rollup buckets
+      alertRollups.sync(mergedData);
+      escalationService.sync(mergedData);
+      officerPositions.applyAssignments(busyOfficerIds(mergedData));
       dispatch(setLoading(false));
     } catch (error: any) {
       // On error, set empty array instead of sample data
@@ -146,6 +167,15 @@ export const useAlerts = () => {
   const acceptAlert = async (alertId: string, estimatedArrival?: number) => {
     if (!officer) return;
 
+    // No ETA entered - estimate travel time over the road graph when one is loaded
+    if (estimatedArrival === undefined && etaService.isLoaded) {
+      const position = officerPositions.get(String(officer.security_id));
+      const target = alerts.find(a => (a.log_id || a.id) === alertId);
+      if (position && target?.location && target.location.latitude !== 0) {
+        estimatedArrival = etaService.estimateMinutes(position, target.location);
+      }
+    }
+
     try {
       await alertService.acceptAlert({
         log_id: alertId,
@@ -175,7 +205,11 @@ export const useAlerts = () => {
       }
       
       // Update on backend
-      await alertService.closeAlert(alertId, officer.security_id, status);
+      const result = await alertService.closeAlert(alertId, officer.security_id, status);
+      if (result?.result === 'queued') {
+        // Offline - keep the local status; a refetch would show the server's stale copy
+        return;
+      }
       
       // Wait a moment for backend to process, then refresh alerts
       // This ensures the completed alert appears in the completed endpoint
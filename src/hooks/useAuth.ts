@@ -12,6 +12,8 @@ import { profileService } from '../api/services/profileService';
 import { clearToken } from '../api/SecurityAPI';
 import { LoginPayload } from '../types/user.types';
 import { getMockOfficer } from '../utils/mockData';
+import { requestTrace } from '../api/requestTrace';
+import { REQUEST_TRACE_SAMPLE_RATE } from '../api/config';
 
 // Enable mock mode - set to true to use mock data instead of backend
 const USE_MOCK_DATA = false; // Change to false to use real backend
@@ -70,6 +72,10 @@ export const useAuth = () => {
             officer: officerData,
           })
         );
+
+        if (REQUEST_TRACE_SAMPLE_RATE > 0) {
+          requestTrace.start(officerData.security_id, REQUEST_TRACE_SAMPLE_RATE);
+        }
         
         // If geofence_id is missing, try to fetch profile to get it
         if (!USE_MOCK_DATA && (!officerData.geofence_id || officerData.geofence_id === '')) {
@@ -137,6 +143,9 @@ export const useAuth = () => {
   };
 
   const logout = async (userId: string, role: string) => {
+    if (requestTrace.isCapturing) {
+      await requestTrace.stop();
+    }
     try {
       await authService.logout(userId, role);
       // Clear token from SecurityAPI
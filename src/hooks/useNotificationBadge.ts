@@ -0,0 +1,51 @@
+import { useCallback, useEffect, useRef } from 'react';
+import { useAppDispatch, useAppSelector } from '../redux/hooks';
+import { clearUnreadCount, setUnreadCount } from '../redux/slices/alertSlice';
+import { notificationService } from '../api/services/notificationService';
+
+// Badge refresh interval - the counts endpoint is a single lookup, the list is not
+const BADGE_POLL_INTERVAL_MS = 30000;
+
+/**
+ * Unread notification badge
+ * @param poll - Keep the count fresh (mount with true once, e.g. in MainNavigator)
+ */
+export const useNotificationBadge = (poll: boolean = false) => {
+  const dispatch = useAppDispatch();
+  const unreadCount = useAppSelector((state) => state.alerts.unreadCount);
+  const unreadCountRef = useRef(unreadCount);
+  unreadCountRef.current = unreadCount;
+
+  const refresh = useCallback(async () => {
+    try {
+      const counts = await notificationService.getUnreadCount();
+      dispatch(setUnreadCount(counts.unread));
+    } catch (error: any) {
+      if (error?.response?.status !== 404) {
+        console.warn('[Notifications] Could not refresh unread count:', error?.message || error);
+      }
+    }
+  }, [dispatch]);
+
+  useEffect(() => {
+    if (!poll) {
+      return;
+    }
+    refresh();
+    const interval = setInterval(refresh, BADGE_POLL_INTERVAL_MS);
+    return () => clearInterval(interval);
+  }, [poll, refresh]);
+
+  // Clear the badge right away, then acknowledge everything up to the last counted id in one request
+  // Nothing unread, or nothing counted yet -> no request
+  const acknowledgeAll = useCallback(async () => {
+    const upToId = notificationService.getLatestSeenId();
+    if (!(unreadCountRef.current > 0) || !upToId) {
+      return;
+    }
+    dispatch(clearUnreadCount());
+    await notificationService.acknowledgeUpTo(upToId);
+  }, [dispatch]);
+
+  return { unreadCount, refresh, acknowledgeAll };
+};
@@ -0,0 +1,33 @@
+import { useEffect } from 'react';
+import { useAppSelector } from '../redux/hooks';
+import { geofenceService } from '../api/services/geofenceService';
+import { etaService } from '../services/EtaService';
+
+/**
+ * Load the road network for the officer's geofence so ETAs use travel times
+ * Mount once while signed in (MainNavigator); without it ETAs fall back to straight-line estimates.
+ */
+export const useRoadNetwork = () => {
+  const geofenceId = useAppSelector((state) => state.auth.officer?.geofence_id);
+
+  useEffect(() => {
+    if (!geofenceId) {
+      return;
+    }
+    let cancelled = false;
+    geofenceService
+      .getGeofenceDetails(geofenceId)
+      .then((geofence) => {
+        if (!cancelled) {
+          return etaService.loadForGeofence(geofence);
+        }
+      })
+      .catch((error: any) => {
+        console.warn('[ETA] Could not load geofence for road network:', error?.message || error);
+      });
+    return () => {
+      cancelled = true;
+      etaService.unload();
+    };
+  }, [geofenceId]);
+};
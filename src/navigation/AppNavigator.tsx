@@ -4,6 +4,8 @@ import { AuthNavigator } from './AuthNavigator';
 import { MainNavigator } from './MainNavigator';
 import { useAppSelector, useAppDispatch } from '../redux/hooks';
 import { clearNavigateToSOS } from '../redux/slices/authSlice';
+import { locationService } from '../api/services/locationService';
+import { offlineQueueService } from '../api/services/offlineQueueService';
 
 export const AppNavigator = () => {
   const isAuthenticated = useAppSelector((state) => state.auth.isAuthenticated);
@@ -11,6 +13,23 @@ export const AppNavigator = () => {
   const dispatch = useAppDispatch();
   const navigationRef = useRef<any>(null);
 
+  // Close live location sessions left open by a previous run that crashed or was killed
+  useEffect(() => {
+    if (isAuthenticated) {
+      locationService.sweepStaleSessions().catch((error) => {
+        console.warn('[AppNavigator] Stale session sweep failed:', error?.message || error);
+      });
+    }
+  }, [isAuthenticated]);
+
+  // Replay mutations queued offline - on launch (queue persisted by an earlier run) and on every reconnect
+  useEffect(() => {
+    if (!isAuthenticated) {
+      return;
+    }
+    return offlineQueueService.startAutoFlush();
+  }, [isAuthenticated]);
+
   useEffect(() => {
     if (isAuthenticated && shouldNavigateToSOS && navigationRef.current) {
       // Small delay to ensure MainNavigator is mounted
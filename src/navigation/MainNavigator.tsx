@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect } from 'react';
 import { createNativeStackNavigator } from '@react-navigation/native-stack';
 import { DashboardScreen } from '../screens/main/DashboardScreen';
 import { ProfileScreen } from '../screens/main/ProfileScreen';
@@ -19,10 +19,24 @@ import SOSPage from '../components/common/SOSPage';
 import { APITestScreen } from '../screens/test/APITestScreen';
 import { UpdateProfileScreen } from '../screens/main/UpdateProfileScreen';
 import LeafletMapScreen from '../screens/LeafletMapScreen';
+import { useNotificationBadge } from '../hooks/useNotificationBadge';
+import { useRoadNetwork } from '../hooks/useRoadNetwork';
+import { escalationService } from '../services/EscalationService';
 
 const Stack = createNativeStackNavigator();
 
 export const MainNavigator = () => {
+  // Keep the drawer's unread badge current while signed in
+  useNotificationBadge(true);
+  // Travel-time ETAs for accepting and escalating alerts
+  useRoadNetwork();
+
+  // One escalation scheduler for the whole signed-in session - screens only feed it alerts
+  useEffect(() => {
+    escalationService.start();
+    return () => escalationService.stop();
+  }, []);
+
   return (
     <Stack.Navigator
       initialRouteName="Home"
@@ -54,6 +54,9 @@ const alertSlice = createSlice({
     clearUnreadCount: (state) => {
       state.unreadCount = 0;
     },
+    setUnreadCount: (state, action: PayloadAction<number>) => {
+      state.unreadCount = Math.max(0, action.payload);
+    },
     setLoading: (state, action: PayloadAction<boolean>) => {
       state.isLoading = action.payload;
     },
@@ -70,6 +73,7 @@ export const {
   setActiveAlert,
   setFilter,
   clearUnreadCount,
+  setUnreadCount,
   setLoading,
   setError,
 } = alertSlice.actions;
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import {
   View,
   Text,
@@ -12,23 +12,48 @@ import { EmptyState } from '../../components/common/EmptyState';
 import { AlertCard } from '../../components/alerts/AlertCard';
 import { colors, typography, spacing } from '../../utils';
 import { Alert } from '../../types/alert.types';
+import { useAppSelector } from '../../redux/hooks';
+import { searchIndex, SearchResult } from '../../utils/searchIndex';
+import { caseService } from '../../api/services/caseService';
+
+const KIND_ICONS: Record<string, string> = { case: 'folder', incident: 'report' };
 
 export const SearchScreen = ({ navigation }: any) => {
   const [searchQuery, setSearchQuery] = useState('');
-  const [results, setResults] = useState<Alert[]>([]);
-  const [hasSearched, setHasSearched] = useState(false);
+  const [results, setResults] = useState<SearchResult[]>([]);
+  // Bumped whenever the index changes so the current query is re-run
+  const [indexVersion, setIndexVersion] = useState(0);
+  const alerts = useAppSelector((state) => state.alerts.alerts);
+  const hasSearched = searchQuery.trim().length > 0;
+
+  // Keep the inverted index in step with the store - only changed alerts are re-tokenized
+  useEffect(() => {
+    searchIndex.sync('alert', alerts);
+    setIndexVersion((version) => version + 1);
+  }, [alerts]);
+
+  // Cases and incidents aren't in the store - fetch them once per visit
+  useEffect(() => {
+    let cancelled = false;
+    Promise.all([caseService.listCases(), caseService.listIncidents()]).then(([cases, incidents]) => {
+      if (cancelled) {
+        return;
+      }
+      searchIndex.sync('case', cases);
+      searchIndex.sync('incident', incidents);
+      setIndexVersion((version) => version + 1);
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
+  useEffect(() => {
+    setResults(searchQuery.trim() ? searchIndex.search(searchQuery) : []);
+  }, [searchQuery, indexVersion]);
 
   const handleSearch = (query: string) => {
     setSearchQuery(query);
-    if (query.trim()) {
-      setHasSearched(true);
-      // TODO: Implement actual search API call
-      // For now, empty results
-      setResults([]);
-    } else {
-      setHasSearched(false);
-      setResults([]);
-    }
   };
 
   const handleRespond = (alert: Alert) => {
@@ -57,7 +82,7 @@ export const SearchScreen = ({ navigation }: any) => {
         <Icon name="search" size={20} color={colors.mediumGray} style={styles.searchIcon} />
         <TextInput
           style={styles.searchInput}
-          placeholder="Search alerts, users, locations..."
+          placeholder="Search alerts, cases, incidents..."
           placeholderTextColor={colors.mediumGray}
           value={searchQuery}
           onChangeText={handleSearch}
@@ -73,10 +98,26 @@ export const SearchScreen = ({ navigation }: any) => {
       {hasSearched ? (
         <FlatList
           data={results}
-          keyExtractor={(item) => item.id}
-          renderItem={({ item }) => (
-            <AlertCard alert={item} onRespond={handleRespond} />
-          )}
+          keyExtractor={(result) => `${result.kind}:${result.id}`}
+          renderItem={({ item: result }) =>
+            result.kind === 'alert' ? (
+              <AlertCard alert={result.item as Alert} onRespond={handleRespond} />
+            ) : (
+              <View style={styles.recordRow}>
+                <Icon name={KIND_ICONS[result.kind]} size={22} color={colors.mediumGray} style={styles.recordIcon} />
+                <View style={styles.recordBody}>
+                  <Text style={styles.recordTitle} numberOfLines={1}>
+                    {result.item.title || result.item.description || `${result.kind === 'case' ? 'Case' : 'Incident'} #${result.id}`}
+                  </Text>
+                  <Text style={styles.recordMeta} numberOfLines={1}>
+                    {result.kind === 'case' ? 'Case' : 'Incident'}
+                    {result.item.status ? ` · ${result.item.status}` : ''}
+                    {result.item.created_at ? ` · ${new Date(result.item.created_at).toLocaleDateString()}` : ''}
+                  </Text>
+                </View>
+              </View>
+            )
+          }
           contentContainerStyle={styles.list}
           ListEmptyComponent={
             <EmptyState
@@ -91,7 +132,7 @@ export const SearchScreen = ({ navigation }: any) => {
           <EmptyState
             icon="search"
             title="Search Alerts"
-            description="Search for alerts, users, or locations"
+            description="Search for alerts, cases, incidents, users, or locations"
           />
         </View>
       )}
@@ -149,6 +190,30 @@ const styles = StyleSheet.create({
   emptyContainer: {
     flex: 1,
   },
+  recordRow: {
+    flexDirection: 'row',
+    alignItems: 'center',
+    backgroundColor: colors.white,
+    padding: spacing.base,
+    marginBottom: spacing.sm,
+    borderRadius: 12,
+    borderWidth: 1,
+    borderColor: colors.borderGray,
+  },
+  recordIcon: {
+    marginRight: spacing.md,
+  },
+  recordBody: {
+    flex: 1,
+  },
+  recordTitle: {
+    ...typography.body,
+    color: colors.darkText,
+  },
+  recordMeta: {
+    ...typography.caption,
+    color: colors.mediumGray,
+  },
 });
 
 
@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useMemo } from 'react';
 import {
   View,
   FlatList,
@@ -17,7 +17,9 @@ import { BottomTabNavigator } from '../../components/navigation/BottomTabNavigat
 import { useSocket } from '../../hooks/useSocket';
 import { useAlerts } from '../../hooks/useAlerts';
 import { useNetworkStatus } from '../../hooks/useNetworkStatus';
+import { useNotificationBadge } from '../../hooks/useNotificationBadge';
 import { Alert } from '../../types/alert.types';
+import { alertRollups, countAlertStatuses } from '../../utils/alertRollups';
 import { colors, typography, spacing } from '../../utils';
 import { useTheme } from '../../contexts/ThemeContext';
 
@@ -26,6 +28,12 @@ export const AlertsScreen = ({ navigation, route }: any) => {
   const { alerts, allAlerts, refreshing, filter, refreshAlerts, changeFilter, deleteAlert, closeAlert } = useAlerts();
   const { socket } = useSocket();
   const { isOffline } = useNetworkStatus();
+  const { acknowledgeAll } = useNotificationBadge();
+
+  // Opening the alert list counts as having seen every notification counted so far (no-op when none are unread)
+  React.useEffect(() => {
+    acknowledgeAll();
+  }, [acknowledgeAll]);
 
   // Handle route params to set initial filter (e.g., when navigating from Dashboard "See All" with filter param)
   React.useEffect(() => {
@@ -88,31 +96,37 @@ export const AlertsScreen = ({ navigation, route }: any) => {
   // Handle both 'completed' and 'resolved' statuses (backend may use either)
   const allAlertsForStats = allAlerts || alerts;
 
+  // One pass over the alerts for both the stats bar and the filter tab counts
+  const statusCounts = useMemo(() => countAlertStatuses(allAlertsForStats), [allAlertsForStats]);
+
+  // Response timing and busiest hour come from the rollups useAlerts keeps in sync - no rescan
+  const rollupStats = useMemo(() => {
+    const byHour = new Array(24).fill(0);
+    alertRollups.getHourOfDayHeatmap().forEach((row) => {
+      row.forEach((count, hour) => {
+        byHour[hour] += count;
+      });
+    });
+    const busiest = byHour.reduce((best, count, hour) => (count > byHour[best] ? hour : best), 0);
+    return {
+      avgAcceptMinutes: alertRollups.getAverages().avgAcceptMinutes,
+      peakHour: byHour[busiest] > 0 ? busiest : null,
+    };
+  }, [allAlertsForStats]);
+
   const stats = {
-    active: allAlertsForStats.filter((a) => {
-      if (!a || !a.status) return false;
-      const status = String(a.status).toLowerCase();
-      return status === 'pending' || status === 'accepted';
-    }).length,
-    pending: allAlertsForStats.filter((a) => a && a.status && String(a.status).toLowerCase() === 'pending').length,
-    resolved: allAlertsForStats.filter((a) => {
-      if (!a || !a.status) return false;
-      const status = String(a.status).toLowerCase();
-      return status === 'completed' || status === 'resolved';
-    }).length,
+    active: statusCounts.active,
+    pending: statusCounts.pending,
+    resolved: statusCounts.resolved,
   };
 
   // Calculate counts for each filter tab based on allAlerts
   const filterCounts = {
     all: allAlertsForStats.length,
-    emergency: allAlertsForStats.filter((a) => a && a.priority && String(a.priority).toLowerCase() === 'high').length,
-    normal: allAlertsForStats.filter((a) => a && a.status && String(a.status).toLowerCase() === 'accepted').length,
-    pending: allAlertsForStats.filter((a) => a && a.status && String(a.status).toLowerCase() === 'pending').length,
-    completed: allAlertsForStats.filter((a) => {
-      if (!a || !a.status) return false;
-      const status = String(a.status).toLowerCase();
-      return status === 'completed' || status === 'resolved';
-    }).length,
+    emergency: statusCounts.highPriority,
+    normal: statusCounts.accepted,
+    pending: statusCounts.pending,
+    completed: statusCounts.resolved,
   };
 
   const filters = [
@@ -263,6 +277,8 @@ export const AlertsScreen = ({ navigation, route }: any) => {
         active={stats.active}
         pending={stats.pending}
         resolved={stats.resolved}
+        avgAcceptMinutes={rollupStats.avgAcceptMinutes}
+        peakHour={rollupStats.peakHour}
       />
 
       <FloatingActionButton
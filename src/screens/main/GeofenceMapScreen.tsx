@@ -1,7 +1,7 @@
-import React, { useEffect, useState, useRef, useCallback } from 'react';
+import React, { useEffect, useState, useRef, useCallback, useMemo } from 'react';
 import { View, Text, StyleSheet, TouchableOpacity, Alert } from 'react-native';
 import { WebView } from 'react-native-webview';
-import type { WebView as WebViewType } from 'react-native-webview';
+import type { WebView as WebViewType, WebViewMessageEvent } from 'react-native-webview';
 import Geolocation from 'react-native-geolocation-service';
 import { useAppSelector } from '../../redux/hooks';
 import { useLocation } from '../../hooks/useLocation';
@@ -11,12 +11,14 @@ import { useAlerts } from '../../hooks/useAlerts';
 // Removed local data fallback - using only actual backend data
 import { MapControls } from '../../components/maps/MapControls';
 import { colors, typography, spacing } from '../../utils';
-import { isPointInPolygon } from '../../utils/helpers';
+import { GeofenceCrossingDetector } from '../../utils/geofenceDetector';
 import { GeofenceArea } from '../../types/location.types';
 import { updateOfficerProfile } from '../../redux/slices/authSlice';
 import { useAppDispatch } from '../../redux/hooks';
 import { requestLocationPermissionWithCheck } from '../../utils/permissions';
 import { useTheme } from '../../contexts/ThemeContext';
+import { getPolygonForZoom } from '../../utils/helpers';
+import { BoundingBox, ClusterPoint, MarkerClusterIndex } from '../../utils/markerClustering';
 
 export const GeofenceMapScreen = ({ navigation }: any) => {
   const officer = useAppSelector((state) => state.auth.officer);
@@ -27,7 +29,9 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
   const [geofence, setGeofence] = useState<GeofenceArea | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [currentLocation, setCurrentLocation] = useState<{ latitude: number; longitude: number; accuracy?: number } | null>(location);
-  const [wasInsideGeofence, setWasInsideGeofence] = useState<boolean | null>(null); // Track previous state for entry/exit detection
+  // Entry/exit detection with hysteresis - refs so the long-lived watchPosition callback sees the current geofence
+  const geofenceRef = useRef<GeofenceArea | null>(null);
+  const geofenceDetectorRef = useRef<GeofenceCrossingDetector | null>(null);
   const webViewRef = useRef<WebViewType | null>(null);
   const watchIdRef = useRef<number | null>(null);
   const lastStableLocationRef = useRef<{ latitude: number; longitude: number } | null>(null);
@@ -315,12 +319,20 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
                 setCurrentLocation(newLocation);
                 
                 // Check if officer entered/exited geofence area
-                if (geofence && geofence.coordinates && geofence.coordinates.length > 0) {
-                  const isInside = isPointInPolygon(newLocation, geofence.coordinates);
+                // The detector only reports a crossing after several consecutive fixes agree (GPS jitter)
+                const currentGeofence = geofenceRef.current;
+                const detector = geofenceDetectorRef.current;
+                if (currentGeofence && detector) {
+                  const crossing = detector.process({
+                    sessionId: 'self',
+                    latitude: newLat,
+                    longitude: newLng,
+                    accuracy: newAccuracy,
+                  });
                   
-                  // Check if state changed (entered or exited)
-                  if (wasInsideGeofence !== null && wasInsideGeofence !== isInside) {
-                    if (isInside && !wasInsideGeofence) {
+                  if (crossing) {
+                    const geofence = currentGeofence;
+                    if (crossing.type === 'enter') {
                       // Officer entered the geofence area
                       Alert.alert(
                         '✅ Area Entered',
@@ -329,7 +341,7 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
                         { cancelable: true }
                       );
                       console.log('[GeofenceMap] ✅ Officer entered geofence area:', geofence.name);
-                    } else if (!isInside && wasInsideGeofence) {
+                    } else {
                       // Officer exited the geofence area
                       Alert.alert(
                         '⚠️ Area Exited',
@@ -340,11 +352,6 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
                       console.log('[GeofenceMap] ⚠️ Officer exited geofence area:', geofence.name);
                     }
                   }
-                  
-                  setWasInsideGeofence(isInside);
-                } else if (wasInsideGeofence === null) {
-                  // Initialize state if geofence is not loaded yet
-                  setWasInsideGeofence(false);
                 }
                 
                 // Update map marker position every second for stable tracking
@@ -390,6 +397,84 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
     };
   }, []);
 
+  // Keep the entry/exit detector in sync with the loaded geofence
+  useEffect(() => {
+    geofenceRef.current = geofence;
+    if (geofence && geofence.coordinates && geofence.coordinates.length > 2) {
+      if (geofenceDetectorRef.current) {
+        geofenceDetectorRef.current.setPolygon(geofence.coordinates);
+      } else {
+        geofenceDetectorRef.current = new GeofenceCrossingDetector(geofence.coordinates);
+      }
+    } else {
+      geofenceDetectorRef.current = null;
+    }
+  }, [geofence]);
+
+  // Open alerts on the map - clustered here, drawn by the WebView for the viewport it reports
+  const alertClusterIndex = useMemo(() => {
+    const points: ClusterPoint[] = [];
+    allAlerts.forEach((alert) => {
+      const status = String(alert?.status || '').toLowerCase();
+      if (!alert?.location || status === 'completed' || status === 'cancelled' || status === 'resolved') {
+        return;
+      }
+      points.push({
+        id: String(alert.id),
+        latitude: Number(alert.location.latitude),
+        longitude: Number(alert.location.longitude),
+        type: String(alert.priority).toLowerCase() === 'high' ? 'emergency' : 'user',
+      });
+    });
+    return new MarkerClusterIndex(points);
+  }, [allAlerts]);
+  const mapViewportRef = useRef<{ bbox: BoundingBox; zoom: number } | null>(null);
+
+  const renderAlertClusters = useCallback(() => {
+    const viewport = mapViewportRef.current;
+    if (!viewport || !webViewRef.current) {
+      return;
+    }
+    const clusters = alertClusterIndex.getClusters(viewport.bbox, viewport.zoom).map((cluster) => ({
+      id: cluster.id,
+      lat: cluster.latitude,
+      lng: cluster.longitude,
+      count: cluster.count,
+      type: cluster.type,
+    }));
+    webViewRef.current.injectJavaScript(`
+      if (window.renderAlertClusters) {
+        window.renderAlertClusters(${JSON.stringify(clusters)});
+      }
+    `);
+  }, [alertClusterIndex]);
+
+  // Redraw when the alert set changes; pans and zooms arrive through handleMapMessage
+  useEffect(() => {
+    renderAlertClusters();
+  }, [renderAlertClusters]);
+
+  const handleMapMessage = useCallback((event: WebViewMessageEvent) => {
+    let message: any;
+    try {
+      message = JSON.parse(event.nativeEvent.data);
+    } catch (error) {
+      return;
+    }
+    if (message?.type === 'viewport') {
+      mapViewportRef.current = {
+        bbox: {
+          minLatitude: message.south,
+          minLongitude: message.west,
+          maxLatitude: message.north,
+          maxLongitude: message.east,
+        },
+        zoom: message.zoom,
+      };
+      renderAlertClusters();
+    }
+  }, [renderAlertClusters]);
+
   // Update map when geofence changes (NOT when location changes - location updates are handled separately)
   useEffect(() => {
     if (webViewRef.current && geofence && geofence.coordinates && geofence.coordinates.length > 0) {
@@ -413,6 +498,7 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
           }
           
           const geofenceCoords = ${geofencePolygon};
+          window.geofenceDetail = ${getPolygonDetailJSON(geofence.coordinates)};
           if (geofenceCoords && geofenceCoords.length > 0) {
             window.geofencePolygonLayer = L.polygon(geofenceCoords, {
               color: '${primaryColor}',
@@ -447,6 +533,8 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
             if (map.getZoom() > 15) {
               map.setZoom(15);
             }
+            ${GEOFENCE_DETAIL_SCRIPT}
+            window.applyGeofenceDetail();
             console.log('Geofence polygon added and map fitted to bounds');
           }
         }
@@ -723,6 +811,7 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
         domStorageEnabled={true}
         startInLoadingState={true}
         scalesPageToFit={true}
+        onMessage={handleMapMessage}
         onLoadEnd={() => {
           // Inject geofence polygon after map loads if geofence data arrives later
           if (geofence && geofence.coordinates && geofence.coordinates.length > 0 && webViewRef.current) {
@@ -733,13 +822,19 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
             const script = `
               if (window.map && typeof window.map.fitBounds === 'function' && typeof L !== 'undefined' && L.map && typeof map !== 'undefined') {
                 const geofenceCoords = ${geofencePolygon};
+                window.geofenceDetail = ${getPolygonDetailJSON(geofence.coordinates)};
                 if (geofenceCoords && geofenceCoords.length > 0) {
+                  // Replace the polygon the page drew, rather than stacking a second one on it
+                  if (window.geofencePolygonLayer) {
+                    map.removeLayer(window.geofencePolygonLayer);
+                  }
                   const polygon = L.polygon(geofenceCoords, {
                     color: '${primaryColor}',
                     fillColor: '${primaryColor}',
                     fillOpacity: 0.2,
                     weight: 2
                   }).addTo(map);
+                  window.geofencePolygonLayer = polygon;
                   // Expand bounds by 200 meters to show surrounding area
                   const bounds = polygon.getBounds();
                   const centerLat = (bounds.getNorth() + bounds.getSouth()) / 2;
@@ -766,6 +861,8 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
                   if (map.getZoom() > 15) {
                     map.setZoom(15);
                   }
+                  ${GEOFENCE_DETAIL_SCRIPT}
+                  window.applyGeofenceDetail();
                   console.log('Geofence polygon added:', geofenceCoords);
                 }
               }
@@ -911,6 +1008,41 @@ export const GeofenceMapScreen = ({ navigation }: any) => {
   );
 };
 
+// Zoom levels the map swaps geofence detail between (getPolygonForZoom keeps full detail from 18)
+const POLYGON_DETAIL_ZOOMS = [10, 11, 12, 13, 14, 15, 16, 17, 18];
+
+/**
+ * Geofence ring simplified per zoom level, as { zoom: [[lat, lng], ...] } JSON for the WebView
+ * The map swaps the polygon's vertices on zoomend so zoomed-out views don't draw every vertex
+ */
+const getPolygonDetailJSON = (coordinates: any[] | undefined): string => {
+  if (!coordinates || coordinates.length === 0) {
+    return 'null';
+  }
+  const ring = Array.isArray(coordinates[0])
+    ? coordinates.map((c: any) => ({ latitude: c[0], longitude: c[1] }))
+    : coordinates;
+  const variants: Record<number, number[][]> = {};
+  POLYGON_DETAIL_ZOOMS.forEach((zoom) => {
+    variants[zoom] = getPolygonForZoom(ring, zoom).map((c: any) => [c.latitude, c.longitude]);
+  });
+  return JSON.stringify(variants);
+};
+
+// Defines window.applyGeofenceDetail inside the WebView - swaps in the variant for the current zoom
+const GEOFENCE_DETAIL_SCRIPT = `
+  window.applyGeofenceDetail = function() {
+    if (!window.geofencePolygonLayer || !window.geofenceDetail || typeof map === 'undefined') return;
+    const zooms = Object.keys(window.geofenceDetail).map(Number);
+    const zoom = Math.max(Math.min.apply(null, zooms), Math.min(Math.max.apply(null, zooms), Math.round(map.getZoom())));
+    window.geofencePolygonLayer.setLatLngs(window.geofenceDetail[zoom]);
+  };
+  if (!window.geofenceDetailBound && typeof map !== 'undefined') {
+    map.on('zoomend', function() { window.applyGeofenceDetail(); });
+    window.geofenceDetailBound = true;
+  }
+`;
+
 // Generate Leaflet map HTML
 const getLeafletMapHTML = (
   center: { lat: number; lng: number },
@@ -970,6 +1102,8 @@ const getLeafletMapHTML = (
   // Theme colors for map elements
   const primaryColor = themeColors.primary || '#2563eb';
   const infoBlue = themeColors.infoBlue || '#3B82F6';
+  const emergencyRed = themeColors.emergencyRed || '#DC2626';
+  const warningOrange = themeColors.warningOrange || '#F97316';
   const backgroundColor = themeColors.background || (isDark ? '#000000' : '#F8FAFC');
 
   return `
@@ -997,6 +1131,7 @@ const getLeafletMapHTML = (
   <script>
     const center = [${center.lat}, ${center.lng}];
     const geofenceCoords = ${geofencePolygon};
+    window.geofenceDetail = ${getPolygonDetailJSON(geofence?.coordinates)};
     const userLoc = ${userLocation};
     const userAccuracy = ${userAccuracy}; // GPS accuracy in meters
     
@@ -1021,6 +1156,7 @@ const getLeafletMapHTML = (
         fillOpacity: 0.2,
         weight: 2
       }).addTo(map);
+      window.geofencePolygonLayer = geofencePolygon;
       
       // Calculate geofence center from bounds
       const bounds = geofencePolygon.getBounds();
@@ -1048,6 +1184,8 @@ const getLeafletMapHTML = (
       if (map.getZoom() > 15) {
         map.setZoom(15);
       }
+      ${GEOFENCE_DETAIL_SCRIPT}
+      window.applyGeofenceDetail();
     }
     
     // Add user location marker and accuracy circle if available
@@ -1077,6 +1215,48 @@ const getLeafletMapHTML = (
       userMarker.bindPopup('Your Location (Accuracy: ±' + Math.round(userAccuracy) + 'm)');
     }
     
+    // Alert markers - the app clusters them for the viewport reported below
+    window.alertClusterLayer = L.layerGroup().addTo(map);
+    window.renderAlertClusters = function(clusters) {
+      window.alertClusterLayer.clearLayers();
+      clusters.forEach(function(cluster) {
+        const color = cluster.type === 'emergency' ? '${emergencyRed}' : '${warningOrange}';
+        const size = cluster.count > 1 ? Math.min(44, 24 + Math.round(Math.log2(cluster.count) * 4)) : 18;
+        const marker = L.marker([cluster.lat, cluster.lng], {
+          icon: L.divIcon({
+            className: 'alert-cluster',
+            html: '<div style="width:' + size + 'px;height:' + size + 'px;border-radius:50%;background:' + color +
+              ';color:#fff;border:2px solid #fff;display:flex;align-items:center;justify-content:center;' +
+              'font:bold 12px sans-serif;box-sizing:border-box;">' + (cluster.count > 1 ? cluster.count : '') + '</div>',
+            iconSize: [size, size],
+            iconAnchor: [size / 2, size / 2]
+          })
+        });
+        if (cluster.count > 1) {
+          marker.on('click', function() {
+            map.setView([cluster.lat, cluster.lng], Math.min(map.getZoom() + 2, 18));
+          });
+        } else {
+          marker.bindPopup('SOS alert #' + cluster.id);
+        }
+        window.alertClusterLayer.addLayer(marker);
+      });
+    };
+    function reportViewport() {
+      if (!window.ReactNativeWebView) return;
+      const visible = map.getBounds();
+      window.ReactNativeWebView.postMessage(JSON.stringify({
+        type: 'viewport',
+        zoom: map.getZoom(),
+        south: visible.getSouth(),
+        west: visible.getWest(),
+        north: visible.getNorth(),
+        east: visible.getEast()
+      }));
+    }
+    map.on('moveend', reportViewport);
+    reportViewport();
+    
     // Map control functions
     window.zoomIn = function() {
       map.zoomIn();
@@ -16,6 +16,7 @@ import { useAuth } from '../../hooks/useAuth';
 import { LogoutModal } from '../../components/modals/LogoutModal';
 import { colors, shadows } from '../../utils';
 import { PerformanceChart } from '../../components/charts/PerformanceChart';
+import { alertRollups } from '../../utils/alertRollups';
 import { profileService } from '../../api/services/profileService';
 import { geofenceService } from '../../api/services/geofenceService';
 import { useTheme } from '../../contexts/ThemeContext';
@@ -330,10 +331,16 @@ export const ProfileScreen = ({ navigation }: any) => {
 
   // Get sample stats if not available
   const getSampleStats = () => {
+    // Precomputed from the alerts already fetched - no extra scan or request
+    const officerFilter = { officerId: displayOfficer && displayOfficer.security_id ? String(displayOfficer.security_id) : undefined };
+    const rollupAverages = alertRollups.getAverages(officerFilter);
+    // Hourly buckets this officer handled alerts in: count of alerts and of distinct active hours
+    const hourlySeries = alertRollups.getSeries('hour', officerFilter);
+    const rollupResponses = hourlySeries.reduce((sum, bucket) => sum + bucket.total, 0);
     return {
-      total_responses: (displayOfficer && displayOfficer.stats && displayOfficer.stats.total_responses) ? displayOfficer.stats.total_responses : 156,
-      avg_response_time: (displayOfficer && displayOfficer.stats && displayOfficer.stats.avg_response_time) ? displayOfficer.stats.avg_response_time : 3.2,
-      active_hours: (displayOfficer && displayOfficer.stats && displayOfficer.stats.active_hours) ? displayOfficer.stats.active_hours : 240,
+      total_responses: (displayOfficer && displayOfficer.stats && displayOfficer.stats.total_responses) ? displayOfficer.stats.total_responses : (rollupResponses > 0 ? rollupResponses : 156),
+      avg_response_time: (displayOfficer && displayOfficer.stats && displayOfficer.stats.avg_response_time) ? displayOfficer.stats.avg_response_time : (rollupAverages.avgAcceptMinutes !== null ? rollupAverages.avgAcceptMinutes : 3.2),
+      active_hours: (displayOfficer && displayOfficer.stats && displayOfficer.stats.active_hours) ? displayOfficer.stats.active_hours : (hourlySeries.length > 0 ? hourlySeries.length : 240),
       area_coverage: (displayOfficer && displayOfficer.stats && displayOfficer.stats.area_coverage) ? displayOfficer.stats.area_coverage : 8.5,
       rating: (displayOfficer && displayOfficer.stats && displayOfficer.stats.rating) ? displayOfficer.stats.rating : 4.8,
     };
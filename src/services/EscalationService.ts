@@ -0,0 +1,275 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { Alert } from '../types/alert.types';
+import { HierarchicalTimerWheel } from '../utils/timerWheel';
+import { constants } from '../utils/constants';
+import { socketService } from './SocketService';
+import { etaService } from './EtaService';
+import { officerPositions } from '../utils/officerPositions';
+
+export interface Clock {
+  now(): number;
+}
+
+export interface EscalationEvent {
+  alertId: string;
+  level: number; // 1 = first escalation
+  radiusKm: number; // Dispatch radius to notify at this level
+  priority: Alert['priority'];
+  location?: { latitude: number; longitude: number };
+}
+
+interface EscalationState {
+  priority: Alert['priority'];
+  createdAt: number;
+  level: number;
+  location?: { latitude: number; longitude: number };
+}
+
+// Time an alert may stay pending before each escalation step, by priority
+const ESCALATION_INTERVAL_MS: Record<Alert['priority'], number> = {
+  high: 60 * 1000,
+  medium: 3 * 60 * 1000,
+  low: 5 * 60 * 1000,
+};
+const BASE_RADIUS_KM = 1;
+const MAX_ESCALATION_LEVEL = 4; // 1 -> 2 -> 4 -> 8 -> 16 km
+
+// Officers suggested to the backend per escalation, fastest ETA first
+const RANKED_OFFICERS_LIMIT = 10;
+
+// { [alertId]: highest level already fired } - survives restarts so a ring is never re-fired
+const FIRED_LEVELS_STORAGE_KEY = 'escalation_fired_levels';
+
+const systemClock: Clock = { now: () => Date.now() };
+
+/**
+ * Escalates SOS alerts that stay 'pending' with nobody accepting them
+ * Each pending alert has one deadline in a timer wheel; when it expires the dispatch
+ * radius doubles and the next deadline is scheduled. Accepting/closing an alert
+ * cancels it. State is rebuilt from the pending alerts (created_at) after a restart,
+ * and the rings already fired per alert are persisted so a restart doesn't fire them again.
+ *
+ * Every officer device watching the alert runs this, so the backend must be the single
+ * emitter of the widened dispatch: ALERT_ESCALATED is a request keyed by (alert_id, level)
+ * that the backend applies once and ignores when repeated by other devices.
+ */
+export class EscalationService {
+  private clock: Clock;
+  private wheel: HierarchicalTimerWheel<string>;
+  private states: Map<string, EscalationState> = new Map();
+  private timer: ReturnType<typeof setInterval> | null = null;
+  private onEscalate: (event: EscalationEvent) => void;
+  private firedLevels: Record<string, number> | null = null; // null until loaded from storage
+  private loadingFiredLevels: Promise<void> | null = null;
+  private deferredAlerts: Alert[] | null = null;
+  private users = 0;
+
+  constructor(
+    onEscalate?: (event: EscalationEvent) => void,
+    clock: Clock = systemClock
+  ) {
+    this.clock = clock;
+    this.wheel = new HierarchicalTimerWheel<string>(clock.now());
+    this.onEscalate = onEscalate || EscalationService.notifyBackend;
+  }
+
+  /**
+   * Default handler - ask the backend to re-dispatch to the wider ring
+   */
+  static notifyBackend(event: EscalationEvent) {
+    console.log('[Escalation] Alert', event.alertId, 'still pending - widening to', event.radiusKm, 'km (level', event.level + ')');
+    socketService.emit(constants.SOCKET_EVENTS.ALERT_ESCALATED, {
+      alert_id: event.alertId,
+      level: event.level,
+      radius_km: event.radiusKm,
+      priority: event.priority,
+      ranked_officers: EscalationService.rankOfficers(event),
+    });
+  }
+
+  /**
+   * Known officers inside the new ring ordered by travel-time ETA (road graph when loaded)
+   */
+  static rankOfficers(event: EscalationEvent): Array<{ security_id: string; eta_minutes: number; eta_method: string }> {
+    if (!event.location) {
+      return [];
+    }
+    const candidates = officerPositions
+      .withinRadius(event.location.latitude, event.location.longitude, event.radiusKm)
+      .filter((position) => position.status !== 'busy' && position.status !== 'offline')
+      .map((position) => ({ id: position.officerId, latitude: position.latitude, longitude: position.longitude }));
+    return etaService
+      .etaMatrix(candidates, event.location)
+      .slice(0, RANKED_OFFICERS_LIMIT)
+      .map((result) => ({ security_id: result.id, eta_minutes: result.minutes, eta_method: result.method }));
+  }
+
+  /**
+   * Start the scheduler - reference counted, the interval runs until the last user stops
+   */
+  start(intervalMs: number = 1000) {
+    this.users += 1;
+    if (this.timer) {
+      return;
+    }
+    this.loadFiredLevels();
+    this.timer = setInterval(() => this.tick(), intervalMs);
+  }
+
+  stop() {
+    this.users = Math.max(0, this.users - 1);
+    if (this.users === 0 && this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  get pendingCount(): number {
+    return this.states.size;
+  }
+
+  /**
+   * Track the current alert list - schedules new pending alerts, cancels the rest
+   * Also used to rehydrate after a restart: levels already passed are skipped
+   */
+  sync(alerts: Alert[]) {
+    if (this.firedLevels === null) {
+      // Fired rings not loaded yet - tracking now could fire them again
+      this.deferredAlerts = alerts;
+      this.loadFiredLevels();
+      return;
+    }
+    const pendingIds = new Set<string>();
+    for (const alert of alerts) {
+      const id = alert && (alert.id || alert.log_id);
+      if (!id || String(alert.status).toLowerCase() !== 'pending') {
+        continue;
+      }
+      const alertId = String(id);
+      pendingIds.add(alertId);
+      if (!this.states.has(alertId)) {
+        this.track(alertId, alert);
+      }
+    }
+    Array.from(this.states.keys()).forEach((alertId) => {
+      if (!pendingIds.has(alertId)) {
+        this.cancel(alertId);
+      }
+    });
+  }
+
+  /**
+   * Stop escalating an alert (accepted, closed or deleted)
+   */
+  cancel(alertId: string) {
+    this.wheel.cancel(alertId);
+    this.states.delete(alertId);
+    if (this.firedLevels && alertId in this.firedLevels) {
+      delete this.firedLevels[alertId];
+      this.persistFiredLevels();
+    }
+  }
+
+  /**
+   * Fire every escalation that is due at the clock's current time
+   */
+  tick(): EscalationEvent[] {
+    const events: EscalationEvent[] = [];
+    for (const { id } of this.wheel.advance(this.clock.now())) {
+      const state = this.states.get(id);
+      if (!state) {
+        continue;
+      }
+      state.level += 1;
+      const event: EscalationEvent = {
+        alertId: id,
+        level: state.level,
+        radiusKm: BASE_RADIUS_KM * Math.pow(2, state.level),
+        priority: state.priority,
+        location: state.location,
+      };
+      events.push(event);
+      if (this.firedLevels) {
+        this.firedLevels[id] = state.level;
+      }
+      try {
+        this.onEscalate(event);
+      } catch (error) {
+        console.warn('[Escalation] Escalation handler failed:', error);
+      }
+
+      // At the widest ring the state is kept (unscheduled) so the next sync doesn't start over
+      if (state.level < MAX_ESCALATION_LEVEL) {
+        this.wheel.schedule(id, this.deadlineFor(state, state.level + 1), id);
+      }
+    }
+    if (events.length > 0) {
+      this.persistFiredLevels();
+    }
+    return events;
+  }
+
+  private loadFiredLevels(): Promise<void> {
+    if (this.firedLevels !== null) {
+      return Promise.resolve();
+    }
+    if (!this.loadingFiredLevels) {
+      this.loadingFiredLevels = AsyncStorage.getItem(FIRED_LEVELS_STORAGE_KEY)
+        .then((stored) => (stored ? JSON.parse(stored) : {}))
+        .catch((error) => {
+          console.warn('[Escalation] Could not load fired escalation levels:', error);
+          return {};
+        })
+        .then((levels: Record<string, number>) => {
+          this.firedLevels = levels || {};
+          this.loadingFiredLevels = null;
+          const deferred = this.deferredAlerts;
+          this.deferredAlerts = null;
+          if (deferred) {
+            this.sync(deferred);
+          }
+        });
+    }
+    return this.loadingFiredLevels;
+  }
+
+  private persistFiredLevels() {
+    AsyncStorage.setItem(FIRED_LEVELS_STORAGE_KEY, JSON.stringify(this.firedLevels || {})).catch((error) => {
+      console.warn('[Escalation] Could not persist fired escalation levels:', error);
+    });
+  }
+
+  private track(alertId: string, alert: Alert) {
+    const priority = (['high', 'medium', 'low'].includes(alert.priority) ? alert.priority : 'medium') as Alert['priority'];
+    const created = new Date(alert.created_at || alert.timestamp).getTime();
+    const now = this.clock.now();
+    const state: EscalationState = {
+      priority,
+      createdAt: Number.isFinite(created) ? created : now,
+      level: 0,
+    };
+    const latitude = Number(alert.location?.latitude);
+    const longitude = Number(alert.location?.longitude);
+    if (Number.isFinite(latitude) && Number.isFinite(longitude) && (latitude !== 0 || longitude !== 0)) {
+      state.location = { latitude, longitude };
+    }
+
+    // Skip levels whose deadline already passed (e.g. app restarted) - escalate once to the current ring
+    const interval = ESCALATION_INTERVAL_MS[priority];
+    const elapsedLevels = Math.floor((now - state.createdAt) / interval);
+    state.level = Math.max(0, Math.min(elapsedLevels, MAX_ESCALATION_LEVEL) - 1);
+    // Rings this device already fired (before a restart) are not fired again
+    const fired = this.firedLevels?.[alertId] || 0;
+    state.level = Math.max(state.level, Math.min(fired, MAX_ESCALATION_LEVEL));
+    this.states.set(alertId, state);
+    if (state.level < MAX_ESCALATION_LEVEL) {
+      this.wheel.schedule(alertId, this.deadlineFor(state, state.level + 1), alertId);
+    }
+  }
+
+  private deadlineFor(state: EscalationState, level: number): number {
+    return state.createdAt + level * ESCALATION_INTERVAL_MS[state.priority];
+  }
+}
+
+export const escalationService = new EscalationService();
@@ -0,0 +1,157 @@
+import { RoadGraph, RoadGraphOptions, distanceMeters } from '../utils/roadGraph';
+import { roadNetworkService } from '../api/services/roadNetworkService';
+import { GeofenceArea } from '../types/location.types';
+
+export interface EtaOrigin {
+  id: string;
+  latitude: number;
+  longitude: number;
+}
+
+export interface EtaResult {
+  id: string;
+  minutes: number;
+  method: 'road' | 'straight_line'; // straight_line = no graph, off-network or unreachable
+}
+
+// Getting from a coordinate onto the nearest road (walking/driving off-network)
+const ACCESS_SPEED_MS = 15 / 3.6;
+
+// Straight-line fallback: typical urban detour over the crow-flies distance
+const DETOUR_FACTOR = 1.4;
+const FALLBACK_SPEED_MS = 30 / 3.6;
+
+// Searches stop at this travel time - officers further away use the fallback
+const MAX_SEARCH_SECONDS = 60 * 60;
+
+// Travel-time trees kept per alert node (one Float64Array per entry)
+const ROUTE_CACHE_SIZE = 16;
+
+/**
+ * Travel-time ETAs for dispatch
+ * With a road graph loaded, all officers' ETAs to an alert come from one reverse
+ * Dijkstra whose result is cached (LRU) per alert node, so re-ranking on every
+ * position update is an array lookup per officer. Without a graph (or for
+ * officers off the network) it falls back to a detour-adjusted straight line.
+ */
+export class EtaService {
+  private graph: RoadGraph | null = null;
+  private routeCache: Map<number, Float64Array> = new Map();
+  private geofenceId: string | null = null;
+  private loading: Promise<boolean> | null = null;
+
+  get isLoaded(): boolean {
+    return this.graph !== null;
+  }
+
+  /**
+   * Fetch and load the road network around the officer's geofence
+   * No-op if it is already loaded (or loading) for this geofence.
+   * @returns true if a road graph is available afterwards
+   */
+  loadForGeofence(geofence: GeofenceArea): Promise<boolean> {
+    const geofenceId = String(geofence.geofence_id);
+    if (this.geofenceId === geofenceId && this.graph) {
+      return Promise.resolve(true);
+    }
+    if (this.geofenceId === geofenceId && this.loading) {
+      return this.loading;
+    }
+    this.geofenceId = geofenceId;
+    this.loading = roadNetworkService
+      .getRoadNetwork(geofence)
+      .then((geojson) => {
+        if (this.geofenceId !== geofenceId) {
+          return false; // Geofence changed while fetching
+        }
+        if (geojson) {
+          this.load(geojson);
+        }
+        return this.isLoaded;
+      })
+      .catch((error) => {
+        console.warn('[ETA] Could not load road network:', error?.message || error);
+        return false;
+      })
+      .finally(() => {
+        this.loading = null;
+      });
+    return this.loading;
+  }
+
+  /**
+   * Load a road network extract (GeoJSON FeatureCollection of ways)
+   */
+  load(geojson: any, options: RoadGraphOptions = {}) {
+    const started = Date.now();
+    this.graph = RoadGraph.fromGeoJSON(geojson, options);
+    this.routeCache.clear();
+    console.log('[ETA] Road graph loaded:', this.graph.nodeCount, 'nodes,', this.graph.edgeCount, 'edges in', Date.now() - started, 'ms');
+  }
+
+  unload() {
+    this.graph = null;
+    this.geofenceId = null;
+    this.routeCache.clear();
+  }
+
+  /**
+   * ETAs from many officers to one alert, fastest first
+   */
+  etaMatrix(origins: EtaOrigin[], destination: { latitude: number; longitude: number }): EtaResult[] {
+    const results: EtaResult[] = [];
+    const graph = this.graph;
+    const target = graph ? graph.nearestNode(destination.latitude, destination.longitude) : null;
+    const times = graph && target ? this.travelTimesTo(target.node) : null;
+
+    for (const origin of origins) {
+      let seconds = Infinity;
+      if (graph && target && times) {
+        const start = graph.nearestNode(origin.latitude, origin.longitude);
+        if (start && Number.isFinite(times[start.node])) {
+          seconds = times[start.node] + (start.distanceMeters + target.distanceMeters) / ACCESS_SPEED_MS;
+        }
+      }
+      if (Number.isFinite(seconds)) {
+        results.push({ id: origin.id, minutes: Math.max(1, Math.round(seconds / 60)), method: 'road' });
+      } else {
+        const straight = distanceMeters(origin.latitude, origin.longitude, destination.latitude, destination.longitude);
+        results.push({
+          id: origin.id,
+          minutes: Math.max(1, Math.round((straight * DETOUR_FACTOR) / FALLBACK_SPEED_MS / 60)),
+          method: 'straight_line',
+        });
+      }
+    }
+    return results.sort((a, b) => a.minutes - b.minutes);
+  }
+
+  /**
+   * ETA in whole minutes from one point to another
+   */
+  estimateMinutes(
+    origin: { latitude: number; longitude: number },
+    destination: { latitude: number; longitude: number }
+  ): number {
+    return this.etaMatrix([{ id: 'origin', ...origin }], destination)[0].minutes;
+  }
+
+  private travelTimesTo(node: number): Float64Array {
+    const cached = this.routeCache.get(node);
+    if (cached) {
+      // Refresh recency - Map keeps insertion order, so the first key is the least recent
+      this.routeCache.delete(node);
+      this.routeCache.set(node, cached);
+      return cached;
+    }
+    const times = (this.graph as RoadGraph).travelTimesTo(node, MAX_SEARCH_SECONDS);
+    this.routeCache.set(node, times);
+    if (this.routeCache.size > ROUTE_CACHE_SIZE) {
+      const oldest = this.routeCache.keys().next().value as number;
+      this.routeCache.delete(oldest);
+    }
+    return times;
+  }
+}
+
+export const etaService = new EtaService();
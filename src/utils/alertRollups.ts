@@ -0,0 +1,265 @@
+import { Alert } from '../types/alert.types';
+
+/**
+ * Precomputed alert analytics
+ * Alerts are aggregated into hourly buckets per geofence and officer. Each alert's
+ * contribution is remembered, so a status change only moves that one alert
+ * between buckets instead of recomputing the stats from every alert.
+ */
+
+export interface RollupBucket {
+  bucketStart: number; // ms since epoch, start of the hour (or day for daily series)
+  geofenceId: string;
+  officerId: string;
+  total: number;
+  high: number;
+  medium: number;
+  low: number;
+  accepted: number; // Alerts with a known accept time
+  acceptLatencySum: number; // ms, created_at -> accepted
+  resolved: number; // Alerts with a known resolution time
+  resolutionSum: number; // ms, created_at -> resolved
+}
+
+export interface AlertStatusCounts {
+  total: number;
+  active: number; // pending + accepted
+  pending: number;
+  accepted: number;
+  resolved: number; // completed/resolved
+  highPriority: number;
+}
+
+interface Contribution {
+  key: string;
+  signature: string;
+  priority: 'high' | 'medium' | 'low';
+  acceptLatency: number | null;
+  resolution: number | null;
+}
+
+const HOUR_MS = 60 * 60 * 1000;
+const DAY_MS = 24 * HOUR_MS;
+
+const toTime = (value: any): number | null => {
+  if (!value) {
+    return null;
+  }
+  const time = new Date(value).getTime();
+  return Number.isFinite(time) ? time : null;
+};
+
+const normalizeStatus = (status: any): string => {
+  const value = String(status || '').toLowerCase();
+  return value === 'resolved' ? 'completed' : value;
+};
+
+/**
+ * Count alerts by status in a single pass (AlertStats and filter tabs)
+ */
+export const countAlertStatuses = (alerts: Alert[]): AlertStatusCounts => {
+  const counts: AlertStatusCounts = { total: 0, active: 0, pending: 0, accepted: 0, resolved: 0, highPriority: 0 };
+  for (const alert of alerts) {
+    if (!alert) {
+      continue;
+    }
+    counts.total += 1;
+    const status = normalizeStatus(alert.status);
+    if (status === 'pending') {
+      counts.pending += 1;
+      counts.active += 1;
+    } else if (status === 'accepted') {
+      counts.accepted += 1;
+      counts.active += 1;
+    } else if (status === 'completed') {
+      counts.resolved += 1;
+    }
+    if (String(alert.priority || '').toLowerCase() === 'high') {
+      counts.highPriority += 1;
+    }
+  }
+  return counts;
+};
+
+export class AlertRollupStore {
+  private buckets: Map<string, RollupBucket> = new Map();
+  private contributions: Map<string, Contribution> = new Map();
+
+  /**
+   * Make the rollups match a full alert list (backfill on first call, incremental afterwards)
+   */
+  sync(alerts: Alert[]) {
+    const seen = new Set<string>();
+    for (const alert of alerts) {
+      const id = alert && (alert.id || alert.log_id);
+      if (!id) {
+        continue;
+      }
+      seen.add(String(id));
+      this.upsert(alert);
+    }
+    Array.from(this.contributions.keys()).forEach((id) => {
+      if (!seen.has(id)) {
+        this.remove(id);
+      }
+    });
+  }
+
+  /**
+   * Apply a created or changed alert (e.g. after accept/resolve)
+   */
+  upsert(alert: Alert) {
+    const id = String(alert.id || alert.log_id);
+    const raw: any = alert;
+    const signature = [alert.status, alert.priority, alert.updated_at, raw.accepted_at, raw.resolved_at, alert.geofence_id].join('|');
+    const previous = this.contributions.get(id);
+    if (previous && previous.signature === signature) {
+      return;
+    }
+    if (previous) {
+      this.applyContribution(previous, -1);
+    }
+
+    const created = toTime(alert.created_at || alert.timestamp);
+    if (created === null) {
+      this.contributions.delete(id);
+      return;
+    }
+    const status = normalizeStatus(alert.status);
+    const acceptedAt = toTime(raw.accepted_at);
+    const resolvedAt = toTime(raw.resolved_at) || (status === 'completed' ? toTime(alert.updated_at) : null);
+    const officerId = String(raw.security_id || raw.accepted_by || '');
+    const priority = (['high', 'medium', 'low'].includes(alert.priority) ? alert.priority : 'medium') as Contribution['priority'];
+
+    const contribution: Contribution = {
+      key: `${Math.floor(created / HOUR_MS) * HOUR_MS}|${alert.geofence_id || ''}|${officerId}`,
+      signature,
+      priority,
+      acceptLatency: acceptedAt !== null && acceptedAt >= created ? acceptedAt - created : null,
+      resolution: resolvedAt !== null && resolvedAt >= created ? resolvedAt - created : null,
+    };
+    this.applyContribution(contribution, 1);
+    this.contributions.set(id, contribution);
+  }
+
+  remove(id: string) {
+    const previous = this.contributions.get(id);
+    if (previous) {
+      this.applyContribution(previous, -1);
+      this.contributions.delete(id);
+    }
+  }
+
+  /**
+   * Time series for trend charts
+   * @param granularity - 'hour' or 'day'
+   * @param filter - Restrict to one geofence and/or officer
+   * @returns Buckets sorted by time, merged across geofences/officers unless filtered
+   */
+  getSeries(
+    granularity: 'hour' | 'day' = 'hour',
+    filter: { geofenceId?: string; officerId?: string; from?: number; to?: number } = {}
+  ): RollupBucket[] {
+    const size = granularity === 'day' ? DAY_MS : HOUR_MS;
+    const merged: Map<number, RollupBucket> = new Map();
+
+    this.buckets.forEach((bucket) => {
+      if (filter.geofenceId !== undefined && bucket.geofenceId !== filter.geofenceId) return;
+      if (filter.officerId !== undefined && bucket.officerId !== filter.officerId) return;
+      if (filter.from !== undefined && bucket.bucketStart < filter.from) return;
+      if (filter.to !== undefined && bucket.bucketStart > filter.to) return;
+
+      const start = Math.floor(bucket.bucketStart / size) * size;
+      let target = merged.get(start);
+      if (!target) {
+        target = {
+          bucketStart: start,
+          geofenceId: filter.geofenceId || '*',
+          officerId: filter.officerId || '*',
+          total: 0, high: 0, medium: 0, low: 0,
+          accepted: 0, acceptLatencySum: 0, resolved: 0, resolutionSum: 0,
+        };
+        merged.set(start, target);
+      }
+      target.total += bucket.total;
+      target.high += bucket.high;
+      target.medium += bucket.medium;
+      target.low += bucket.low;
+      target.accepted += bucket.accepted;
+      target.acceptLatencySum += bucket.acceptLatencySum;
+      target.resolved += bucket.resolved;
+      target.resolutionSum += bucket.resolutionSum;
+    });
+
+    return Array.from(merged.values()).sort((a, b) => a.bucketStart - b.bucketStart);
+  }
+
+  /**
+   * Alert counts per geofence and hour of day (0-23), for heatmaps
+   */
+  getHourOfDayHeatmap(): Map<string, number[]> {
+    const heatmap: Map<string, number[]> = new Map();
+    this.buckets.forEach((bucket) => {
+      let row = heatmap.get(bucket.geofenceId);
+      if (!row) {
+        row = new Array(24).fill(0);
+        heatmap.set(bucket.geofenceId, row);
+      }
+      row[new Date(bucket.bucketStart).getHours()] += bucket.total;
+    });
+    return heatmap;
+  }
+
+  /**
+   * Average accept latency and resolution time in minutes (null when unknown)
+   */
+  getAverages(filter: { geofenceId?: string; officerId?: string } = {}) {
+    let accepted = 0;
+    let acceptLatencySum = 0;
+    let resolved = 0;
+    let resolutionSum = 0;
+    this.buckets.forEach((bucket) => {
+      if (filter.geofenceId !== undefined && bucket.geofenceId !== filter.geofenceId) return;
+      if (filter.officerId !== undefined && bucket.officerId !== filter.officerId) return;
+      accepted += bucket.accepted;
+      acceptLatencySum += bucket.acceptLatencySum;
+      resolved += bucket.resolved;
+      resolutionSum += bucket.resolutionSum;
+    });
+    return {
+      avgAcceptMinutes: accepted > 0 ? acceptLatencySum / accepted / 60000 : null,
+      avgResolutionMinutes: resolved > 0 ? resolutionSum / resolved / 60000 : null,
+    };
+  }
+
+  private applyContribution(contribution: Contribution, sign: 1 | -1) {
+    let bucket = this.buckets.get(contribution.key);
+    if (!bucket) {
+      const [start, geofenceId, officerId] = contribution.key.split('|');
+      bucket = {
+        bucketStart: Number(start),
+        geofenceId,
+        officerId,
+        total: 0, high: 0, medium: 0, low: 0,
+        accepted: 0, acceptLatencySum: 0, resolved: 0, resolutionSum: 0,
+      };
+      this.buckets.set(contribution.key, bucket);
+    }
+    bucket.total += sign;
+    bucket[contribution.priority] += sign;
+    if (contribution.acceptLatency !== null) {
+      bucket.accepted += sign;
+      bucket.acceptLatencySum += sign * contribution.acceptLatency;
+    }
+    if (contribution.resolution !== null) {
+      bucket.resolved += sign;
+      bucket.resolutionSum += sign * contribution.resolution;
+    }
+    if (bucket.total === 0) {
+      this.buckets.delete(contribution.key);
+    }
+  }
+}
+
+// Shared rollups - kept in sync with the alerts in the Redux store
+export const alertRollups = new AlertRollupStore();
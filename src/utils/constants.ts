@@ -20,6 +20,7 @@ export const constants = {
     USER_ID: 'userId',
     ROLE: 'role',
     REMEMBER_ME: 'rememberMe',
+    REQUEST_TRACE: 'request_trace', // Device-level - survives logout (see storage.clear)
   },
   
   // Socket Events
@@ -29,6 +30,7 @@ export const constants = {
     NEW_ALERT: 'new_alert',
     ALERT_UPDATED: 'alert_updated',
     LOCATION_UPDATE: 'location_update',
+    ALERT_ESCALATED: 'alert_escalated',
   },
 };
 
@@ -0,0 +1,208 @@
+/**
+ * Geofence enter/exit detection over a stream of location pings
+ * Keeps one byte of containment state per session and only reports a crossing
+ * after several consecutive samples agree, so GPS jitter along the boundary
+ * doesn't produce enter/exit/enter bursts.
+ */
+
+export interface GeofencePing {
+  sessionId: string;
+  latitude: number;
+  longitude: number;
+  accuracy?: number; // meters
+}
+
+export interface GeofenceEvent {
+  sessionId: string;
+  type: 'enter' | 'exit';
+  latitude: number;
+  longitude: number;
+}
+
+export interface GeofenceDetectorOptions {
+  confirmSamples?: number; // Consecutive samples needed to confirm a crossing (default 3)
+  maxAccuracyMeters?: number; // Pings less accurate than this are ignored (default 50)
+  initialCapacity?: number; // Number of session slots to allocate up front
+}
+
+const STATE_UNKNOWN = 0;
+const STATE_OUTSIDE = 1;
+const STATE_INSIDE = 2;
+
+export class GeofenceCrossingDetector {
+  private vertexLats: Float64Array = new Float64Array(0);
+  private vertexLngs: Float64Array = new Float64Array(0);
+  private minLat = 0;
+  private maxLat = 0;
+  private minLng = 0;
+  private maxLng = 0;
+
+  private confirmSamples: number;
+  private maxAccuracyMeters: number;
+
+  // Per-session state lives in typed arrays indexed by slot
+  private slots: Map<string, number> = new Map();
+  private freeSlots: number[] = [];
+  private state: Uint8Array;
+  private streak: Uint8Array;
+
+  constructor(
+    polygon: Array<{ latitude: number; longitude: number }>,
+    options: GeofenceDetectorOptions = {}
+  ) {
+    this.confirmSamples = Math.max(1, Math.min(255, options.confirmSamples || 3));
+    this.maxAccuracyMeters = options.maxAccuracyMeters || 50;
+    const capacity = Math.max(16, options.initialCapacity || 16);
+    this.state = new Uint8Array(capacity);
+    this.streak = new Uint8Array(capacity);
+    this.setPolygon(polygon);
+  }
+
+  /**
+   * Replace the boundary (e.g. after the geofence is re-fetched)
+   * Session states are kept - the next confirmed disagreement reports a crossing
+   */
+  setPolygon(polygon: Array<{ latitude: number; longitude: number }>) {
+    const count = polygon ? polygon.length : 0;
+    this.vertexLats = new Float64Array(count);
+    this.vertexLngs = new Float64Array(count);
+    this.minLat = Infinity;
+    this.maxLat = -Infinity;
+    this.minLng = Infinity;
+    this.maxLng = -Infinity;
+    for (let i = 0; i < count; i++) {
+      const { latitude, longitude } = polygon[i];
+      this.vertexLats[i] = latitude;
+      this.vertexLngs[i] = longitude;
+      this.minLat = Math.min(this.minLat, latitude);
+      this.maxLat = Math.max(this.maxLat, latitude);
+      this.minLng = Math.min(this.minLng, longitude);
+      this.maxLng = Math.max(this.maxLng, longitude);
+    }
+  }
+
+  /**
+   * Process a batch of pings and return the confirmed crossings
+   * Containment is computed for the whole batch in one pass over the polygon edges
+   */
+  processBatch(pings: GeofencePing[]): GeofenceEvent[] {
+    const events: GeofenceEvent[] = [];
+    if (this.vertexLats.length < 3 || pings.length === 0) {
+      return events;
+    }
+
+    const inside = this.containsBatch(pings);
+
+    for (let p = 0; p < pings.length; p++) {
+      const ping = pings[p];
+      if (ping.accuracy !== undefined && ping.accuracy > this.maxAccuracyMeters) {
+        continue;
+      }
+
+      const slot = this.getSlot(ping.sessionId);
+      const observed = inside[p] ? STATE_INSIDE : STATE_OUTSIDE;
+      const current = this.state[slot];
+
+      if (current === STATE_UNKNOWN) {
+        // First fix only establishes the baseline - no event
+        this.state[slot] = observed;
+        this.streak[slot] = 0;
+      } else if (observed === current) {
+        this.streak[slot] = 0;
+      } else if (this.streak[slot] + 1 >= this.confirmSamples) {
+        this.state[slot] = observed;
+        this.streak[slot] = 0;
+        events.push({
+          sessionId: ping.sessionId,
+          type: observed === STATE_INSIDE ? 'enter' : 'exit',
+          latitude: ping.latitude,
+          longitude: ping.longitude,
+        });
+      } else {
+        this.streak[slot] += 1;
+      }
+    }
+    return events;
+  }
+
+  process(ping: GeofencePing): GeofenceEvent | null {
+    const events = this.processBatch([ping]);
+    return events.length > 0 ? events[0] : null;
+  }
+
+  /**
+   * Confirmed containment for a session (null until its first accurate fix)
+   */
+  isInside(sessionId: string): boolean | null {
+    const slot = this.slots.get(sessionId);
+    if (slot === undefined || this.state[slot] === STATE_UNKNOWN) {
+      return null;
+    }
+    return this.state[slot] === STATE_INSIDE;
+  }
+
+  /**
+   * Forget a session (e.g. when its live location session is stopped)
+   */
+  remove(sessionId: string) {
+    const slot = this.slots.get(sessionId);
+    if (slot !== undefined) {
+      this.slots.delete(sessionId);
+      this.state[slot] = STATE_UNKNOWN;
+      this.streak[slot] = 0;
+      this.freeSlots.push(slot);
+    }
+  }
+
+  private getSlot(sessionId: string): number {
+    let slot = this.slots.get(sessionId);
+    if (slot !== undefined) {
+      return slot;
+    }
+    slot = this.freeSlots.length > 0 ? this.freeSlots.pop()! : this.slots.size;
+    if (slot >= this.state.length) {
+      const grownState = new Uint8Array(this.state.length * 2);
+      const grownStreak = new Uint8Array(this.state.length * 2);
+      grownState.set(this.state);
+      grownStreak.set(this.streak);
+      this.state = grownState;
+      this.streak = grownStreak;
+    }
+    this.slots.set(sessionId, slot);
+    return slot;
+  }
+
+  // Ray casting (same rule as isPointInPolygon in helpers.ts), edges in the outer loop
+  private containsBatch(pings: GeofencePing[]): Uint8Array {
+    const count = pings.length;
+    const lats = new Float64Array(count);
+    const lngs = new Float64Array(count);
+    const inside = new Uint8Array(count);
+    const candidates: number[] = [];
+
+    for (let p = 0; p < count; p++) {
+      lats[p] = pings[p].latitude;
+      lngs[p] = pings[p].longitude;
+      // Bounding box rejects most pings far from the boundary without touching the edges
+      if (lats[p] >= this.minLat && lats[p] <= this.maxLat && lngs[p] >= this.minLng && lngs[p] <= this.maxLng) {
+        candidates.push(p);
+      }
+    }
+
+    const vertexCount = this.vertexLats.length;
+    for (let i = 0, j = vertexCount - 1; i < vertexCount; j = i++) {
+      const yi = this.vertexLats[i];
+      const yj = this.vertexLats[j];
+      const xi = this.vertexLngs[i];
+      const xj = this.vertexLngs[j];
+      for (let c = 0; c < candidates.length; c++) {
+        const p = candidates[c];
+        const lat = lats[p];
+        if (yi > lat !== yj > lat && lngs[p] < ((xj - xi) * (lat - yi)) / (yj - yi) + xi) {
+          inside[p] ^= 1;
+        }
+      }
+    }
+    return inside;
+  }
+}
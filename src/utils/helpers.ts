@@ -116,16 +116,110 @@ export const isPointInPolygon = (
   return inside;
 };
 
+/**
+ * Perpendicular distance from a point to a segment, in degrees (planar approximation)
+ */
+const perpendicularDistance = (
+  point: { latitude: number; longitude: number },
+  start: { latitude: number; longitude: number },
+  end: { latitude: number; longitude: number }
+): number => {
+  const dx = end.longitude - start.longitude;
+  const dy = end.latitude - start.latitude;
+  if (dx === 0 && dy === 0) {
+    return Math.hypot(point.longitude - start.longitude, point.latitude - start.latitude);
+  }
+  const t = Math.max(0, Math.min(1,
+    ((point.longitude - start.longitude) * dx + (point.latitude - start.latitude) * dy) / (dx * dx + dy * dy)
+  ));
+  return Math.hypot(
+    point.longitude - (start.longitude + t * dx),
+    point.latitude - (start.latitude + t * dy)
+  );
+};
 
+/**
+ * Simplify a polygon ring with the Douglas-Peucker algorithm
+ * @param polygon - Array of polygon vertices [{ latitude, longitude }, ...]
+ * @param tolerance - Maximum allowed deviation, in degrees
+ * @returns Simplified ring (never fewer than 3 vertices)
+ */
+export const simplifyPolygon = <T extends { latitude: number; longitude: number }>(
+  polygon: T[],
+  tolerance: number
+): T[] => {
+  if (!polygon || polygon.length <= 4 || tolerance <= 0) {
+    return polygon;
+  }
 
+  const keep = new Uint8Array(polygon.length);
+  keep[0] = 1;
+  keep[polygon.length - 1] = 1;
+
+  // Iterative stack instead of recursion - campus boundaries can have thousands of vertices
+  const stack: Array<[number, number]> = [[0, polygon.length - 1]];
+  while (stack.length > 0) {
+    const [first, last] = stack.pop()!;
+    let maxDistance = 0;
+    let index = -1;
+    for (let i = first + 1; i < last; i++) {
+      const distance = perpendicularDistance(polygon[i], polygon[first], polygon[last]);
+      if (distance > maxDistance) {
+        maxDistance = distance;
+        index = i;
+      }
+    }
+    if (index !== -1 && maxDistance > tolerance) {
+      keep[index] = 1;
+      stack.push([first, index], [index, last]);
+    }
+  }
 
+  const simplified = polygon.filter((_, i) => keep[i] === 1);
+  return simplified.length >= 3 ? simplified : polygon;
+};
 
+// Simplified variants per zoom level, keyed by the coordinates array they were computed from
+const simplifiedPolygonCache = new WeakMap<object, Map<number, any[]>>();
 
+/**
+ * Get a polygon simplified to roughly one screen pixel of detail at the given map zoom level
+ * Variants are computed once per coordinates array and zoom level, then reused
+ */
+export const getPolygonForZoom = <T extends { latitude: number; longitude: number }>(
+  polygon: T[],
+  zoom: number
+): T[] => {
+  const level = Math.max(0, Math.min(22, Math.round(zoom)));
+  // Full detail is cheap enough when zoomed in to street level
+  if (!polygon || level >= 18) {
+    return polygon;
+  }
 
+  let variants = simplifiedPolygonCache.get(polygon);
+  if (!variants) {
+    variants = new Map();
+    simplifiedPolygonCache.set(polygon, variants);
+  }
+  const cached = variants.get(level);
+  if (cached) {
+    return cached as T[];
+  }
 
+  // One pixel of a 256px web-mercator tile at this zoom level, in degrees
+  const tolerance = 360 / (256 * Math.pow(2, level));
+  const simplified = simplifyPolygon(polygon, tolerance);
+  variants.set(level, simplified);
+  return simplified;
+};
 
-
-
-
-
-
+/**
+ * Cheap content hash (djb2) used to version cached payloads
+ */
+export const hashString = (value: string): string => {
+  let hash = 5381;
+  for (let i = 0; i < value.length; i++) {
+    hash = ((hash << 5) + hash + value.charCodeAt(i)) | 0;
+  }
+  return (hash >>> 0).toString(36);
+};
@@ -0,0 +1,165 @@
+/**
+ * Hierarchical grid clustering for map markers
+ * The index is built once per point set; viewport queries only touch the grid cells
+ * that are on screen, so render cost stays bounded no matter how many points exist.
+ */
+
+export interface ClusterPoint {
+  id: string;
+  latitude: number;
+  longitude: number;
+  type?: 'officer' | 'user' | 'emergency';
+}
+
+export interface MarkerCluster {
+  id: string;
+  latitude: number;
+  longitude: number;
+  count: number;
+  point?: ClusterPoint; // Set when the cluster holds a single point
+  type: 'officer' | 'user' | 'emergency'; // Most urgent type inside the cluster
+}
+
+export interface BoundingBox {
+  minLatitude: number;
+  minLongitude: number;
+  maxLatitude: number;
+  maxLongitude: number;
+}
+
+interface GridCell {
+  x: number; // Sum of projected x (divide by count for centroid)
+  y: number;
+  count: number;
+  point?: ClusterPoint;
+  type: MarkerCluster['type'];
+}
+
+// Cluster cell size in screen pixels (256px web-mercator tiles)
+const CELL_SIZE_PX = 64;
+const CELLS_PER_TILE = 256 / CELL_SIZE_PX;
+
+const TYPE_RANK: Record<MarkerCluster['type'], number> = { user: 0, officer: 1, emergency: 2 };
+
+// Web-mercator projection to [0, 1]
+const projectX = (longitude: number) => longitude / 360 + 0.5;
+const projectY = (latitude: number) => {
+  const sin = Math.sin((Math.max(-85, Math.min(85, latitude)) * Math.PI) / 180);
+  return 0.5 - (0.25 * Math.log((1 + sin) / (1 - sin))) / Math.PI;
+};
+const unprojectLongitude = (x: number) => (x - 0.5) * 360;
+const unprojectLatitude = (y: number) =>
+  (360 * Math.atan(Math.exp((1 - 2 * y) * Math.PI))) / Math.PI - 90;
+
+const cellsPerAxis = (zoom: number) => Math.pow(2, zoom) * CELLS_PER_TILE;
+
+export class MarkerClusterIndex {
+  private levels: Array<Map<number, GridCell>> = [];
+  private maxZoom: number;
+
+  constructor(points: ClusterPoint[], maxZoom: number = 17) {
+    this.maxZoom = maxZoom;
+
+    // Finest level is built from the points themselves
+    const finest = new Map<number, GridCell>();
+    const size = cellsPerAxis(maxZoom);
+    for (const point of points) {
+      if (!Number.isFinite(point.latitude) || !Number.isFinite(point.longitude)) {
+        continue;
+      }
+      const x = projectX(point.longitude);
+      const y = projectY(point.latitude);
+      const key = Math.floor(y * size) * size + Math.floor(x * size);
+      const type = point.type || 'user';
+      const cell = finest.get(key);
+      if (cell) {
+        cell.x += x;
+        cell.y += y;
+        cell.count += 1;
+        cell.point = undefined;
+        if (TYPE_RANK[type] > TYPE_RANK[cell.type]) {
+          cell.type = type;
+        }
+      } else {
+        finest.set(key, { x, y, count: 1, point, type });
+      }
+    }
+    this.levels[maxZoom] = finest;
+
+    // Every coarser level merges 2x2 cells of the level below it
+    for (let zoom = maxZoom - 1; zoom >= 0; zoom--) {
+      const childSize = cellsPerAxis(zoom + 1);
+      const parentSize = cellsPerAxis(zoom);
+      const parents = new Map<number, GridCell>();
+      this.levels[zoom + 1].forEach((child, childKey) => {
+        const row = Math.floor(childKey / childSize);
+        const col = childKey - row * childSize;
+        const key = (row >> 1) * parentSize + (col >> 1);
+        const parent = parents.get(key);
+        if (parent) {
+          parent.x += child.x;
+          parent.y += child.y;
+          parent.count += child.count;
+          parent.point = undefined;
+          if (TYPE_RANK[child.type] > TYPE_RANK[parent.type]) {
+            parent.type = child.type;
+          }
+        } else {
+          parents.set(key, { ...child });
+        }
+      });
+      this.levels[zoom] = parents;
+    }
+  }
+
+  /**
+   * Get clusters inside a viewport
+   * @param bbox - Visible region
+   * @param zoom - Current Leaflet map zoom
+   */
+  getClusters(bbox: BoundingBox, zoom: number): MarkerCluster[] {
+    const level = Math.max(0, Math.min(this.maxZoom, Math.floor(zoom)));
+    const cells = this.levels[level];
+    const size = cellsPerAxis(level);
+
+    const minCol = Math.max(0, Math.floor(projectX(bbox.minLongitude) * size));
+    const maxCol = Math.min(size - 1, Math.floor(projectX(bbox.maxLongitude) * size));
+    const minRow = Math.max(0, Math.floor(projectY(bbox.maxLatitude) * size));
+    const maxRow = Math.min(size - 1, Math.floor(projectY(bbox.minLatitude) * size));
+
+    const clusters: MarkerCluster[] = [];
+    const addCluster = (key: number, cell: GridCell) => {
+      clusters.push({
+        id: cell.point ? cell.point.id : `cluster_${level}_${key}`,
+        latitude: cell.point ? cell.point.latitude : unprojectLatitude(cell.y / cell.count),
+        longitude: cell.point ? cell.point.longitude : unprojectLongitude(cell.x / cell.count),
+        count: cell.count,
+        point: cell.point,
+        type: cell.type,
+      });
+    };
+
+    // Walk whichever is smaller: the visible cell range or the occupied cells
+    const visibleCells = (maxCol - minCol + 1) * (maxRow - minRow + 1);
+    if (visibleCells <= cells.size) {
+      for (let row = minRow; row <= maxRow; row++) {
+        for (let col = minCol; col <= maxCol; col++) {
+          const key = row * size + col;
+          const cell = cells.get(key);
+          if (cell) {
+            addCluster(key, cell);
+          }
+        }
+      }
+    } else {
+      cells.forEach((cell, key) => {
+        const row = Math.floor(key / size);
+        const col = key - row * size;
+        if (row >= minRow && row <= maxRow && col >= minCol && col <= maxCol) {
+          addCluster(key, cell);
+        }
+      });
+    }
+    return clusters;
+  }
+}
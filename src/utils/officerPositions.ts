@@ -0,0 +1,265 @@
+/**
+ * Latest known position of every on-duty officer
+ * Positions live in parallel typed arrays indexed by slot, with an id -> slot map,
+ * so an update is a handful of array writes and area queries scan flat numeric
+ * arrays instead of walking session objects.
+ */
+
+export type OfficerStatus = 'unknown' | 'available' | 'busy' | 'offline';
+
+export interface OfficerPosition {
+  officerId: string;
+  latitude: number;
+  longitude: number;
+  timestamp: number; // ms since epoch
+  status: OfficerStatus;
+}
+
+const STATUS_CODES: OfficerStatus[] = ['unknown', 'available', 'busy', 'offline'];
+const STATUS_INDEX: Record<OfficerStatus, number> = { unknown: 0, available: 1, busy: 2, offline: 3 };
+
+const EARTH_RADIUS_KM = 6371;
+const DEG_TO_RAD = Math.PI / 180;
+const KM_PER_DEGREE_LAT = 111.32;
+
+export class OfficerPositionStore {
+  private slots: Map<string, number> = new Map();
+  private ids: string[] = [];
+  private freeSlots: number[] = [];
+  private used = 0; // Slots handed out so far (high-water mark)
+
+  private lats: Float64Array;
+  private lngs: Float64Array;
+  private times: Float64Array;
+  private statuses: Uint8Array;
+  private live: Uint8Array; // 1 while the slot holds an officer
+
+  constructor(initialCapacity: number = 64) {
+    const capacity = Math.max(16, initialCapacity);
+    this.lats = new Float64Array(capacity);
+    this.lngs = new Float64Array(capacity);
+    this.times = new Float64Array(capacity);
+    this.statuses = new Uint8Array(capacity);
+    this.live = new Uint8Array(capacity);
+  }
+
+  get size(): number {
+    return this.slots.size;
+  }
+
+  /**
+   * Record a position; older timestamps than the stored one are ignored
+   * @returns true if the stored position changed
+   */
+  update(officerId: string, latitude: number, longitude: number, timestamp: number = Date.now(), status?: OfficerStatus): boolean {
+    if (!Number.isFinite(latitude) || !Number.isFinite(longitude)) {
+      return false;
+    }
+    let slot = this.slots.get(officerId);
+    if (slot === undefined) {
+      slot = this.allocate(officerId);
+    } else if (timestamp < this.times[slot]) {
+      return false; // Out-of-order ping
+    }
+    this.lats[slot] = latitude;
+    this.lngs[slot] = longitude;
+    this.times[slot] = timestamp;
+    if (status !== undefined) {
+      this.statuses[slot] = STATUS_INDEX[status] || 0;
+    }
+    return true;
+  }
+
+  setStatus(officerId: string, status: OfficerStatus) {
+    const slot = this.slots.get(officerId);
+    if (slot !== undefined) {
+      this.statuses[slot] = STATUS_INDEX[status] || 0;
+    }
+  }
+
+  statusOf(officerId: string): OfficerStatus {
+    const slot = this.slots.get(officerId);
+    return slot === undefined ? 'unknown' : STATUS_CODES[this.statuses[slot]] || 'unknown';
+  }
+
+  /**
+   * Mark the officers holding an open (accepted) alert busy and release the rest
+   * Offline officers stay offline - only the live-location feed brings them back.
+   */
+  applyAssignments(busyOfficerIds: Set<string>) {
+    for (let slot = 0; slot < this.used; slot++) {
+      if (!this.live[slot] || this.statuses[slot] === STATUS_INDEX.offline) continue;
+      if (busyOfficerIds.has(this.ids[slot])) {
+        this.statuses[slot] = STATUS_INDEX.busy;
+      } else if (this.statuses[slot] === STATUS_INDEX.busy) {
+        this.statuses[slot] = STATUS_INDEX.available;
+      }
+    }
+  }
+
+  remove(officerId: string) {
+    const slot = this.slots.get(officerId);
+    if (slot === undefined) {
+      return;
+    }
+    this.slots.delete(officerId);
+    this.live[slot] = 0;
+    this.ids[slot] = '';
+    this.freeSlots.push(slot);
+  }
+
+  get(officerId: string): OfficerPosition | null {
+    const slot = this.slots.get(officerId);
+    return slot === undefined ? null : this.read(slot);
+  }
+
+  /**
+   * Drop officers whose last position is older than maxAgeMs
+   * @returns Number of officers removed
+   */
+  pruneOlderThan(maxAgeMs: number, now: number = Date.now()): number {
+    const cutoff = now - maxAgeMs;
+    let removed = 0;
+    for (let slot = 0; slot < this.used; slot++) {
+      if (this.live[slot] && this.times[slot] < cutoff) {
+        this.remove(this.ids[slot]);
+        removed += 1;
+      }
+    }
+    return removed;
+  }
+
+  /**
+   * Officers within radiusKm of a point, nearest first
+   * A latitude/longitude box rejects most slots before the haversine check
+   */
+  withinRadius(
+    latitude: number,
+    longitude: number,
+    radiusKm: number,
+    options: { status?: OfficerStatus; maxAgeMs?: number; limit?: number; now?: number } = {}
+  ): Array<OfficerPosition & { distanceKm: number }> {
+    const latDelta = radiusKm / KM_PER_DEGREE_LAT;
+    const cosLat = Math.cos(latitude * DEG_TO_RAD);
+    const lngDelta = cosLat > 1e-6 ? radiusKm / (KM_PER_DEGREE_LAT * cosLat) : 360;
+    const minLat = latitude - latDelta;
+    const maxLat = latitude + latDelta;
+    const minLng = longitude - lngDelta;
+    const maxLng = longitude + lngDelta;
+    const statusCode = options.status !== undefined ? STATUS_INDEX[options.status] : -1;
+    const cutoff = options.maxAgeMs !== undefined ? (options.now ?? Date.now()) - options.maxAgeMs : -Infinity;
+    const lat1 = latitude * DEG_TO_RAD;
+
+    const matchSlots: number[] = [];
+    const matchDistances: number[] = [];
+    for (let slot = 0; slot < this.used; slot++) {
+      if (!this.live[slot]) continue;
+      const lat = this.lats[slot];
+      const lng = this.lngs[slot];
+      if (lat < minLat || lat > maxLat || lng < minLng || lng > maxLng) continue;
+      if (statusCode >= 0 && this.statuses[slot] !== statusCode) continue;
+      if (this.times[slot] < cutoff) continue;
+
+      const lat2 = lat * DEG_TO_RAD;
+      const dLat = lat2 - lat1;
+      const dLng = (lng - longitude) * DEG_TO_RAD;
+      const a = Math.sin(dLat / 2) ** 2 + Math.cos(lat1) * Math.cos(lat2) * Math.sin(dLng / 2) ** 2;
+      const distance = 2 * EARTH_RADIUS_KM * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+      if (distance <= radiusKm) {
+        matchSlots.push(slot);
+        matchDistances.push(distance);
+      }
+    }
+
+    const order = matchSlots.map((_, index) => index);
+    order.sort((a, b) => matchDistances[a] - matchDistances[b]);
+    const limit = options.limit !== undefined ? Math.min(options.limit, order.length) : order.length;
+    const results: Array<OfficerPosition & { distanceKm: number }> = [];
+    for (let i = 0; i < limit; i++) {
+      const index = order[i];
+      results.push({ ...this.read(matchSlots[index]), distanceKm: matchDistances[index] });
+    }
+    return results;
+  }
+
+  /**
+   * Officer ids inside a bounding box (e.g. the visible map region)
+   */
+  idsInBounds(bounds: { minLat: number; maxLat: number; minLng: number; maxLng: number }): string[] {
+    const ids: string[] = [];
+    for (let slot = 0; slot < this.used; slot++) {
+      if (!this.live[slot]) continue;
+      const lat = this.lats[slot];
+      const lng = this.lngs[slot];
+      if (lat >= bounds.minLat && lat <= bounds.maxLat && lng >= bounds.minLng && lng <= bounds.maxLng) {
+        ids.push(this.ids[slot]);
+      }
+    }
+    return ids;
+  }
+
+  /**
+   * Read-only views of the underlying arrays (no copy) for bulk consumers such as
+   * GeofenceCrossingDetector or MarkerClusterIndex. Slots where live[i] === 0 are empty.
+   */
+  getColumns() {
+    return {
+      count: this.used,
+      ids: this.ids,
+      latitudes: this.lats.subarray(0, this.used),
+      longitudes: this.lngs.subarray(0, this.used),
+      timestamps: this.times.subarray(0, this.used),
+      statuses: this.statuses.subarray(0, this.used),
+      live: this.live.subarray(0, this.used),
+    };
+  }
+
+  private read(slot: number): OfficerPosition {
+    return {
+      officerId: this.ids[slot],
+      latitude: this.lats[slot],
+      longitude: this.lngs[slot],
+      timestamp: this.times[slot],
+      status: STATUS_CODES[this.statuses[slot]] || 'unknown',
+    };
+  }
+
+  private allocate(officerId: string): number {
+    let slot: number;
+    if (this.freeSlots.length > 0) {
+      slot = this.freeSlots.pop()!;
+    } else {
+      slot = this.used++;
+      if (slot >= this.lats.length) {
+        this.grow(this.lats.length * 2);
+      }
+    }
+    this.slots.set(officerId, slot);
+    this.ids[slot] = officerId;
+    this.live[slot] = 1;
+    this.times[slot] = -Infinity;
+    this.statuses[slot] = 0;
+    return slot;
+  }
+
+  private grow(capacity: number) {
+    const lats = new Float64Array(capacity);
+    const lngs = new Float64Array(capacity);
+    const times = new Float64Array(capacity);
+    const statuses = new Uint8Array(capacity);
+    const live = new Uint8Array(capacity);
+    lats.set(this.lats);
+    lngs.set(this.lngs);
+    times.set(this.times);
+    statuses.set(this.statuses);
+    live.set(this.live);
+    this.lats = lats;
+    this.lngs = lngs;
+    this.times = times;
+    this.statuses = statuses;
+    this.live = live;
+  }
+}
+
+// Shared store - fed by live location sessions
+export const officerPositions = new OfficerPositionStore();
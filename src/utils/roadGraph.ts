@@ -0,0 +1,303 @@
+/**
+ * Road network in compact adjacency arrays (CSR)
+ * Built once from a GeoJSON extract (LineString / MultiLineString ways, OSM-style
+ * `highway`, `maxspeed` and `oneway` properties). Edge weights are travel times
+ * in seconds. Only incoming edges are stored: ETA queries run Dijkstra backwards
+ * from the alert, which answers "how far is every officer" in one search.
+ */
+
+const EARTH_RADIUS_M = 6371000;
+const DEG_TO_RAD = Math.PI / 180;
+
+// Spatial grid used to snap a coordinate to the nearest graph node
+const GRID_CELL_DEG = 0.005; // ~500 m
+const MAX_SNAP_RINGS = 4;
+
+// Fallback speeds (km/h) by OSM highway class when a way has no maxspeed
+const HIGHWAY_SPEED_KMH: Record<string, number> = {
+  motorway: 90,
+  trunk: 70,
+  primary: 50,
+  secondary: 45,
+  tertiary: 40,
+  unclassified: 30,
+  residential: 25,
+  service: 15,
+  living_street: 10,
+};
+
+export interface RoadGraphOptions {
+  defaultSpeedKmh?: number; // Used when neither maxspeed nor highway class is known (default 30)
+}
+
+export const distanceMeters = (lat1: number, lng1: number, lat2: number, lng2: number): number => {
+  const dLat = (lat2 - lat1) * DEG_TO_RAD;
+  const dLng = (lng2 - lng1) * DEG_TO_RAD;
+  const a =
+    Math.sin(dLat / 2) ** 2 +
+    Math.cos(lat1 * DEG_TO_RAD) * Math.cos(lat2 * DEG_TO_RAD) * Math.sin(dLng / 2) ** 2;
+  return 2 * EARTH_RADIUS_M * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+};
+
+const cellKey = (lat: number, lng: number): string =>
+  `${Math.floor(lat / GRID_CELL_DEG)}:${Math.floor(lng / GRID_CELL_DEG)}`;
+
+const parseSpeed = (properties: any, defaultSpeedKmh: number): number => {
+  const maxspeed = parseFloat(properties?.maxspeed);
+  if (Number.isFinite(maxspeed) && maxspeed > 0) {
+    return String(properties.maxspeed).includes('mph') ? maxspeed * 1.609 : maxspeed;
+  }
+  return HIGHWAY_SPEED_KMH[properties?.highway] || defaultSpeedKmh;
+};
+
+// 1 = forward only, -1 = reverse only, 0 = both directions
+const parseOneway = (properties: any): number => {
+  const value = String(properties?.oneway ?? '').toLowerCase();
+  if (value === 'yes' || value === 'true' || value === '1') return 1;
+  if (value === '-1' || value === 'reverse') return -1;
+  return 0;
+};
+
+export class RoadGraph {
+  readonly nodeCount: number;
+  readonly edgeCount: number;
+  private lats: Float64Array;
+  private lngs: Float64Array;
+  // Incoming edges of node v are sources[inOffsets[v] .. inOffsets[v + 1])
+  private inOffsets: Int32Array;
+  private sources: Int32Array;
+  private seconds: Float32Array;
+  private grid: Map<string, number[]>;
+
+  private constructor(
+    lats: Float64Array,
+    lngs: Float64Array,
+    inOffsets: Int32Array,
+    sources: Int32Array,
+    seconds: Float32Array
+  ) {
+    this.lats = lats;
+    this.lngs = lngs;
+    this.inOffsets = inOffsets;
+    this.sources = sources;
+    this.seconds = seconds;
+    this.nodeCount = lats.length;
+    this.edgeCount = sources.length;
+    this.grid = new Map();
+    for (let node = 0; node < this.nodeCount; node++) {
+      const key = cellKey(lats[node], lngs[node]);
+      let cell = this.grid.get(key);
+      if (!cell) {
+        cell = [];
+        this.grid.set(key, cell);
+      }
+      cell.push(node);
+    }
+  }
+
+  static fromGeoJSON(geojson: any, options: RoadGraphOptions = {}): RoadGraph {
+    const defaultSpeedKmh = options.defaultSpeedKmh || 30;
+    const nodeIds: Map<string, number> = new Map();
+    const nodeLats: number[] = [];
+    const nodeLngs: number[] = [];
+    const edgeFrom: number[] = [];
+    const edgeTo: number[] = [];
+    const edgeSeconds: number[] = [];
+
+    const nodeFor = (lng: number, lat: number): number => {
+      const key = `${lat.toFixed(6)},${lng.toFixed(6)}`;
+      let id = nodeIds.get(key);
+      if (id === undefined) {
+        id = nodeLats.length;
+        nodeIds.set(key, id);
+        nodeLats.push(lat);
+        nodeLngs.push(lng);
+      }
+      return id;
+    };
+
+    const addLine = (coordinates: number[][], properties: any) => {
+      const speedMs = (parseSpeed(properties, defaultSpeedKmh) * 1000) / 3600;
+      const oneway = parseOneway(properties);
+      let previous = -1;
+      for (const coordinate of coordinates) {
+        if (!coordinate || coordinate.length < 2) continue;
+        const node = nodeFor(coordinate[0], coordinate[1]);
+        if (previous >= 0 && previous !== node) {
+          const travel = distanceMeters(nodeLats[previous], nodeLngs[previous], nodeLats[node], nodeLngs[node]) / speedMs;
+          if (oneway >= 0) {
+            edgeFrom.push(previous);
+            edgeTo.push(node);
+            edgeSeconds.push(travel);
+          }
+          if (oneway <= 0) {
+            edgeFrom.push(node);
+            edgeTo.push(previous);
+            edgeSeconds.push(travel);
+          }
+        }
+        previous = node;
+      }
+    };
+
+    const features = geojson?.type === 'FeatureCollection' ? geojson.features || [] : [geojson];
+    for (const feature of features) {
+      const geometry = feature?.geometry;
+      if (!geometry) continue;
+      if (geometry.type === 'LineString') {
+        addLine(geometry.coordinates, feature.properties);
+      } else if (geometry.type === 'MultiLineString') {
+        for (const line of geometry.coordinates) {
+          addLine(line, feature.properties);
+        }
+      }
+    }
+
+    // Counting sort of edges by target node -> CSR of incoming edges
+    const nodeCount = nodeLats.length;
+    const inOffsets = new Int32Array(nodeCount + 1);
+    for (let e = 0; e < edgeTo.length; e++) {
+      inOffsets[edgeTo[e] + 1] += 1;
+    }
+    for (let v = 0; v < nodeCount; v++) {
+      inOffsets[v + 1] += inOffsets[v];
+    }
+    const cursor = inOffsets.slice(0, nodeCount);
+    const sources = new Int32Array(edgeTo.length);
+    const seconds = new Float32Array(edgeTo.length);
+    for (let e = 0; e < edgeTo.length; e++) {
+      const slot = cursor[edgeTo[e]]++;
+      sources[slot] = edgeFrom[e];
+      seconds[slot] = edgeSeconds[e];
+    }
+
+    return new RoadGraph(Float64Array.from(nodeLats), Float64Array.from(nodeLngs), inOffsets, sources, seconds);
+  }
+
+  getNodeLocation(node: number): { latitude: number; longitude: number } {
+    return { latitude: this.lats[node], longitude: this.lngs[node] };
+  }
+
+  /**
+   * Closest node to a coordinate, searching nearby grid cells only
+   * @returns null if nothing is within ~2 km
+   */
+  nearestNode(latitude: number, longitude: number): { node: number; distanceMeters: number } | null {
+    const row = Math.floor(latitude / GRID_CELL_DEG);
+    const col = Math.floor(longitude / GRID_CELL_DEG);
+    let best = -1;
+    let bestDistance = Infinity;
+    for (let ring = 0; ring <= MAX_SNAP_RINGS; ring++) {
+      for (let r = row - ring; r <= row + ring; r++) {
+        for (let c = col - ring; c <= col + ring; c++) {
+          if (Math.max(Math.abs(r - row), Math.abs(c - col)) !== ring) continue; // Ring border only
+          const cell = this.grid.get(`${r}:${c}`);
+          if (!cell) continue;
+          for (const node of cell) {
+            const distance = distanceMeters(latitude, longitude, this.lats[node], this.lngs[node]);
+            if (distance < bestDistance) {
+              bestDistance = distance;
+              best = node;
+            }
+          }
+        }
+      }
+      // Anything in a further ring is at least `ring` cells away
+      if (best >= 0 && bestDistance <= ring * GRID_CELL_DEG * 111000 * Math.cos(latitude * DEG_TO_RAD)) {
+        break;
+      }
+    }
+    return best >= 0 ? { node: best, distanceMeters: bestDistance } : null;
+  }
+
+  /**
+   * Travel time in seconds from every node to `target` (reverse Dijkstra)
+   * Nodes further than maxSeconds are left at Infinity, so the search stays local.
+   */
+  travelTimesTo(target: number, maxSeconds: number = Infinity): Float64Array {
+    const times = new Float64Array(this.nodeCount).fill(Infinity);
+    if (target < 0 || target >= this.nodeCount) {
+      return times;
+    }
+    const heap = new MinHeap(Math.min(this.nodeCount, 1024));
+    times[target] = 0;
+    heap.push(target, 0);
+
+    while (heap.size > 0) {
+      const time = heap.peekKey();
+      const node = heap.pop();
+      if (time > times[node]) continue; // Stale heap entry
+      if (time > maxSeconds) break;
+      for (let e = this.inOffsets[node]; e < this.inOffsets[node + 1]; e++) {
+        const source = this.sources[e];
+        const candidate = time + this.seconds[e];
+        if (candidate < times[source]) {
+          times[source] = candidate;
+          heap.push(source, candidate);
+        }
+      }
+    }
+    for (let node = 0; node < this.nodeCount; node++) {
+      if (times[node] > maxSeconds) {
+        times[node] = Infinity;
+      }
+    }
+    return times;
+  }
+}
+
+// Binary min-heap of (node, key) pairs in typed arrays; duplicates allowed (lazy deletion)
+class MinHeap {
+  private nodes: Int32Array;
+  private keys: Float64Array;
+  size = 0;
+
+  constructor(capacity: number) {
+    this.nodes = new Int32Array(Math.max(16, capacity));
+    this.keys = new Float64Array(Math.max(16, capacity));
+  }
+
+  push(node: number, key: number) {
+    if (this.size === this.nodes.length) {
+      const nodes = new Int32Array(this.size * 2);
+      const keys = new Float64Array(this.size * 2);
+      nodes.set(this.nodes);
+      keys.set(this.keys);
+      this.nodes = nodes;
+      this.keys = keys;
+    }
+    let i = this.size++;
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (this.keys[parent] <= key) break;
+      this.nodes[i] = this.nodes[parent];
+      this.keys[i] = this.keys[parent];
+      i = parent;
+    }
+    this.nodes[i] = node;
+    this.keys[i] = key;
+  }
+
+  peekKey(): number {
+    return this.keys[0];
+  }
+
+  pop(): number {
+    const top = this.nodes[0];
+    const lastNode = this.nodes[--this.size];
+    const lastKey = this.keys[this.size];
+    let i = 0;
+    while (true) {
+      let child = 2 * i + 1;
+      if (child >= this.size) break;
+      if (child + 1 < this.size && this.keys[child + 1] < this.keys[child]) child += 1;
+      if (this.keys[child] >= lastKey) break;
+      this.nodes[i] = this.nodes[child];
+      this.keys[i] = this.keys[child];
+      i = child;
+    }
+    this.nodes[i] = lastNode;
+    this.keys[i] = lastKey;
+    return top;
+  }
+}
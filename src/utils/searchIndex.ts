@@ -0,0 +1,367 @@
+import { Alert } from '../types/alert.types';
+
+/**
+ * Incremental inverted index for SearchScreen over alerts, cases and incidents
+ * Each record is re-tokenized only when it changes, and queries touch only the
+ * postings of the query terms instead of scanning every record's text.
+ */
+
+export type SearchKind = 'alert' | 'case' | 'incident';
+
+export interface SearchResult {
+  kind: SearchKind;
+  id: string;
+  item: any; // Alert for 'alert', the backend's case / incident object otherwise
+}
+
+export interface SearchFilters {
+  kinds?: SearchKind[];
+  status?: string[];
+  priority?: string[];
+  from?: Date; // created_at >= from
+  to?: Date; // created_at <= to
+}
+
+const MIN_TOKEN_LENGTH = 2;
+
+// Letters (with their combining marks, e.g. Devanagari vowel signs) and digits in any script;
+// '@' and '.' keep emails and addresses whole
+const TOKEN_SEPARATOR = /[^\p{L}\p{M}\p{N}@.]+/u;
+
+/**
+ * Split text into lowercase search tokens
+ * @param minLength - Shortest token kept (queries use 1 so a single typed character prefix-matches)
+ */
+export const tokenize = (text: string | undefined | null, minLength: number = MIN_TOKEN_LENGTH): string[] => {
+  if (!text) {
+    return [];
+  }
+  return String(text)
+    .toLowerCase()
+    .split(TOKEN_SEPARATOR)
+    .map((token) => token.replace(/^\.+|\.+$/g, ''))
+    .filter((token) => token.length >= minLength);
+};
+
+interface IndexedFields {
+  text: Array<string | undefined | null>;
+  status?: string;
+  priority?: string;
+  created?: string;
+  signature: string; // Changes to it mean the record must be re-indexed
+}
+
+// Case / incident payloads vary by backend version - read whichever of these exist
+const textOf = (value: any): string | undefined => {
+  if (value === undefined || value === null) {
+    return undefined;
+  }
+  if (typeof value === 'object') {
+    return value.address || value.name || undefined;
+  }
+  return String(value);
+};
+
+const describe: Record<SearchKind, (item: any) => IndexedFields> = {
+  alert: (alert: Alert) => ({
+    text: [alert.message, alert.user_name, alert.location?.address, alert.geofence_id],
+    status: alert.status,
+    priority: alert.priority,
+    created: alert.created_at || alert.timestamp,
+    signature: [
+      alert.status,
+      alert.priority,
+      alert.updated_at,
+      alert.message,
+      alert.user_name,
+      alert.location?.address,
+      alert.geofence_id,
+    ].join('|'),
+  }),
+  case: (item: any) => recordFields(item),
+  incident: (item: any) => recordFields(item),
+};
+
+const recordFields = (item: any): IndexedFields => {
+  const text = [
+    item.title,
+    item.description,
+    item.message,
+    item.case_type || item.incident_type || item.type,
+    textOf(item.location) || item.address,
+    item.user_name || item.reported_by_name || textOf(item.reported_by),
+    item.officer_name,
+    item.geofence_id !== undefined && item.geofence_id !== null ? String(item.geofence_id) : undefined,
+  ];
+  return {
+    text,
+    status: item.status,
+    priority: item.priority,
+    created: item.created_at || item.timestamp,
+    signature: [item.status, item.priority, item.updated_at, ...text].join('|'),
+  };
+};
+
+const idOf = (kind: SearchKind, item: any): string | undefined => {
+  const rawId = kind === 'alert' ? item?.id || item?.log_id : item?.id || item?.case_id || item?.incident_id;
+  return rawId === undefined || rawId === null || rawId === '' ? undefined : String(rawId);
+};
+
+export class SearchIndex {
+  private postings: Map<string, Set<string>> = new Map(); // token -> document keys ("kind:id")
+  private docTokens: Map<string, string[]> = new Map();
+  private docs: Map<string, SearchResult> = new Map();
+  private fields: Map<string, IndexedFields> = new Map();
+  private createdTimes: Map<string, number> = new Map(); // Parsed once so filtering/sorting never re-parses dates
+
+  // Sorted vocabulary for prefix lookups, rebuilt lazily after the token set changes
+  private vocabulary: string[] = [];
+  private vocabularyDirty = false;
+
+  get size(): number {
+    return this.docs.size;
+  }
+
+  /**
+   * Add or update a single record
+   */
+  upsert(kind: SearchKind, item: any) {
+    const id = idOf(kind, item);
+    if (!id) {
+      return;
+    }
+    const key = `${kind}:${id}`;
+    const fields = describe[kind](item);
+    this.docs.set(key, { kind, id, item });
+    if (this.fields.get(key)?.signature === fields.signature) {
+      this.fields.set(key, fields);
+      return; // Text and filter fields unchanged - postings are still valid
+    }
+
+    this.removePostings(key);
+    const tokens = Array.from(new Set(fields.text.flatMap((text) => tokenize(text))));
+    for (const token of tokens) {
+      let keys = this.postings.get(token);
+      if (!keys) {
+        keys = new Set();
+        this.postings.set(token, keys);
+        this.vocabularyDirty = true;
+      }
+      keys.add(key);
+    }
+    this.docTokens.set(key, tokens);
+    this.fields.set(key, fields);
+    this.createdTimes.set(key, new Date(fields.created || 0).getTime() || 0);
+  }
+
+  remove(kind: SearchKind, id: string) {
+    const key = `${kind}:${id}`;
+    this.removePostings(key);
+    this.docs.delete(key);
+    this.docTokens.delete(key);
+    this.fields.delete(key);
+    this.createdTimes.delete(key);
+  }
+
+  /**
+   * Make the index match a full list of one kind (e.g. after a refetch)
+   * Only new, changed and removed records touch the postings
+   */
+  sync(kind: SearchKind, items: any[]) {
+    const seen = new Set<string>();
+    for (const item of items) {
+      const id = idOf(kind, item);
+      if (id) {
+        seen.add(id);
+        this.upsert(kind, item);
+      }
+    }
+    Array.from(this.docs.values()).forEach((doc) => {
+      if (doc.kind === kind && !seen.has(doc.id)) {
+        this.remove(kind, doc.id);
+      }
+    });
+  }
+
+  /**
+   * Search alerts, cases and incidents
+   * Every query term must match; the last term also matches as a prefix (search-as-you-type),
+   * down to a single character. A query without any letters or digits matches nothing.
+   * @returns Matching records, newest first
+   */
+  search(query: string, filters: SearchFilters = {}, limit: number = 100): SearchResult[] {
+    const terms = tokenize(query, 1);
+    if (terms.length === 0) {
+      return [];
+    }
+    const prefix = terms[terms.length - 1];
+    // Single letters before the last term aren't indexed - skip them rather than match nothing
+    const exactTerms = terms.slice(0, -1).filter((term) => term.length >= MIN_TOKEN_LENGTH);
+    let candidates: Set<string> | null = null;
+
+    // Exact terms first - intersecting their postings is cheap and narrows the candidates
+    for (const term of exactTerms) {
+      const matches = this.postings.get(term) || new Set<string>();
+      candidates = candidates === null ? matches : intersect(candidates, matches);
+      if (candidates.size === 0) {
+        return [];
+      }
+    }
+
+    // Prefix term: check the remaining candidates' own tokens rather than
+    // materializing every posting under the prefix
+    if (candidates === null) {
+      candidates = this.prefixMatches(prefix);
+    } else {
+      const filtered = new Set<string>();
+      candidates.forEach((key) => {
+        const tokens = this.docTokens.get(key);
+        if (tokens && tokens.some((token) => token.startsWith(prefix))) {
+          filtered.add(key);
+        }
+      });
+      candidates = filtered;
+    }
+    if (candidates.size === 0) {
+      return [];
+    }
+
+    const fromTime = filters.from ? filters.from.getTime() : -Infinity;
+    const toTime = filters.to ? filters.to.getTime() : Infinity;
+
+    const filtered = Boolean(
+      filters.kinds?.length || filters.status?.length || filters.priority?.length || filters.from || filters.to
+    );
+
+    // Newest `limit` matches via a min-heap on created time - broad prefixes can match most
+    // of the index, and sorting every match just to keep the first page dominated the query
+    const heap: Array<[number, string]> = [];
+    candidates.forEach((key) => {
+      if (filtered && !this.passesFilters(key, filters, fromTime, toTime)) {
+        return;
+      }
+      const created = this.createdTimes.get(key) || 0;
+      if (heap.length < limit) {
+        heapPush(heap, [created, key]);
+      } else if (limit > 0 && created > heap[0][0]) {
+        heapReplaceTop(heap, [created, key]);
+      }
+    });
+
+    heap.sort((a, b) => b[0] - a[0]);
+    return heap.map(([, key]) => this.docs.get(key) as SearchResult);
+  }
+
+  private passesFilters(key: string, filters: SearchFilters, fromTime: number, toTime: number): boolean {
+    const doc = this.docs.get(key);
+    const fields = this.fields.get(key);
+    if (!doc || !fields) {
+      return false;
+    }
+    if (filters.kinds && filters.kinds.length > 0 && !filters.kinds.includes(doc.kind)) {
+      return false;
+    }
+    if (filters.status && filters.status.length > 0 && !filters.status.includes(String(fields.status))) {
+      return false;
+    }
+    if (filters.priority && filters.priority.length > 0 && !filters.priority.includes(String(fields.priority))) {
+      return false;
+    }
+    const created = this.createdTimes.get(key) || 0;
+    return created >= fromTime && created <= toTime;
+  }
+
+  private removePostings(key: string) {
+    const tokens = this.docTokens.get(key);
+    if (!tokens) {
+      return;
+    }
+    for (const token of tokens) {
+      const keys = this.postings.get(token);
+      if (keys) {
+        keys.delete(key);
+        if (keys.size === 0) {
+          this.postings.delete(token);
+          this.vocabularyDirty = true;
+        }
+      }
+    }
+  }
+
+  private prefixMatches(prefix: string): Set<string> {
+    if (this.vocabularyDirty) {
+      this.vocabulary = Array.from(this.postings.keys()).sort();
+      this.vocabularyDirty = false;
+    }
+
+    // Binary search for the first token >= prefix, then walk while tokens share the prefix
+    let low = 0;
+    let high = this.vocabulary.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (this.vocabulary[mid] < prefix) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+
+    const matches = new Set<string>();
+    for (let i = low; i < this.vocabulary.length && this.vocabulary[i].startsWith(prefix); i++) {
+      const keys = this.postings.get(this.vocabulary[i]);
+      if (keys) {
+        keys.forEach((key) => matches.add(key));
+      }
+    }
+    return matches;
+  }
+}
+
+// Binary min-heap on the first element, for top-k selection
+const heapPush = (heap: Array<[number, string]>, entry: [number, string]) => {
+  heap.push(entry);
+  let i = heap.length - 1;
+  while (i > 0) {
+    const parent = (i - 1) >> 1;
+    if (heap[parent][0] <= heap[i][0]) {
+      break;
+    }
+    [heap[parent], heap[i]] = [heap[i], heap[parent]];
+    i = parent;
+  }
+};
+
+const heapReplaceTop = (heap: Array<[number, string]>, entry: [number, string]) => {
+  heap[0] = entry;
+  let i = 0;
+  for (;;) {
+    const left = 2 * i + 1;
+    const right = left + 1;
+    let smallest = i;
+    if (left < heap.length && heap[left][0] < heap[smallest][0]) {
+      smallest = left;
+    }
+    if (right < heap.length && heap[right][0] < heap[smallest][0]) {
+      smallest = right;
+    }
+    if (smallest === i) {
+      break;
+    }
+    [heap[smallest], heap[i]] = [heap[i], heap[smallest]];
+    i = smallest;
+  }
+};
+
+const intersect = (a: Set<string>, b: Set<string>): Set<string> => {
+  const [small, large] = a.size <= b.size ? [a, b] : [b, a];
+  const result = new Set<string>();
+  small.forEach((key) => {
+    if (large.has(key)) {
+      result.add(key);
+    }
+  });
+  return result;
+};
+
+// Shared index - alerts kept in sync with the Redux store, cases and incidents by SearchScreen
+export const searchIndex = new SearchIndex();
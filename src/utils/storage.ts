@@ -1,6 +1,9 @@
 import AsyncStorage from '@react-native-async-storage/async-storage';
 import { constants } from './constants';
 
+// Device-level data, not the signed-in officer's - kept when logout / a 401 clears storage
+const PRESERVED_KEYS: string[] = [constants.STORAGE_KEYS.REQUEST_TRACE];
+
 export const storage = {
   async setItem(key: string, value: string): Promise<void> {
     try {
@@ -29,7 +32,8 @@ export const storage = {
 
   async clear(): Promise<void> {
     try {
-      await AsyncStorage.clear();
+      const keys = await AsyncStorage.getAllKeys();
+      await AsyncStorage.multiRemove(keys.filter((key) => !PRESERVED_KEYS.includes(key)));
     } catch (error) {
       console.error('Error clearing storage:', error);
     }
@@ -0,0 +1,128 @@
+/**
+ * Hierarchical timer wheel
+ * Scheduling and cancelling are O(1); advancing the clock only touches the slot
+ * for each elapsed tick (plus an occasional cascade from a coarser level), so
+ * thousands of pending deadlines cost nothing until they are actually due.
+ */
+
+interface TimerEntry<T> {
+  id: string;
+  tick: number; // Absolute tick the entry is due at
+  payload: T;
+}
+
+const SLOTS_PER_LEVEL = 64;
+const SLOT_MASK = SLOTS_PER_LEVEL - 1;
+
+// Slot index of an absolute tick at a level (division, not >>, so ticks past 2^31 still work)
+const slotAt = (tick: number, level: number): number =>
+  Math.floor(tick / Math.pow(SLOTS_PER_LEVEL, level)) & SLOT_MASK;
+
+export class HierarchicalTimerWheel<T> {
+  private tickMs: number;
+  private levelCount: number;
+  private currentTick: number;
+  private levels: Array<Array<Map<string, TimerEntry<T>>>> = [];
+  private locations: Map<string, { level: number; slot: number }> = new Map();
+
+  /**
+   * @param now - Current time in ms (from the injected clock)
+   * @param tickMs - Resolution of the wheel (default 1 second)
+   * @param levelCount - Levels of 64 slots each; 4 levels at 1s cover ~194 days
+   */
+  constructor(now: number, tickMs: number = 1000, levelCount: number = 4) {
+    this.tickMs = tickMs;
+    this.levelCount = levelCount;
+    this.currentTick = Math.floor(now / tickMs);
+    for (let level = 0; level < levelCount; level++) {
+      const slots: Array<Map<string, TimerEntry<T>>> = [];
+      for (let slot = 0; slot < SLOTS_PER_LEVEL; slot++) {
+        slots.push(new Map());
+      }
+      this.levels.push(slots);
+    }
+  }
+
+  get size(): number {
+    return this.locations.size;
+  }
+
+  has(id: string): boolean {
+    return this.locations.has(id);
+  }
+
+  /**
+   * Schedule (or reschedule) a timer
+   * @param deadline - Absolute time in ms; past deadlines fire on the next advance
+   */
+  schedule(id: string, deadline: number, payload: T) {
+    this.cancel(id);
+    const tick = Math.max(Math.ceil(deadline / this.tickMs), this.currentTick + 1);
+    this.place({ id, tick, payload });
+  }
+
+  cancel(id: string): boolean {
+    const location = this.locations.get(id);
+    if (!location) {
+      return false;
+    }
+    this.levels[location.level][location.slot].delete(id);
+    this.locations.delete(id);
+    return true;
+  }
+
+  /**
+   * Move the wheel forward to `now` and return every timer that became due, earliest tick first
+   */
+  advance(now: number): Array<{ id: string; payload: T }> {
+    const targetTick = Math.floor(now / this.tickMs);
+    const expired: Array<{ id: string; payload: T }> = [];
+
+    while (this.currentTick < targetTick) {
+      if (this.locations.size === 0) {
+        // Nothing scheduled - jump straight to the target
+        this.currentTick = targetTick;
+        break;
+      }
+      this.currentTick += 1;
+
+      // Cascade coarser levels whose slot boundary was just crossed
+      for (let level = 1; level < this.levelCount; level++) {
+        if (slotAt(this.currentTick, level - 1) !== 0) {
+          break;
+        }
+        const slot = slotAt(this.currentTick, level);
+        const entries = Array.from(this.levels[level][slot].values());
+        this.levels[level][slot].clear();
+        for (const entry of entries) {
+          this.locations.delete(entry.id);
+          this.place(entry);
+        }
+      }
+
+      const due = this.levels[0][this.currentTick & SLOT_MASK];
+      if (due.size > 0) {
+        due.forEach((entry) => {
+          this.locations.delete(entry.id);
+          expired.push({ id: entry.id, payload: entry.payload });
+        });
+        due.clear();
+      }
+    }
+    return expired;
+  }
+
+  private place(entry: TimerEntry<T>) {
+    const delta = Math.max(0, entry.tick - this.currentTick);
+    let level = 0;
+    while (level < this.levelCount - 1 && delta >= Math.pow(SLOTS_PER_LEVEL, level + 1)) {
+      level++;
+    }
+    // Beyond the top level's range: park in the furthest top-level slot, it is re-placed on cascade
+    const maxTopDelta = Math.pow(SLOTS_PER_LEVEL, this.levelCount);
+    const tick = delta >= maxTopDelta ? this.currentTick + maxTopDelta - 1 : Math.max(entry.tick, this.currentTick);
+    const slot = slotAt(tick, level);
+    this.levels[level][slot].set(entry.id, entry);
+    this.locations.set(entry.id, { level, slot });
+  }
+}
@@ -0,0 +1,25 @@
+/**
+ * Load the app's TypeScript modules in plain Node (benchmark scripts)
+ * Compiles .ts/.tsx on require with the app's own Babel config, so the
+ * benchmarks need nothing beyond the project's dev dependencies.
+ */
+
+const path = require('path');
+const babel = require('@babel/core');
+
+const BABEL_CONFIG = path.join(__dirname, 'babel.config.js');
+
+const compile = (module, filename) => {
+  const { code } = babel.transformFileSync(filename, {
+    configFile: BABEL_CONFIG,
+    cwd: __dirname,
+    sourceMaps: 'inline',
+  });
+  module._compile(code, filename);
+};
+
+// Registering the extensions also lets extensionless relative imports resolve to .ts files
+require.extensions['.ts'] = compile;
+require.extensions['.tsx'] = compile;
+
+module.exports = (relativePath) => require(path.join(__dirname, relativePath));